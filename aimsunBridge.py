@@ -37,6 +37,7 @@ from PyANGKernel import *
 from PyANGConsole import *
 import time
 import re
+import numpy as np
 
 class AimSunBridge:
     """this class is the aimsun bridge we are building that is based off the Emme bridge"""
@@ -79,6 +80,8 @@ class AimSunBridge:
         self.SignalSwitchNetworkPath = 16
         """A signal to save the network"""
         self.SignalSaveNetwork = 17
+        """XTMF is requesting the cells of a matrix / Tell XTMF that the matrix frames follow"""
+        self.SignalSendMatrix = 18
 
         # open the named pipe
         pipeName = sys.argv[1]
@@ -284,6 +287,64 @@ class AimSunBridge:
             err = traceback.print_exc()
             self.sendRuntimeError(str(err))
 
+    def sendBuffer(self, buffer):
+        """
+        Send a contiguous array to XTMF as a single frame of its length in bytes followed
+        by its raw bytes, written straight from the array's memory
+        """
+        view = memoryview(buffer).cast("B")
+        self.sendSignal(len(view))
+        written = 0
+        while written < len(view):
+            written += self.aimsunPipe.write(view[written:])
+        self.aimsunPipe.flush()
+        return
+
+    def readMatrixBuffer(self, toolPath, model, matrixName):
+        """
+        Function to read the cells of a GKODMatrix with the read_matrix function of the tool
+        at toolPath, which shares the matrix code of the toolbox. Returns the zone of each
+        centroid and a contiguous little endian float32 array in centroid order.
+        """
+        if not os.path.exists(toolPath):
+            raise Exception("Unable to find the tool '" + toolPath + "'.")
+        # the tool's folder is needed for its relative imports
+        sys.path.append(os.path.dirname(toolPath))
+        try:
+            spec = importlib.util.spec_from_file_location("tool", toolPath)
+            moduleToRun = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(moduleToRun)
+            zones, cells = moduleToRun.read_matrix(model, matrixName)
+        finally:
+            sys.path.pop()
+        return [str(zone) for zone in zones], np.ascontiguousarray(cells, dtype="<f4")
+
+    def sendMatrix(self, model):
+        """
+        Send the matrix requested by XTMF as the zone vector followed by one binary
+        frame of float32 cells in row major centroid order. The matrix is read and the
+        frame built before anything is sent, so an error can still be reported to XTMF.
+        """
+        toolPath = self.readString()
+        matrixName = self.readString()
+        try:
+            zones, buffer = self.readMatrixBuffer(toolPath, model, matrixName)
+            zoneString = ",".join(zones)
+        except Exception as e:
+            # traceback outputs more information such as call output stack
+            traceback.print_exc()
+            self.sendRuntimeError(str(e))
+            return
+        # once the first byte is sent an error can not be reported without breaking the
+        # frame, so a failed write ends the bridge like any other broken pipe
+        self.IOLock.acquire()
+        try:
+            self.sendSignal(self.SignalSendMatrix)
+            self.sendString(zoneString)
+            self.sendBuffer(buffer)
+        finally:
+            self.IOLock.release()
+
     def run(self):
         """
         Function to run the pipe
@@ -316,6 +377,9 @@ class AimSunBridge:
                 elif input == self.SignalSaveNetwork:
                     # we need to save the network
                     self.saveModel(console, model)
+                elif input == self.SignalSendMatrix:
+                    # send the cells of a matrix back over the pipe
+                    self.sendMatrix(model)
                 else:
                     # If we do not understand what XTMF is saying quietly die
                     exit = True
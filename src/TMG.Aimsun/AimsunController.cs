@@ -108,6 +108,17 @@ namespace TMG.Aimsun
         /// A signal from the modeller bridge saying to save the network model now. 
         /// </summary>
         private const int SignalSaveNetwork = 17;
+        /// <summary>
+        /// A signal to the modeller bridge requesting the cells of a matrix, the bridge answers with
+        /// the same signal followed by the zone vector and a single binary frame of float32 cells.
+        /// </summary>
+        private const int SignalSendMatrix = 18;
+
+        /// <summary>
+        /// The toolbox script the ModellerBridge uses to read the cells of a matrix.
+        /// </summary>
+        private const string ReadMatrixToolName = "inputOutput/readMatrix.py";
+
         private string AddQuotes(string fileName)
         {
             return String.Concat("\"", fileName, "\"");
@@ -313,6 +324,84 @@ namespace TMG.Aimsun
             }
         }
 
+        /// <summary>
+        /// Method to read the cells of a matrix from the Aimsun model without going through a file.
+        /// </summary>
+        /// <param name="caller">The calling module. Used for reporting errors for XTMF.</param>
+        /// <param name="matrixName">The name of the GKODMatrix to read.</param>
+        /// <param name="zones">The zone of each row and column of the matrix, in centroid order.</param>
+        /// <returns>The cells of the matrix in row major order.</returns>
+        /// <exception cref="XTMFRuntimeException"></exception>
+        public float[] ReadMatrix(IModule caller, string matrixName, out string[] zones)
+        {
+            lock (this)
+            {
+                try
+                {
+                    EnsureWriteAvailable(caller);
+                    var toolPath = Path.Combine(ToolboxDirectory, ReadMatrixToolName);
+                    var writer = new BinaryWriter(_aimsunPipe, Encoding.Unicode, true);
+                    {
+                        writer.Write(SignalSendMatrix);
+                        writer.Write(toolPath.Length);
+                        writer.Write(toolPath.ToCharArray());
+                        writer.Write(matrixName.Length);
+                        writer.Write(matrixName.ToCharArray());
+                        writer.Flush();
+                    }
+                    using (var reader = new BinaryReader(_aimsunPipe, Encoding.Unicode, true))
+                    {
+                        while (true)
+                        {
+                            int result = reader.ReadInt32();
+                            switch (result)
+                            {
+                                case SignalSendMatrix:
+                                    {
+                                        string zoneString = ReadString(reader);
+                                        zones = zoneString.Length > 0 ? zoneString.Split(',') : new string[0];
+                                        int size = reader.ReadInt32();
+                                        byte[] frame = reader.ReadBytes(size);
+                                        if (frame.Length != size || size != zones.Length * zones.Length * sizeof(float))
+                                        {
+                                            throw new XTMFRuntimeException(caller, "The matrix '" + matrixName + "' sent by the Aimsun ModellerBridge was incomplete.");
+                                        }
+                                        var data = new float[zones.Length * zones.Length];
+                                        Buffer.BlockCopy(frame, 0, data, 0, size);
+                                        return data;
+                                    }
+                                case SignalRuntimeError:
+                                    {
+                                        throw new XTMFRuntimeException(caller, ReadString(reader));
+                                    }
+                                case SignalSentPrintMessage:
+                                    {
+                                        Console.Write(ReadString(reader));
+                                        break;
+                                    }
+                                case SignalTermination:
+                                    {
+                                        throw new XTMFRuntimeException(caller, "The Aimsun ModellerBridge panicked and unexpectedly shutdown.");
+                                    }
+                                default:
+                                    {
+                                        throw new XTMFRuntimeException(caller, "Unknown message passed back from the Aimsun ModellerBridge.  Signal number " + result);
+                                    }
+                            }
+                        }
+                    }
+                }
+                catch (EndOfStreamException)
+                {
+                    throw new XTMFRuntimeException(caller, "We were unable to communicate with Aimsun while reading the matrix '" + matrixName + "'.");
+                }
+                catch (IOException e)
+                {
+                    throw new XTMFRuntimeException(caller, "I/O Connection with Aimsun ended while reading a matrix, with:\r\n" + e.Message);
+                }
+            }
+        }
+
         /// <summary>
         /// Method to run Aimsun modules.
         /// </summary>
@@ -0,0 +1,120 @@
+﻿/*
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+using System;
+using XTMF;
+using TMG.Input;
+
+namespace TMG.Aimsun.InputOutput
+{
+    [ModuleInformation(Description = "Balance an OD matrix in the network to origin and destination targets with iterative proportional fitting.")]
+    public class BalanceMatrix : IAimsunTool
+    {
+        private const string ToolName = "inputOutput/balanceMatrix.py";
+
+        [RunParameter("SourceMatrixID", "testOD", "The id of the matrix to balance")]
+        public string SourceMatrixID;
+
+        [SubModelInformation(Required = true, Description = "A zone,origin,destination csv file of the trip end targets. Zones that are not in the file have no trips")]
+        public FileLocation TargetFile;
+
+        [RunParameter("IncludesHeader", true, "Boolean value whether the target file has a header. Default is true")]
+        public bool IncludesHeader;
+
+        [RunParameter("Tolerance", 0.0001f, "Stop when every origin and destination total is within this fraction of the largest target")]
+        public float Tolerance;
+
+        [RunParameter("MaxIterations", 100, "The maximum number of balancing iterations")]
+        public int MaxIterations;
+
+        [RunParameter("MatrixID", "testOD", "The id of the matrix to store the result in, it can be the source matrix")]
+        public string MatrixID;
+
+        [RunParameter("CentroidConfiguration", "baseCentroidConfig", "The centroid configuration of the source and result matrices")]
+        public string CentroidConfiguration;
+
+        [RunParameter("VehicleType", "Car Class ", "String value to determine vehicle type of the result. Default is Car Class")]
+        public string VehicleType;
+
+        [RunParameter("InitialTime", "06:00:00:000", "String value of the Initial time of the result")]
+        public string InitialTime;
+
+        [RunParameter("DurationTime", "03:00:00:000", "String value of the Duration time of the result")]
+        public string DurationTime;
+
+        public float Progress
+        {
+            get;
+            set;
+        }
+        public string Name
+        {
+            get;
+            set;
+        }
+
+        public Tuple<byte, byte, byte> ProgressColour => new Tuple<byte, byte, byte>(120, 25, 100);
+
+        public bool RuntimeValidation(ref string error)
+        {
+            if (Tolerance <= 0.0f)
+            {
+                error = "In '" + Name + "' the Tolerance must be greater than 0.";
+                return false;
+            }
+            if (MaxIterations < 1)
+            {
+                error = "In '" + Name + "' the MaxIterations must be at least 1.";
+                return false;
+            }
+            return true;
+        }
+        public bool Execute(ModellerController aimsunController)
+        {
+            if (aimsunController == null)
+            {
+                throw new XTMFRuntimeException(this, "AimsunController is not properly setup or initalized.");
+            }
+            return aimsunController.Run(this, ToolName,
+                JsonParameterBuilder.BuildParameters(writer =>
+                {
+                    writer.WritePropertyName("SourceMatrixID");
+                    writer.WriteValue(SourceMatrixID);
+                    writer.WritePropertyName("TargetFile");
+                    writer.WriteValue(TargetFile.GetFilePath());
+                    writer.WritePropertyName("IncludesHeader");
+                    writer.WriteValue(IncludesHeader);
+                    writer.WritePropertyName("Tolerance");
+                    writer.WriteValue(Tolerance);
+                    writer.WritePropertyName("MaxIterations");
+                    writer.WriteValue(MaxIterations);
+                    writer.WritePropertyName("MatrixID");
+                    writer.WriteValue(MatrixID);
+                    writer.WritePropertyName("CentroidConfiguration");
+                    writer.WriteValue(CentroidConfiguration);
+                    writer.WritePropertyName("VehicleType");
+                    writer.WriteValue(VehicleType);
+                    writer.WritePropertyName("InitialTime");
+                    writer.WriteValue(InitialTime);
+                    writer.WritePropertyName("DurationTime");
+                    writer.WriteValue(DurationTime);
+                }));
+        }
+    }
+}
@@ -0,0 +1,97 @@
+﻿/*
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+using System;
+using XTMF;
+
+namespace TMG.Aimsun.InputOutput
+{
+    [ModuleInformation(Description = "Calculate an OD matrix from an expression over other OD matrices in the network. "
+        + "Matrices are referenced by name, or with matrix(\"name\") when the name contains spaces. The expression supports numbers, "
+        + "+ - * / **, comparisons, and, or, not, the functions abs, exp, log, sqrt, minimum, maximum, where, clip and transpose, "
+        + "and intrazonal which is 1 on the diagonal. Cells divided by zero are zero.")]
+    public class CalculateMatrix : IAimsunTool
+    {
+        private const string ToolName = "inputOutput/calculateMatrix.py";
+
+        [RunParameter("Expression", "", "The expression to evaluate, for example (autoTime + 0.5 * autoCost) * (1 - intrazonal)")]
+        public string Expression;
+
+        [RunParameter("MatrixID", "testOD", "The id of the matrix to store the result in, it is created if it does not exist")]
+        public string MatrixID;
+
+        [RunParameter("CentroidConfiguration", "baseCentroidConfig", "The centroid configuration of the matrices in the expression and of the result")]
+        public string CentroidConfiguration;
+
+        [RunParameter("VehicleType", "Car Class ", "String value to determine vehicle type of the result. Default is Car Class")]
+        public string VehicleType;
+
+        [RunParameter("InitialTime", "06:00:00:000", "String value of the Initial time of the result")]
+        public string InitialTime;
+
+        [RunParameter("DurationTime", "03:00:00:000", "String value of the Duration time of the result")]
+        public string DurationTime;
+
+        public float Progress
+        {
+            get;
+            set;
+        }
+        public string Name
+        {
+            get;
+            set;
+        }
+
+        public Tuple<byte, byte, byte> ProgressColour => new Tuple<byte, byte, byte>(120, 25, 100);
+
+        public bool RuntimeValidation(ref string error)
+        {
+            if (string.IsNullOrWhiteSpace(Expression))
+            {
+                error = "In '" + Name + "' an Expression is required.";
+                return false;
+            }
+            return true;
+        }
+        public bool Execute(ModellerController aimsunController)
+        {
+            if (aimsunController == null)
+            {
+                throw new XTMFRuntimeException(this, "AimsunController is not properly setup or initalized.");
+            }
+            return aimsunController.Run(this, ToolName,
+                JsonParameterBuilder.BuildParameters(writer =>
+                {
+                    writer.WritePropertyName("Expression");
+                    writer.WriteValue(Expression);
+                    writer.WritePropertyName("MatrixID");
+                    writer.WriteValue(MatrixID);
+                    writer.WritePropertyName("CentroidConfiguration");
+                    writer.WriteValue(CentroidConfiguration);
+                    writer.WritePropertyName("VehicleType");
+                    writer.WriteValue(VehicleType);
+                    writer.WritePropertyName("InitialTime");
+                    writer.WriteValue(InitialTime);
+                    writer.WritePropertyName("DurationTime");
+                    writer.WriteValue(DurationTime);
+                }));
+        }
+    }
+}
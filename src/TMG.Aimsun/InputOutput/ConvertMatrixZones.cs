@@ -0,0 +1,100 @@
+﻿/*
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+using System;
+using XTMF;
+using TMG.Input;
+
+namespace TMG.Aimsun.InputOutput
+{
+    [ModuleInformation(Description = "Aggregate or split an OD matrix in the network into the zones of another centroid configuration with a correspondence file.")]
+    public class ConvertMatrixZones : IAimsunTool
+    {
+        private const string ToolName = "inputOutput/convertMatrixZones.py";
+
+        [RunParameter("SourceMatrixID", "testOD", "The id of the matrix to convert")]
+        public string SourceMatrixID;
+
+        [SubModelInformation(Required = true, Description = "A fromZone,toZone[,weight] csv file. A from zone in several rows is split in proportion to the weights, which default to 1")]
+        public FileLocation CorrespondenceFile;
+
+        [RunParameter("IncludesHeader", true, "Boolean value whether the correspondence file has a header. Default is true")]
+        public bool IncludesHeader;
+
+        [RunParameter("MatrixID", "testOD", "The id of the matrix to store the result in, it can be the source matrix")]
+        public string MatrixID;
+
+        [RunParameter("CentroidConfiguration", "baseCentroidConfig", "The centroid configuration of the result matrix")]
+        public string CentroidConfiguration;
+
+        [RunParameter("VehicleType", "Car Class ", "String value to determine vehicle type of the result. Default is Car Class")]
+        public string VehicleType;
+
+        [RunParameter("InitialTime", "06:00:00:000", "String value of the Initial time of the result")]
+        public string InitialTime;
+
+        [RunParameter("DurationTime", "03:00:00:000", "String value of the Duration time of the result")]
+        public string DurationTime;
+
+        public float Progress
+        {
+            get;
+            set;
+        }
+        public string Name
+        {
+            get;
+            set;
+        }
+
+        public Tuple<byte, byte, byte> ProgressColour => new Tuple<byte, byte, byte>(120, 25, 100);
+
+        public bool RuntimeValidation(ref string error)
+        {
+            return true;
+        }
+        public bool Execute(ModellerController aimsunController)
+        {
+            if (aimsunController == null)
+            {
+                throw new XTMFRuntimeException(this, "AimsunController is not properly setup or initalized.");
+            }
+            return aimsunController.Run(this, ToolName,
+                JsonParameterBuilder.BuildParameters(writer =>
+                {
+                    writer.WritePropertyName("SourceMatrixID");
+                    writer.WriteValue(SourceMatrixID);
+                    writer.WritePropertyName("CorrespondenceFile");
+                    writer.WriteValue(CorrespondenceFile.GetFilePath());
+                    writer.WritePropertyName("IncludesHeader");
+                    writer.WriteValue(IncludesHeader);
+                    writer.WritePropertyName("MatrixID");
+                    writer.WriteValue(MatrixID);
+                    writer.WritePropertyName("CentroidConfiguration");
+                    writer.WriteValue(CentroidConfiguration);
+                    writer.WritePropertyName("VehicleType");
+                    writer.WriteValue(VehicleType);
+                    writer.WritePropertyName("InitialTime");
+                    writer.WriteValue(InitialTime);
+                    writer.WritePropertyName("DurationTime");
+                    writer.WriteValue(DurationTime);
+                }));
+        }
+    }
+}
@@ -0,0 +1,110 @@
+﻿/*
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+using System;
+using TMG.Input;
+using XTMF;
+
+namespace TMG.Aimsun.InputOutput
+{
+    /// <summary>
+    /// A tool to export several matrices in one call
+    /// </summary>
+    [ModuleInformation(Description = "A tool to export several matrices in one call. The matrices are read from Aimsun one after the other while a pool of threads formats and writes the files.")]
+    public class ExportMatrices : IAimsunTool
+    {
+        public const string ToolName = "InputOutput/exportMatrices.py";
+
+        [ModuleInformation(Description = "A matrix to export and the file to write it to")]
+        public class MatrixExport : IModule
+        {
+            [RunParameter("Matrix Name", "", "The name of the matrix to export", Index = 0)]
+            public string MatrixName;
+
+            [SubModelInformation(Required = true, Description = "The file to write the matrix to")]
+            public FileLocation FilePath;
+
+            public string Name { get; set; }
+            public float Progress => 0f;
+            public Tuple<byte, byte, byte> ProgressColour => new Tuple<byte, byte, byte>(50, 150, 50);
+            public bool RuntimeValidation(ref string error)
+            {
+                return true;
+            }
+        };
+
+        [SubModelInformation(Required = true, Description = "The matrices to export")]
+        public MatrixExport[] Matrices;
+
+        [RunParameter("Format", "csv", "The file format to export to: csv (origin,destination,value), square (one row per origin), ascii (Aimsun ASCII matrix), npy, npz or bin (header and float32 cells). npz writes the matrices given the same file to one compressed archive. The binary formats also write a _zones.csv file of the zone order")]
+        public string Format;
+
+        [RunParameter("Workers", 4, "The number of threads formatting and writing the files")]
+        public int Workers;
+
+        public string Name { get; set; }
+
+        public float Progress => 0f;
+
+        public Tuple<byte, byte, byte> ProgressColour => new Tuple<byte, byte, byte>(50, 150, 50);
+
+        public bool Execute(ModellerController aimsunController)
+        {
+            if (aimsunController == null)
+            {
+                throw new XTMFRuntimeException(this, "AimsunController is not properly setup or initalized.");
+            }
+            return aimsunController.Run(this, ToolName,
+                JsonParameterBuilder.BuildParameters(writer =>
+                {
+                    writer.WritePropertyName("Format");
+                    writer.WriteValue(Format);
+                    writer.WritePropertyName("Workers");
+                    writer.WriteValue(Workers);
+                    writer.WritePropertyName("Matrices");
+                    writer.WriteStartArray();
+                    for (int i = 0; i < Matrices.Length; i++)
+                    {
+                        writer.WriteStartObject();
+                        writer.WritePropertyName("MatrixName");
+                        writer.WriteValue(Matrices[i].MatrixName);
+                        writer.WritePropertyName("FilePath");
+                        writer.WriteValue(Matrices[i].FilePath.GetFilePath());
+                        writer.WriteEndObject();
+                    }
+                    writer.WriteEndArray();
+                }));
+        }
+
+        public bool RuntimeValidation(ref string error)
+        {
+            if (Format != "csv" && Format != "square" && Format != "ascii" && Format != "npy" && Format != "npz" && Format != "bin")
+            {
+                error = "In '" + Name + "' the Format must be csv, square, ascii, npy, npz or bin.";
+                return false;
+            }
+            if (Workers < 1)
+            {
+                error = "In '" + Name + "' the number of Workers must be at least 1.";
+                return false;
+            }
+            return true;
+        }
+    }
+}
@@ -37,6 +37,27 @@ namespace TMG.Aimsun.InputOutput
         [RunParameter("Matrix Name", "", "The name of the matrix file user wishes to export")]
         public string MatrixName;
 
+        [RunParameter("Format", "csv", "The file format to export to: csv (origin,destination,value), square (one row per origin), ascii (Aimsun ASCII matrix), npy, npz (every matrix in one compressed file) or bin (header and float32 cells). The binary formats also write a _zones.csv file of the zone order")]
+        public string Format;
+
+        [ModuleInformation(Description = "An additional matrix to export")]
+        public class ExportedMatrix : IModule
+        {
+            [RunParameter("Matrix Name", "", "The name of the matrix to export", Index = 0)]
+            public string MatrixName;
+
+            public string Name { get; set; }
+            public float Progress => 0f;
+            public Tuple<byte, byte, byte> ProgressColour => new Tuple<byte, byte, byte>(50, 150, 50);
+            public bool RuntimeValidation(ref string error)
+            {
+                return true;
+            }
+        };
+
+        [SubModelInformation(Required = false, Description = "Additional matrices to export in the same call. When several matrices go to separate files the matrix name is added to each file name")]
+        public ExportedMatrix[] Matrices;
+
         public string Name { get; set; }
 
         public float Progress => 0f;
@@ -56,11 +77,33 @@ namespace TMG.Aimsun.InputOutput
                     writer.WriteValue(FilePath);
                     writer.WritePropertyName("MatrixName");
                     writer.WriteValue(MatrixName);
+                    writer.WritePropertyName("Format");
+                    writer.WriteValue(Format);
+                    writer.WritePropertyName("MatrixNames");
+                    writer.WriteStartArray();
+                    if (Matrices != null)
+                    {
+                        for (int i = 0; i < Matrices.Length; i++)
+                        {
+                            writer.WriteValue(Matrices[i].MatrixName);
+                        }
+                    }
+                    writer.WriteEndArray();
                 }));
         }
 
         public bool RuntimeValidation(ref string error)
         {
+            if (Format != "csv" && Format != "square" && Format != "ascii" && Format != "npy" && Format != "npz" && Format != "bin")
+            {
+                error = "In '" + Name + "' the Format must be csv, square, ascii, npy, npz or bin.";
+                return false;
+            }
+            if (string.IsNullOrWhiteSpace(MatrixName) && (Matrices == null || Matrices.Length == 0))
+            {
+                error = "In '" + Name + "' at least one matrix must be given to export.";
+                return false;
+            }
             return true;
         }
     }
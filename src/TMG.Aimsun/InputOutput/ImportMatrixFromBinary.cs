@@ -0,0 +1,105 @@
+﻿/*
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+using System;
+using XTMF;
+using TMG.Input;
+
+namespace TMG.Aimsun.InputOutput
+{
+    [ModuleInformation(Description = "Import an OD matrix from a .npy or raw binary file into the network.")]
+    public class ImportMatrixFromBinary : IAimsunTool
+    {
+        private const string ToolName = "inputOutput/importMatrixFromBinary.py";
+
+        [SubModelInformation(Required = true, Description = "The .npy file or raw row major binary file of the square matrix")]
+        public FileLocation MatrixFile;
+
+        [SubModelInformation(Required = true, Description = "The .npy or text file of the zone numbers of the rows and columns of the matrix, in order")]
+        public FileLocation ZoneFile;
+
+        [RunParameter("DataType", "float32", "The type of the values of a raw binary file, float32 or float64. Ignored for .npy files")]
+        public string DataType;
+
+        [RunParameter("MatrixID", "testOD", "Matrix ID default is test OD")]
+        public string MatrixID;
+
+        [RunParameter("CentroidConfiguration", "baseCentroidConfig", "String value to write type of centroid configuration")]
+        public string CentroidConfiguration;
+
+        [RunParameter("VehicleType", "Car Class ", "String value to determine vehicle type. Default is Car Class")]
+        public string VehicleType;
+
+        [RunParameter("InitialTime", "06:00:00:000", "String value of the Initial time")]
+        public string InitialTime;
+
+        [RunParameter("DurationTime", "03:00:00:000", "String value of the Duration time")]
+        public string DurationTime;
+
+        public float Progress
+        {
+            get;
+            set;
+        }
+        public string Name
+        {
+            get;
+            set;
+        }
+
+        public Tuple<byte, byte, byte> ProgressColour => new Tuple<byte, byte, byte>(120, 25, 100);
+
+        public bool RuntimeValidation(ref string error)
+        {
+            if (DataType != "float32" && DataType != "float64")
+            {
+                error = "In '" + Name + "' the DataType must be float32 or float64.";
+                return false;
+            }
+            return true;
+        }
+        public bool Execute(ModellerController aimsunController)
+        {
+            if (aimsunController == null)
+            {
+                throw new XTMFRuntimeException(this, "AimsunController is not properly setup or initalized.");
+            }
+            return aimsunController.Run(this, ToolName,
+                JsonParameterBuilder.BuildParameters(writer =>
+                {
+                    writer.WritePropertyName("MatrixFile");
+                    writer.WriteValue(MatrixFile.GetFilePath());
+                    writer.WritePropertyName("ZoneFile");
+                    writer.WriteValue(ZoneFile.GetFilePath());
+                    writer.WritePropertyName("DataType");
+                    writer.WriteValue(DataType);
+                    writer.WritePropertyName("MatrixID");
+                    writer.WriteValue(MatrixID);
+                    writer.WritePropertyName("CentroidConfiguration");
+                    writer.WriteValue(CentroidConfiguration);
+                    writer.WritePropertyName("VehicleType");
+                    writer.WriteValue(VehicleType);
+                    writer.WritePropertyName("InitialTime");
+                    writer.WriteValue(InitialTime);
+                    writer.WritePropertyName("DurationTime");
+                    writer.WriteValue(DurationTime);
+                }));
+        }
+    }
+}
@@ -32,7 +32,7 @@ namespace TMG.Aimsun.InputOutput
         [SubModelInformation(Required = true, Description = "The file location of the OD CSV file")]
         public FileLocation ODCSV;
 
-        [RunParameter("ThirdNormalized", true, "Boolean value to determine if the matrix is third normalized. Default value is true")]
+        [RunParameter("ThirdNormalized", true, "Boolean value to determine if the matrix is third normalized (origin,destination,value). If false the file is a square matrix with one row per origin zone, the destination zones are read from the header or follow the centroid configuration order. Default value is true")]
         public bool ThirdNormalized;
 
         [RunParameter("IncludesHeader", true, "Boolean value whether to include a header. Default is true")]
@@ -52,6 +52,30 @@ namespace TMG.Aimsun.InputOutput
 
         [RunParameter("DurationTime", "03:00:00:000", "String value of the Duration time")]
         public string DurationTime;
+
+        [ModuleInformation(Description = "A matrix to fill from one of the value columns of a wide OD file")]
+        public class WideMatrix : IModule
+        {
+            [RunParameter("MatrixID", "testOD", "The id of the matrix to create", Index = 0)]
+            public string MatrixID;
+            [RunParameter("VehicleType", "Car Class ", "String value to determine vehicle type", Index = 1)]
+            public string VehicleType;
+            [RunParameter("InitialTime", "06:00:00:000", "String value of the Initial time", Index = 2)]
+            public string InitialTime;
+            [RunParameter("DurationTime", "03:00:00:000", "String value of the Duration time", Index = 3)]
+            public string DurationTime;
+
+            public string Name { get; set; }
+            public float Progress => 0f;
+            public Tuple<byte, byte, byte> ProgressColour => new Tuple<byte, byte, byte>(120, 25, 100);
+            public bool RuntimeValidation(ref string error)
+            {
+                return true;
+            }
+        };
+
+        [SubModelInformation(Required = false, Description = "Optional list of matrices to import from a wide origin,destination,m1,m2,... file in one pass. Matrix i is read from value column i. When empty the single matrix parameters are used.")]
+        public WideMatrix[] Matrices;
         public float Progress
         {
             get;
@@ -67,6 +91,11 @@ namespace TMG.Aimsun.InputOutput
 
         public bool RuntimeValidation(ref string error)
         {
+            if (Matrices != null && Matrices.Length > 1 && !ThirdNormalized)
+            {
+                error = "In '" + Name + "' importing several matrices in one pass requires a third normalized file.";
+                return false;
+            }
             return true;
         }
         public bool Execute(ModellerController aimsunController)
@@ -94,6 +123,25 @@ namespace TMG.Aimsun.InputOutput
                     writer.WriteValue(InitialTime.ToString());
                     writer.WritePropertyName("DurationTime");
                     writer.WriteValue(DurationTime.ToString());
+                    writer.WritePropertyName("Matrices");
+                    writer.WriteStartArray();
+                    if (Matrices != null)
+                    {
+                        for (int i = 0; i < Matrices.Length; i++)
+                        {
+                            writer.WriteStartObject();
+                            writer.WritePropertyName("MatrixID");
+                            writer.WriteValue(Matrices[i].MatrixID);
+                            writer.WritePropertyName("VehicleType");
+                            writer.WriteValue(Matrices[i].VehicleType);
+                            writer.WritePropertyName("InitialTime");
+                            writer.WriteValue(Matrices[i].InitialTime);
+                            writer.WritePropertyName("DurationTime");
+                            writer.WriteValue(Matrices[i].DurationTime);
+                            writer.WriteEndObject();
+                        }
+                    }
+                    writer.WriteEndArray();
                 }));
         }
     }
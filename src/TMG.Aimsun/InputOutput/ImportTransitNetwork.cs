@@ -32,6 +32,15 @@ namespace TMG.Aimsun.InputOutput
         [SubModelInformation(Required = true, Description = "The path to where the network package file (.nwp) is located")]
         public FileLocation NetworkPackageFile;
 
+        [RunParameter("Transfer Distance", 200.0f, "The maximum distance in metres between two stops for a walking transfer")]
+        public float TransferDistance;
+
+        [RunParameter("Max Transfers", 10, "The maximum number of walking transfers from each stop")]
+        public int MaxTransfers;
+
+        [RunParameter("Walking Speed", 1.4f, "The walking speed in m/s used to compute the walking transfer times")]
+        public float WalkingSpeed;
+
         public float Progress
         {
             get;
@@ -47,6 +56,21 @@ namespace TMG.Aimsun.InputOutput
 
         public bool RuntimeValidation(ref string error)
         {
+            if (TransferDistance <= 0.0f)
+            {
+                error = "In '" + Name + "' the transfer distance must be greater than zero.";
+                return false;
+            }
+            if (MaxTransfers < 0)
+            {
+                error = "In '" + Name + "' the max transfers can not be negative.";
+                return false;
+            }
+            if (WalkingSpeed <= 0.0f)
+            {
+                error = "In '" + Name + "' the walking speed must be greater than zero.";
+                return false;
+            }
             return true;
         }
         public bool Execute(ModellerController aimsunController)
@@ -60,6 +84,12 @@ namespace TMG.Aimsun.InputOutput
                 {
                     writer.WritePropertyName("NetworkPackageFile");
                     writer.WriteValue(NetworkPackageFile.GetFilePath());
+                    writer.WritePropertyName("TransferDistance");
+                    writer.WriteValue(TransferDistance);
+                    writer.WritePropertyName("MaxTransfers");
+                    writer.WriteValue(MaxTransfers);
+                    writer.WritePropertyName("WalkingSpeed");
+                    writer.WriteValue(WalkingSpeed);
                 }));
         }
     }
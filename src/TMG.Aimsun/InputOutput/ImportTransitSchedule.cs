@@ -29,12 +29,24 @@ namespace TMG.Aimsun.InputOutput
     {
         private const string ToolName = "InputOutput/importTransitSchedule.py";
 
-        [SubModelInformation(Required = true, Description = "The path to where the network package file (.nwp) is located")]
+        [SubModelInformation(Required = false, Description = "Optional path to the network package file (.nwp), only needed for transit lines imported without their transit vehicle attribute")]
         public FileLocation NetworkPackageFile;
 
         [SubModelInformation(Required = true, Description = "The path where the service table (.csv) file is located")]
         public FileLocation ServiceTableCSV;
 
+        [RunParameter("Frequency Based Schedules", false, "Replace runs of departures at a constant headway with frequency based schedules")]
+        public bool FrequencyBasedSchedules;
+
+        [RunParameter("Headway Tolerance", 30.0f, "The maximum difference in seconds between headways in the same frequency based schedule")]
+        public float HeadwayTolerance;
+
+        [RunParameter("Minimum Frequency Trips", 4, "The minimum number of departures at a constant headway to create a frequency based schedule")]
+        public int MinimumFrequencyTrips;
+
+        [RunParameter("Incremental", false, "Only replace the timetables of lines whose service changed since the last import, skipping unchanged lines")]
+        public bool Incremental;
+
         public float Progress
         {
             get;
@@ -50,6 +62,16 @@ namespace TMG.Aimsun.InputOutput
 
         public bool RuntimeValidation(ref string error)
         {
+            if (HeadwayTolerance < 0.0f)
+            {
+                error = "In '" + Name + "' the headway tolerance can not be negative.";
+                return false;
+            }
+            if (MinimumFrequencyTrips < 2)
+            {
+                error = "In '" + Name + "' the minimum number of frequency trips must be at least 2.";
+                return false;
+            }
             return true;
         }
         public bool Execute(ModellerController aimsunController)
@@ -61,10 +83,21 @@ namespace TMG.Aimsun.InputOutput
             return aimsunController.Run(this, ToolName,
                 JsonParameterBuilder.BuildParameters(writer =>
                 {
-                    writer.WritePropertyName("NetworkPackageFile");
-                    writer.WriteValue(NetworkPackageFile.GetFilePath());
+                    if (NetworkPackageFile != null)
+                    {
+                        writer.WritePropertyName("NetworkPackageFile");
+                        writer.WriteValue(NetworkPackageFile.GetFilePath());
+                    }
                     writer.WritePropertyName("ServiceTableCSV");
                     writer.WriteValue(ServiceTableCSV.GetFilePath());
+                    writer.WritePropertyName("FrequencyBasedSchedules");
+                    writer.WriteValue(FrequencyBasedSchedules);
+                    writer.WritePropertyName("HeadwayTolerance");
+                    writer.WriteValue(HeadwayTolerance);
+                    writer.WritePropertyName("MinimumFrequencyTrips");
+                    writer.WriteValue(MinimumFrequencyTrips);
+                    writer.WritePropertyName("Incremental");
+                    writer.WriteValue(Incremental);
                 }));
         }
     }
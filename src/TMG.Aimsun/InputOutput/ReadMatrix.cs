@@ -0,0 +1,71 @@
+﻿/*
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+using System;
+using XTMF;
+
+namespace TMG.Aimsun.InputOutput
+{
+    /// <summary>
+    /// A tool to read a matrix from the Aimsun model over the bridge pipe
+    /// </summary>
+    [ModuleInformation(Description = "Read the cells of a matrix from the Aimsun model over the bridge without writing a file. After the tool runs the cells are available in row major centroid order along with the zone of each row and column.")]
+    public class ReadMatrix : IAimsunTool
+    {
+        [RunParameter("Matrix Name", "", "The name of the matrix to read")]
+        public string MatrixName;
+
+        /// <summary>
+        /// The cells of the matrix in row major order
+        /// </summary>
+        public float[] Data { get; private set; }
+
+        /// <summary>
+        /// The zone of each row and column of the matrix
+        /// </summary>
+        public string[] Zones { get; private set; }
+
+        public string Name { get; set; }
+
+        public float Progress => 0f;
+
+        public Tuple<byte, byte, byte> ProgressColour => new Tuple<byte, byte, byte>(50, 150, 50);
+
+        public bool Execute(ModellerController aimsunController)
+        {
+            if (aimsunController == null)
+            {
+                throw new XTMFRuntimeException(this, "AimsunController is not properly setup or initalized.");
+            }
+            Data = aimsunController.ReadMatrix(this, MatrixName, out var zones);
+            Zones = zones;
+            return true;
+        }
+
+        public bool RuntimeValidation(ref string error)
+        {
+            if (string.IsNullOrWhiteSpace(MatrixName))
+            {
+                error = "In '" + Name + "' a matrix name must be given.";
+                return false;
+            }
+            return true;
+        }
+    }
+}
@@ -66,6 +66,9 @@ namespace TMG.Aimsun.assignment
         [RunParameter("Name of Public Transit Plan", "", "The name of the public transit plan")]
         public string NameOfPublicTransitPlan;
 
+        [RunParameter("Warm Start", false, "Start Frank-Wolfe from the path assignment of the previous warm started run of the scenario instead of an all or nothing assignment, which this run then replaces. Use it across feedback iterations when the demand only changes a little")]
+        public bool WarmStart;
+
         [SubModelInformation(Description = "traffic classes", Required = true)]
         public TrafficClass[] TrafficClasses;
 
@@ -97,6 +100,8 @@ namespace TMG.Aimsun.assignment
                     writer.WriteValue(NameOfTrafficDemand);
                     writer.WritePropertyName("nameOfPublicTransitPlan");
                     writer.WriteValue(NameOfPublicTransitPlan);
+                    writer.WritePropertyName("warmStart");
+                    writer.WriteValue(WarmStart);
                     writer.WritePropertyName("matrixName");
                     writer.WriteStartArray();
                     for (int i = 0; i < TrafficClasses.Length; i++)
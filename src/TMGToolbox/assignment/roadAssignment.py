@@ -44,6 +44,9 @@ def create_scenario(model, trafficDemand, ptPlan, xtmf_parameters):
     cmd1 = model.createNewCmd(model.getType("GKPathAssignment"))
     model.getCommander().addCommand(cmd1)
     PathAssignment = cmd1.createdObject()
+    if xtmf_parameters.get("warmStart", False):
+        # name the path assignment so the next warm started run of the scenario can start from it
+        PathAssignment.setName(path_assignment_name(xtmf_parameters))
 
     dataToOutput = scenario.getOutputData()
     dataToOutput.setGenerateSkims(1)
@@ -52,9 +55,29 @@ def create_scenario(model, trafficDemand, ptPlan, xtmf_parameters):
 
     return (scenario, PathAssignment)
 
-def create_experiment_for_scenario(model, scenario, PathAssignment, xtmf_parameters):
+def path_assignment_name(xtmf_parameters):
     """
-    Function to create the experiment
+    Function to get the name of the path assignment output by the scenario
+    """
+    return xtmf_parameters["scenarioName"] + " Path Assignment"
+
+def find_previous_path_assignment(model, catalog, xtmf_parameters):
+    """
+    Function to find the path assignment output by the previous warm started run of the
+    scenario, the most recent one if an interrupted run left several behind
+    """
+    name = path_assignment_name(xtmf_parameters)
+    previous = None
+    for pathAssignment in iter(catalog.getObjectsByType(model.getType("GKPathAssignment")).values()):
+        if pathAssignment is not None and pathAssignment.getName() == name:
+            if previous is None or pathAssignment.getId() > previous.getId():
+                previous = pathAssignment
+    return previous
+
+def create_experiment_for_scenario(model, scenario, PathAssignment, xtmf_parameters, initialPathAssignment=None):
+    """
+    Function to create the experiment. When an initial path assignment is given Frank-Wolfe
+    starts from its paths instead of an all or nothing assignment.
     """
     #create a new experiment
     macroExperimentCmd = model.createNewCmd(model.getType("MacroExperiment"))
@@ -71,9 +94,32 @@ def create_experiment_for_scenario(model, scenario, PathAssignment, xtmf_paramet
     model.getCatalog().add(experiment)
     experiment.setScenario(scenario)
     experiment.setOutputPathAssignment(PathAssignment)
+    if initialPathAssignment is not None:
+        set_input_path_assignment(experiment, initialPathAssignment)
     
     return experiment
 
+def set_input_path_assignment(experiment, initialPathAssignment):
+    """
+    Function to set the path assignment the experiment starts from, checking that the
+    MacroExperiment of this version of Aimsun supports an input path assignment
+    """
+    if not hasattr(experiment, "setInputPathAssignment"):
+        raise Exception("This version of Aimsun can not start a MacroExperiment from a path assignment, "
+                        "turn off the warm start")
+    experiment.setInputPathAssignment(initialPathAssignment)
+    if hasattr(experiment, "getInputPathAssignment") and experiment.getInputPathAssignment() is None:
+        raise Exception(f"The path assignment '{initialPathAssignment.getName()}' could not be set as the "
+                        "input of the experiment")
+
+def replace_previous_path_assignment(model, experiment, previousPathAssignment):
+    """
+    Function to delete the path assignment the experiment started from once the new path
+    assignment, which has the same name, replaces it
+    """
+    experiment.setInputPathAssignment(None)
+    model.getCommander().addCommand(previousPathAssignment.getDelCmd())
+
 def deleteExperimentMatrices(model, skimMatrixList, matrixList):
     """
     Function to delete experiment output skim matrices which are not needed
@@ -122,7 +168,8 @@ def run_xtmf(parameters, model, console):
         "experimentName": parameters["experimentName"],
         "trafficDemandName": parameters["nameOfTrafficDemand"],
         "PublicTransitPlanName": parameters["nameOfPublicTransitPlan"],
-        "MatrixNames": parameters["matrixName"]
+        "MatrixNames": parameters["matrixName"],
+        "warmStart": parameters.get("warmStart", False)
     }
     _execute(model, console, xtmf_parameters)
 
@@ -142,12 +189,19 @@ def _execute(inputModel, console, xtmf_parameters):
     trafficDemandObject = catalog.findByName(xtmf_parameters["trafficDemandName"])
     # extract the public transit object
     publicTransitObject = catalog.findByName(xtmf_parameters["PublicTransitPlanName"])
+    # a warm start begins from the path assignment of the previous warm started run
+    initialPathAssignment = None
+    if xtmf_parameters.get("warmStart", False):
+        initialPathAssignment = find_previous_path_assignment(model, catalog, xtmf_parameters)
     # Create the scenario
     scenario, pathAssignment = create_scenario(model, trafficDemandObject, publicTransitObject, xtmf_parameters)
     # generate the experiment
-    experiment = create_experiment_for_scenario(model, scenario, pathAssignment, xtmf_parameters)
+    experiment = create_experiment_for_scenario(model, scenario, pathAssignment, xtmf_parameters, initialPathAssignment)
     # Execute the experiment for road assignment
-    print("Run road assignment experiment")
+    if initialPathAssignment is not None:
+        print("Run road assignment experiment starting from the previous path assignment")
+    else:
+        print("Run road assignment experiment")
     system.executeAction("execute", experiment, [], "static assignment")
     experiment.getStatsManager().createTrafficState()
     # extract the skim matrices 
@@ -156,6 +210,9 @@ def _execute(inputModel, console, xtmf_parameters):
     experiment_id = experiment.getId()
     # rename generated skim matrices 
     renameSkimMatrices(model, experiment_id, xtmf_parameters["MatrixNames"], skimMatrixList, catalog)
+    # the new path assignment has been computed and replaces the one the run started from
+    if initialPathAssignment is not None:
+        replace_previous_path_assignment(model, experiment, initialPathAssignment)
     print ('experiment ran successfully')
     
 def runFromConsole(inputArgs):
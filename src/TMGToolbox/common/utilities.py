@@ -1,5 +1,4 @@
 
-import csv
 from PyANGBasic import *
 from PyANGKernel import *
 from PyANGDTA import *
@@ -25,107 +24,59 @@ def formatReverseStack():
     return msg
 
 
+# Matrices are read and written through the formats in inputOutput/common/matrixIO.py
+# (csv, square, bin, npy and ascii) with importMatrixFile and exportMatrixFile.
+# The functions below are kept for the scripts that still call them. They import matrixIO
+# when called because common only resolves to inputOutput/common when a tool is running.
+
 def exportMatrixASCII(location, matrix):
-    with open(location, 'w') as file:
-        centroids = matrix.getCentroidConfiguration().getCentroidsInOrder()
-        file.write('%u %s\n' % (matrix.getId(), matrix.getName()))
-        if matrix.getVehicle() != None:
-            file.write('%u %s\n' % (matrix.getVehicle().getId(), matrix.getVehicle().getName()))
-            print
-            '%u %s\n' % (matrix.getVehicle().getId(), matrix.getVehicle().getName())
-        else:
-            file.write('0 None\n')
-        file.write('%s\n' % matrix.getFrom().toString())
-        file.write('%s\n' % matrix.getDuration().toString())
-        for origin in centroids:
-            for destination in centroids:
-                if origin != destination:
-                    trips = matrix.getTrips(origin, destination)
-                    if trips > 0:
-                        file.write('%u %u %f\n' % (origin.getId(), destination.getId(), trips))
+    """
+    Write a matrix in the Aimsun ASCII format of the export tools
+    """
+    from common.centroidIndex import getCentroidIndex
+    from common.matrixIO import exportMatrixFile
+    exportMatrixFile(matrix, location, "ascii", getCentroidIndex(matrix.getCentroidConfiguration()))
 
 
 def exportMatrixCSV(location, matrix):
-    centroids = matrix.getCentroidConfiguration().getCentroidsInOrder()
-    with open(location, 'wb') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(['#', matrix.getId(), matrix.getName()])
-        if matrix.getVehicle() != None:
-            writer.writerow(['#', matrix.getVehicle().getId(), matrix.getVehicle().getName()])
-        else:
-            writer.writerow(['#', None, None])
-        for origin in centroids:
-            for destination in centroids:
-                if origin != destination:
-                    trips = matrix.getTrips(origin, destination)
-                    if trips > 0:
-                        writer.writerow([origin.getId(), destination.getId(), trips])
+    """
+    Write a matrix as an origin,destination,value csv file of zone numbers
+    """
+    from common.centroidIndex import getCentroidIndex
+    from common.matrixIO import exportMatrixFile
+    exportMatrixFile(matrix, location, "csv", getCentroidIndex(matrix.getCentroidConfiguration()))
+
 
+def importMatrix(fileName, centroidConf):
+    """
+    Import a matrix from an Aimsun ASCII file holding one matrix. The matrix is found
+    by its id or created with its name, and cells of unknown centroids are skipped.
+    """
+    from common.centroidIndex import getCentroidIndex
+    from common.matrixIO import importMatrixFile
+    model = centroidConf.getModel()
+    catalog = model.getCatalog()
+    with open(fileName) as matfile:
+        matrixLine, vehicleLine, fromTime, duration = [next(matfile, "").strip() for _ in range(4)]
+    matrixId, matrixName = matrixLine.split(" ", 1)
+    matrix = catalog.find(int(matrixId))
+    if matrix is None or matrix.isA("GKODMatrix") is False:
+        matrix = GKSystem.getSystem().newObject("GKODMatrix", model)
+        matrix.setName(matrixName)
+        centroidConf.addODMatrix(matrix)
+    vehicleId, vehicleName = vehicleLine.split(" ", 1)
+    vehicle = catalog.find(int(vehicleId))
+    if vehicle is None:
+        vehicle = catalog.findByName(vehicleName)
+    if vehicle is not None:
+        matrix.setVehicle(vehicle)
+    matrix.setFrom(QTime.fromString(fromTime, Qt.ISODate))
+    matrix.setDuration(GKTimeDuration.fromString(duration))
+    importMatrixFile(matrix, fileName, "ascii", getCentroidIndex(centroidConf), set())
+    matrix.setStatus(GKObject.eModified)
+    model.getCommander().addCommand(None)
+    return matrix
 
-# This script imports matrices from an ASCII file.
-#
-# This script imports all the matrices in a centroid configuration.
-# The matrices must be saved in an ASCII file, one after another and separated
-# by a blank line. The format for each matrix must be:
-# AIMSUN_ID AIMSUN_NAME
-# VEHICLE_ID VEHICLE_NAME
-# Initial Time
-# Duration
-# For each O/D a line with:
-# ORIGIN_CENTROID_ID DESTINATION_CENTROID_ID Trips
-#
-# If no vehicle has been assigned to a matrix the ID must be 0.
-# Note that names for vehicles and matrices can contain the space character
-def importMatrix( fileName, centroidConf ):
-    state = 0
-    matrix = None
-    for line in open( fileName, "r" ).readlines():
-        line = line.strip()
-        if len( line ) == 0:
-            state = 0
-        else:
-            if state == 0 :
-                state = 1
-                # read identifier and name
-                matrixId = int( line[:line.index(' ')])
-                matrixName = line[line.index(' ')+1:]
-                matrix = centroidConf.getModel().getCatalog().find( matrixId )
-                if matrix == None or matrix.isA( "GKODMatrix" ) == False:
-                    matrix = GKSystem.getSystem().newObject( "GKODMatrix", model )
-                    matrix.setName( matrixName )
-                    centroidConf.addODMatrix( matrix )
-                else:
-                    print "New Matrix"
-            elif state == 1:
-                state = 2
-                # read vehicle id and name
-                vehId = int( line[:line.index(' ')] )
-                vehName = line[line.index(' ')+1:]
-                vehicle = centroidConf.getModel().getCatalog().find( vehId )
-                if vehicle == None:
-                        vehicle = centroidConf.getModel().getCatalog().findByName( vehName )
-                if vehicle != None:
-                        matrix.setVehicle( vehicle )
-            elif state == 2:
-                state = 3
-                # From Time
-                matrix.setFrom( QTime.fromString( line, Qt.ISODate ) )
-            elif state == 3:
-                state = 4
-                # Duration
-                matrix.setDuration( GKTimeDuration.fromString( line ) )
-            elif state == 4:
-                # Trips
-                tokens = line.split( " " )
-                if len( tokens ) == 3:
-                    fromCentroid = centroidConf.getModel().getCatalog().find( int(tokens[0]) )
-                    toCentroid = centroidConf.getModel().getCatalog().find( int(tokens[1]) )
-                    trips = float(tokens[2])
-                    # Set the value if the section is valid
-                    if fromCentroid != None and toCentroid != None:
-                        matrix.setTrips( fromCentroid, toCentroid, trips )
-    matrix.setStatus( GKObject.eModified )
-    model.getCommander().addCommand( None )
 
 def deleteObject(object):
     cmd = object.getDelCmd()
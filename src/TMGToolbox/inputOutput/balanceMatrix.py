@@ -0,0 +1,86 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from PyANGBasic import *
+from PyANGKernel import *
+from PyANGConsole import *
+from common.matrixIndex import MatrixIndex
+from common.centroidIndex import getCentroidIndex, reportUnknownZones
+from common.matrixIO import arrayCells, readMatrixArray
+from common.matrixFingerprint import getFingerprintColumn
+from common.matrixBalancing import readZoneTargets, balanceMatrix
+from importMatrixFromCSVThirdNormalized import find_centroid_configuration, store_matrix_cells, add_to_matrix_folder
+
+def run_xtmf(parameters, model, console):
+    """
+    A general function called in all python modules called by bridge. Responsible
+    for extracting data and running appropriate functions.
+    """
+    _execute(model, console, parameters)
+
+def balance_matrix(sourceMatrix, targetFile, header, tolerance, maxIterations, centroidIndex):
+    """
+    Function to read the source matrix and balance it to the trip end targets of the target file
+    """
+    unknownZones = set()
+    originTargets, destinationTargets = readZoneTargets(targetFile, header, centroidIndex.zoneLookup,
+                                                        len(centroidIndex.centroids), unknownZones)
+    reportUnknownZones(unknownZones)
+    array = readMatrixArray(sourceMatrix, centroidIndex.centroids)
+    balanced, iterations, error = balanceMatrix(array, originTargets, destinationTargets, tolerance, maxIterations)
+    if error > tolerance:
+        print(f"Balancing stopped after {iterations} iterations with a relative error of {error}")
+    else:
+        print(f"Balancing converged after {iterations} iterations with a relative error of {error}")
+    return balanced
+
+def _execute(model, console, parameters):
+    """
+    Main execute function to run the simulation.
+    """
+    catalog = model.getCatalog()
+    #extract the json parameters
+    sourceMatrixId = str(parameters["SourceMatrixID"])
+    targetFile = str(parameters["TargetFile"])
+    header = bool(parameters.get("IncludesHeader", True))
+    tolerance = float(parameters.get("Tolerance", 0.0001))
+    maxIterations = int(parameters.get("MaxIterations", 100))
+    matrixId = str(parameters["MatrixID"])
+    centroidConfigurationId = str(parameters["CentroidConfiguration"])
+    vehicleEID = str(parameters["VehicleType"])
+    initialTime = str(parameters["InitialTime"])
+    durationTime = str(parameters["DurationTime"])
+    if maxIterations < 1:
+        raise Exception("The maximum number of iterations must be at least 1")
+
+    centroidConfiguration = find_centroid_configuration(model, catalog, centroidConfigurationId)
+    centroidIndex = getCentroidIndex(centroidConfiguration)
+    matrixIndex = MatrixIndex(model, catalog)
+    sourceMatrix = matrixIndex.findInputMatrix(sourceMatrixId, centroidConfiguration)
+
+    # balance before replacing the result so the source can be balanced in place
+    balanced = balance_matrix(sourceMatrix, targetFile, header, tolerance, maxIterations, centroidIndex)
+
+    matrix, isNew = store_matrix_cells(model, catalog, matrixIndex, getFingerprintColumn(model),
+                                       (matrixId, vehicleEID, initialTime, durationTime), centroidConfiguration,
+                                       centroidIndex, *arrayCells(balanced))
+    if isNew:
+        add_to_matrix_folder(model, [matrix])
+
+    return console
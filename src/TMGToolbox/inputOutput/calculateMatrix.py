@@ -0,0 +1,103 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from PyANGBasic import *
+from PyANGKernel import *
+from PyANGConsole import *
+from common.matrixIndex import MatrixIndex
+from common.centroidIndex import getCentroidIndex
+from common.matrixIO import arrayCells, readMatrixArray
+from common.matrixFingerprint import (getFingerprintColumn, getInputsFingerprintColumn, getMatrixFingerprint,
+                                      setMatrixFingerprint, inputsFingerprint)
+from common.matrixExpression import evaluateExpression, findMatrixNames
+from importMatrixFromCSVThirdNormalized import (find_centroid_configuration, select_matrix, set_matrix_settings,
+                                               store_matrix_cells, add_to_matrix_folder)
+
+def run_xtmf(parameters, model, console):
+    """
+    A general function called in all python modules called by bridge. Responsible
+    for extracting data and running appropriate functions.
+    """
+    _execute(model, console, parameters)
+
+def find_operands(matrixIndex, expression, centroidConfiguration):
+    """
+    Function to find the matrices named in the expression
+    """
+    operands = dict()
+    for matrixId in findMatrixNames(expression):
+        operands[matrixId] = matrixIndex.findInputMatrix(matrixId, centroidConfiguration)
+    return operands
+
+def calculate_matrix(operands, expression, centroidIndex):
+    """
+    Function to evaluate the expression over its matrices and return the resulting array
+    in the order of the centroids
+    """
+    getMatrix = lambda matrixId: readMatrixArray(operands[matrixId], centroidIndex.centroids)
+    return evaluateExpression(expression, getMatrix, len(centroidIndex.centroids))
+
+def is_result_current(matrix, inputs, fingerprintColumn, inputsColumn):
+    """
+    Function to check if the result matrix was calculated from the same inputs and was not
+    written by another tool since
+    """
+    stored = getMatrixFingerprint(matrix, inputsColumn)
+    return stored == f"{inputs}/{getMatrixFingerprint(matrix, fingerprintColumn)}"
+
+def _execute(model, console, parameters):
+    """
+    Main execute function to run the simulation.
+    """
+    catalog = model.getCatalog()
+    #extract the json parameters
+    expression = str(parameters["Expression"])
+    matrixId = str(parameters["MatrixID"])
+    centroidConfigurationId = str(parameters["CentroidConfiguration"])
+    vehicleEID = str(parameters["VehicleType"])
+    initialTime = str(parameters["InitialTime"])
+    durationTime = str(parameters["DurationTime"])
+
+    centroidConfiguration = find_centroid_configuration(model, catalog, centroidConfigurationId)
+    centroidIndex = getCentroidIndex(centroidConfiguration)
+    matrixIndex = MatrixIndex(model, catalog)
+
+    # skip the calculation when neither the matrices of the expression nor the result changed
+    operands = find_operands(matrixIndex, expression, centroidConfiguration)
+    fingerprintColumn = getFingerprintColumn(model)
+    inputsColumn = getInputsFingerprintColumn(model)
+    inputs = inputsFingerprint(model, list(operands.values()), expression)
+    existing = select_matrix(matrixIndex, matrixId, centroidConfiguration)
+    if existing is not None and is_result_current(existing, inputs, fingerprintColumn, inputsColumn):
+        set_matrix_settings(model, catalog, existing, vehicleEID, initialTime, durationTime)
+        print(f"The inputs of the matrix '{matrixId}' are unchanged, skipping the calculation")
+        return console
+
+    # evaluate before replacing the result so the result matrix can be used in the expression
+    result = calculate_matrix(operands, expression, centroidIndex)
+
+    matrix, isNew = store_matrix_cells(model, catalog, matrixIndex, fingerprintColumn,
+                                       (matrixId, vehicleEID, initialTime, durationTime), centroidConfiguration,
+                                       centroidIndex, *arrayCells(result))
+    setMatrixFingerprint(matrix, inputsColumn, f"{inputs}/{getMatrixFingerprint(matrix, fingerprintColumn)}")
+    if isNew:
+        add_to_matrix_folder(model, [matrix])
+    print(f"Calculated the matrix '{matrixId}' with a total of {result.sum()}")
+
+    return console
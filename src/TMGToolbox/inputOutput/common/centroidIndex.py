@@ -0,0 +1,163 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Load in the required libraries
+import numpy as np
+from common.matrixIO import buildZoneLookup
+
+# Prefix of the external id of the centroids created by importNetwork
+CENTROID_PREFIX = "centroid_"
+
+
+def zoneFromExternalId(externalId):
+    """
+    Function to get the zone number of a centroid from its external id centroid_<zone>.
+    Returns None if the external id does not follow that pattern.
+    """
+    if externalId is None or not externalId.startswith(CENTROID_PREFIX):
+        return None
+    return externalId[len(CENTROID_PREFIX):]
+
+
+class CentroidIndex:
+    """
+    Stable index of the centroids of a centroid configuration in centroid order, with the
+    zone number, id, external id and position of each centroid held in arrays so the matrix
+    tools never have to resolve centroids one at a time. Use getCentroidIndex to share one
+    index per centroid configuration between tool runs.
+    """
+
+    def __init__(self, centroidConfiguration, centroids=None):
+        if centroids is None:
+            centroids = list(centroidConfiguration.getCentroidsInOrder())
+        self.ids = np.fromiter((centroid.getId() for centroid in centroids), dtype=np.int64, count=len(centroids))
+        self.externalIds = [centroid.getExternalId() for centroid in centroids]
+        zones = [zoneFromExternalId(externalId) for externalId in self.externalIds]
+        self._zones = zones
+        self.refresh(centroidConfiguration, centroids)
+        # integer zone number of each centroid, -1 for centroids without one
+        self.zoneNumbers = np.array([int(zone) if zone is not None and zone.isdigit() else -1 for zone in zones],
+                                    dtype=np.int64)
+        # the zone of each centroid as written in the matrix files
+        self.zoneLabels = [zone if zone is not None else (externalId if externalId else str(centroidId))
+                           for zone, externalId, centroidId in zip(zones, self.externalIds, self.ids.tolist())]
+        self._zoneLookup = None
+        self._idLookup = None
+
+    def refresh(self, centroidConfiguration, centroids):
+        """
+        Use the centroid objects of the current model, which must be the centroids this
+        index was built from
+        """
+        self.centroidConfiguration = centroidConfiguration
+        self.centroids = centroids
+        # zone number as written in the matrix files -> centroid
+        self.byZone = dict()
+        for zone, centroid in zip(self._zones, centroids):
+            if zone is not None:
+                self.byZone[zone] = centroid
+        # the centroids may have moved
+        self._positions = None
+
+    def isCurrent(self, centroids):
+        """
+        Return True if the centroids are still the ones this index was built from, in the same order
+        """
+        if len(centroids) != len(self.centroids):
+            return False
+        return all(centroid.getId() == centroidId and centroid.getExternalId() == externalId
+                   for centroid, centroidId, externalId in zip(centroids, self.ids.tolist(), self.externalIds))
+
+    @property
+    def zoneLookup(self):
+        """
+        Array mapping each integer zone number to the index of its centroid in self.centroids,
+        -1 for zone numbers without a centroid. Built on first use.
+        """
+        if self._zoneLookup is None:
+            indices = np.flatnonzero(self.zoneNumbers >= 0)
+            lookup = buildZoneLookup(self.zoneNumbers[indices])
+            # buildZoneLookup indexes into the numbered zones, map those to the centroid order
+            valid = lookup >= 0
+            lookup[valid] = indices[lookup[valid]]
+            self._zoneLookup = lookup
+        return self._zoneLookup
+
+    @property
+    def idLookup(self):
+        """
+        Array mapping each centroid id to the index of the centroid in self.centroids
+        """
+        if self._idLookup is None:
+            self._idLookup = buildZoneLookup(self.ids)
+        return self._idLookup
+
+    @property
+    def positions(self):
+        """
+        (centroids, 2) array of the x and y position of each centroid. Built on first use.
+        """
+        if self._positions is None:
+            positions = np.empty((len(self.centroids), 2), dtype=np.float64)
+            for i, centroid in enumerate(self.centroids):
+                position = centroid.getPosition()
+                positions[i, 0] = position.x
+                positions[i, 1] = position.y
+            self._positions = positions
+        return self._positions
+
+    def getCentroid(self, zone):
+        """
+        Return the centroid of the zone or None if the zone is not in the configuration
+        """
+        return self.byZone.get(zone)
+
+
+# The centroid index of each centroid configuration by id, kept between tool runs
+_centroidIndexCache = dict()
+
+
+def getCentroidIndex(centroidConfiguration):
+    """
+    Function to get the centroid index of a centroid configuration. The cached index is
+    reused while the configuration has the same centroids in the same order and rebuilt
+    when centroids have been added or removed.
+    """
+    centroids = list(centroidConfiguration.getCentroidsInOrder())
+    key = centroidConfiguration.getId()
+    centroidIndex = _centroidIndexCache.get(key)
+    if centroidIndex is None or not centroidIndex.isCurrent(centroids):
+        centroidIndex = CentroidIndex(centroidConfiguration, centroids)
+        _centroidIndexCache[key] = centroidIndex
+    else:
+        # keep the arrays but always use the objects of the current model
+        centroidIndex.refresh(centroidConfiguration, centroids)
+    return centroidIndex
+
+
+def reportUnknownZones(unknownZones):
+    """
+    Function to raise a single error listing every zone that could not be found
+    """
+    if len(unknownZones) > 0:
+        zones = sorted(unknownZones)
+        listed = ", ".join(f"'{CENTROID_PREFIX}{zone}'" for zone in zones[:20])
+        if len(zones) > 20:
+            listed += f" and {len(zones) - 20} more"
+        raise Exception(f"The specified centroids {listed} do not exist")
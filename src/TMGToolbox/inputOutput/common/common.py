@@ -28,22 +28,6 @@ import shlex
 import zipfile
 import io
 
-def deleteAimsunObject(model, catalog, objectType, matrixId=''):
-    """
-    Method to delete the various aimsun objects
-    duplicated from assignment/commonModule.py
-    """
-    sectionType = model.getType(objectType)
-    for types in model.getCatalog().getUsedSubTypesFromType( sectionType ):
-        for s in iter(types.values()):
-            # delete the objects using the getDelCmd()
-            if s is not None:
-                # check if the name matches. Since it matches we then delete the object 
-                if matrixId == s.getName():
-                    cmd = s.getDelCmd()
-                    model.getCommander().addCommand(cmd)
-
-
 def extract_network_packagefile(network_package_file):
     """
     Function which takes a zipped file in this case the networkpackage file and
@@ -123,6 +107,25 @@ def cacheAllOfTypeByExternalId(typeString, model, catalog):
         cacheDict[externalId] = o
     return cacheDict
 
+# Attribute of the transit lines storing the external id of the line's transit vehicle
+TRANSIT_VEHICLE_COLUMN = "GKPublicLine::TransitVehicle"
+# Attribute of the timetables storing the fingerprint of the service they were built from
+SERVICE_FINGERPRINT_COLUMN = "GKPublicLineTimeTable::ServiceFingerprint"
+# Attribute of the OD matrices storing the fingerprint of their cells
+MATRIX_FINGERPRINT_COLUMN = "GKODMatrix::ContentFingerprint"
+# Attribute of the OD matrices storing the fingerprint of the inputs they were calculated from
+MATRIX_INPUTS_FINGERPRINT_COLUMN = "GKODMatrix::InputsFingerprint"
+
+def getOrCreateColumn(model, typeName, columnName, externalName, columnType):
+    """
+    Function to find an attribute of an Aimsun type and create it if it does not exist
+    """
+    objectType = model.getType(typeName)
+    column = objectType.getColumn(columnName, GKType.eSearchOnlyThisType)
+    if column is None:
+        column = objectType.addColumn(columnName, externalName, columnType)
+    return column
+
 def cacheNodeConnections(listOfNodes, listOfSections):
     nodeConnections = initializeNodeConnections(listOfNodes)
     for section in listOfSections:
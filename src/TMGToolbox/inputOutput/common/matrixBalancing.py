@@ -0,0 +1,139 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Load in the required libraries
+import numpy as np
+from common.matrixIO import mapZones
+
+
+def _readColumns(fileLocation, header, columns):
+    """
+    Function to read the numeric columns of a csv file into a 2D array
+    """
+    return np.loadtxt(fileLocation, delimiter=",", skiprows=1 if header else 0, ndmin=2, usecols=columns)
+
+
+def _mapZoneColumn(zones, zoneLookup, unknownZones):
+    """
+    Function to map a column of zone numbers to indices, adding the zones that are not
+    in the lookup to unknownZones
+    """
+    zones = zones.astype(np.int64)
+    indices, unknown = mapZones(zones, zoneLookup)
+    unknownZones.update(str(zone) for zone in np.unique(zones[unknown]).tolist())
+    return indices, ~unknown
+
+
+def readZoneTargets(fileLocation, header, zoneLookup, numberOfZones, unknownZones):
+    """
+    Function to read a zone,origin,destination csv file of trip end targets.
+    Returns the origin and destination target of each zone, zones not in the file are zero.
+    """
+    data = _readColumns(fileLocation, header, (0, 1, 2))
+    indices, known = _mapZoneColumn(data[:, 0], zoneLookup, unknownZones)
+    originTargets = np.zeros(numberOfZones)
+    destinationTargets = np.zeros(numberOfZones)
+    np.add.at(originTargets, indices[known], data[known, 1])
+    np.add.at(destinationTargets, indices[known], data[known, 2])
+    return originTargets, destinationTargets
+
+
+def balanceMatrix(array, originTargets, destinationTargets, tolerance=0.0001, maxIterations=100):
+    """
+    Function to balance a matrix to origin and destination targets with iterative proportional
+    fitting. The destination targets are scaled to the total of the origin targets. Stops when
+    every row and column total is within tolerance of its target, relative to the largest
+    target, or after maxIterations. Rows and columns without any trips stay empty.
+    Returns the balanced matrix, the number of iterations and the largest relative error.
+    """
+    if np.any(originTargets < 0) or np.any(destinationTargets < 0):
+        raise Exception("The trip end targets can not be negative")
+    balanced = np.array(array, dtype=np.float64)
+    originTotal = originTargets.sum()
+    destinationTotal = destinationTargets.sum()
+    if destinationTotal > 0:
+        destinationTargets = destinationTargets * (originTotal / destinationTotal)
+    scale = max(originTargets.max(initial=0.0), destinationTargets.max(initial=0.0), 1e-12)
+    error = np.inf
+    iteration = 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        while iteration < maxIterations:
+            iteration += 1
+            rowTotals = balanced.sum(axis=1)
+            balanced *= np.where(rowTotals > 0, originTargets / rowTotals, 0.0)[:, np.newaxis]
+            columnTotals = balanced.sum(axis=0)
+            balanced *= np.where(columnTotals > 0, destinationTargets / columnTotals, 0.0)[np.newaxis, :]
+            # the columns match after the column step, so only the rows can be off
+            error = np.abs(balanced.sum(axis=1) - originTargets).max(initial=0.0) / scale
+            if error <= tolerance:
+                break
+    return balanced, iteration, error
+
+
+def readCorrespondence(fileLocation, header, fromLookup, numberOfFromZones, toLookup, numberOfToZones, unknownZones):
+    """
+    Function to read a fromZone,toZone[,weight] csv file into a (from zones, to zones) array of
+    the share of each from zone that goes to each to zone. A from zone in several rows is split
+    in proportion to the weights, which default to 1, and to zones in several rows are aggregated.
+    """
+    with open(fileLocation) as csvFile:
+        if header:
+            csvFile.readline()
+        firstLine = ""
+        for line in csvFile:
+            if line.strip():
+                firstLine = line
+                break
+    columns = (0, 1, 2) if len(firstLine.split(",")) >= 3 else (0, 1)
+    data = _readColumns(fileLocation, header, columns)
+    fromIndices, fromKnown = _mapZoneColumn(data[:, 0], fromLookup, unknownZones)
+    toIndices, toKnown = _mapZoneColumn(data[:, 1], toLookup, unknownZones)
+    weights = data[:, 2] if len(columns) == 3 else np.ones(len(data))
+    if np.any(weights < 0):
+        raise Exception("The correspondence weights can not be negative")
+    known = fromKnown & toKnown
+    shares = np.zeros((numberOfFromZones, numberOfToZones))
+    np.add.at(shares, (fromIndices[known], toIndices[known]), weights[known])
+    totals = shares.sum(axis=1)
+    np.divide(shares, totals[:, np.newaxis], out=shares, where=totals[:, np.newaxis] > 0)
+    return shares
+
+
+def convertZones(array, shares):
+    """
+    Function to move a matrix to another zone system with the shares of readCorrespondence.
+    Trips of from zones without a correspondence are dropped.
+    Only the non zero shares are applied, one row at a time, so the cost is
+    O(shares * zones) instead of the O(zones^3) of multiplying by the dense shares.
+    """
+    fromIndices, toIndices = np.nonzero(shares)
+    weights = shares[fromIndices, toIndices].tolist()
+    fromIndices = fromIndices.tolist()
+    toIndices = toIndices.tolist()
+    numberOfToZones = shares.shape[1]
+    # move the origins to the new zones
+    rows = np.zeros((numberOfToZones, array.shape[1]))
+    for fromIndex, toIndex, weight in zip(fromIndices, toIndices, weights):
+        rows[toIndex] += weight * array[fromIndex]
+    # then move the destinations the same way on the transposed rows
+    rows = np.ascontiguousarray(rows.T)
+    converted = np.zeros((numberOfToZones, numberOfToZones))
+    for fromIndex, toIndex, weight in zip(fromIndices, toIndices, weights):
+        converted[toIndex] += weight * rows[fromIndex]
+    return converted.T
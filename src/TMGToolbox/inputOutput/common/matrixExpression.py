@@ -0,0 +1,150 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Load in the required libraries
+import ast
+import numpy as np
+
+
+def _divide(numerator, denominator):
+    """
+    Division where the cells divided by zero are zero
+    """
+    numerator, denominator = np.broadcast_arrays(np.asarray(numerator, dtype=np.float64),
+                                                 np.asarray(denominator, dtype=np.float64))
+    return np.divide(numerator, denominator, out=np.zeros(numerator.shape), where=denominator != 0.0)
+
+
+_BINARY_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: _divide,
+    ast.Pow: np.power,
+}
+
+_UNARY_OPERATORS = {
+    ast.USub: np.negative,
+    ast.UAdd: np.positive,
+    ast.Not: np.logical_not,
+}
+
+_COMPARISONS = {
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+
+_FUNCTIONS = {
+    "abs": np.abs,
+    "exp": np.exp,
+    "log": np.log,
+    "sqrt": np.sqrt,
+    "minimum": np.minimum,
+    "maximum": np.maximum,
+    "where": np.where,
+    "clip": np.clip,
+    "transpose": np.transpose,
+}
+
+
+def findMatrixNames(expression):
+    """
+    Function to list the matrices used by an expression in the order they first appear
+    """
+    names = dict()
+    nodes = list(ast.walk(_parse(expression)))
+    # the name of a called function is never a matrix, this includes matrix("name") itself
+    functions = {id(node.func) for node in nodes if isinstance(node, ast.Call)}
+    for node in nodes:
+        if (isinstance(node, ast.Name) and id(node) not in functions and node.id not in _FUNCTIONS
+                and node.id != "intrazonal"):
+            names[node.id] = None
+        elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "matrix"
+                and len(node.args) == 1 and isinstance(node.args[0], ast.Constant)):
+            names[str(node.args[0].value)] = None
+    return list(names)
+
+
+def _parse(expression):
+    try:
+        return ast.parse(expression, mode="eval")
+    except SyntaxError as e:
+        raise Exception(f"The matrix expression '{expression}' is not valid: {e.msg}")
+
+
+def evaluateExpression(expression, getMatrix, numberOfZones):
+    """
+    Function to evaluate a matrix expression into a numberOfZones by numberOfZones array.
+    Matrices are referenced by name, or with matrix("name") when the name is not a valid
+    identifier, and getMatrix(name) returns their cells. The expression supports numbers,
+    + - * / **, comparisons, and, or, not, the functions abs, exp, log, sqrt, minimum,
+    maximum, where, clip and transpose, and intrazonal, which is 1 on the diagonal.
+    Cells divided by zero are zero.
+    """
+    matrices = dict()
+
+    def lookup(name):
+        if name not in matrices:
+            matrices[name] = getMatrix(name)
+        return matrices[name]
+
+    def visit(node):
+        if isinstance(node, ast.Expression):
+            return visit(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            return float(node.value)
+        if isinstance(node, ast.Name):
+            if node.id == "intrazonal":
+                return np.eye(numberOfZones)
+            return lookup(node.id)
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            return _BINARY_OPERATORS[type(node.op)](visit(node.left), visit(node.right))
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+            return _UNARY_OPERATORS[type(node.op)](visit(node.operand))
+        if isinstance(node, ast.Compare) and len(node.ops) == 1 and type(node.ops[0]) in _COMPARISONS:
+            return _COMPARISONS[type(node.ops[0])](visit(node.left), visit(node.comparators[0]))
+        if isinstance(node, ast.BoolOp):
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            result = visit(node.values[0])
+            for value in node.values[1:]:
+                result = combine(result, visit(value))
+            return result
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and len(node.keywords) == 0:
+            if node.func.id == "matrix":
+                if len(node.args) != 1 or not isinstance(node.args[0], ast.Constant):
+                    raise Exception("matrix() takes the name of a matrix in quotes")
+                return lookup(str(node.args[0].value))
+            function = _FUNCTIONS.get(node.func.id)
+            if function is not None:
+                return function(*[visit(argument) for argument in node.args])
+        raise Exception(f"The matrix expression '{expression}' contains '{ast.dump(node)}' which is not supported")
+
+    with np.errstate(all="ignore"):
+        result = visit(_parse(expression))
+    result = np.asarray(result, dtype=np.float64)
+    if result.ndim > 2 or (result.ndim == 2 and result.shape != (numberOfZones, numberOfZones)):
+        raise Exception(f"The matrix expression '{expression}' gives an array of shape {result.shape}")
+    result = np.array(np.broadcast_to(result, (numberOfZones, numberOfZones)))
+    if not np.all(np.isfinite(result)):
+        raise Exception(f"The matrix expression '{expression}' gives cells that are not finite")
+    return result
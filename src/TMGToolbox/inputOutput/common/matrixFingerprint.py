@@ -0,0 +1,91 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Load in the required libraries
+import hashlib
+from PyANGKernel import *
+from common.common import getOrCreateColumn, MATRIX_FINGERPRINT_COLUMN, MATRIX_INPUTS_FINGERPRINT_COLUMN
+from common.centroidIndex import getCentroidIndex
+from common.matrixIO import fingerprintArray, readMatrixArray
+
+# The content fingerprint is stored on each GKODMatrix when a tool writes its cells, so every
+# tool that writes matrix cells must also call setMatrixFingerprint. Comparing fingerprints
+# lets the tools skip work when their input matrices have not changed since the last run:
+# no tool writes cells that match the stored Content Fingerprint of the matrix, and
+# CalculateMatrix does not recalculate a result whose Inputs Fingerprint matches.
+# The stored fingerprint is trusted, so a matrix edited any other way, by hand in Aimsun or
+# by another script, must have its Content Fingerprint attribute cleared. replace_matrix
+# clears it before a matrix is written again.
+
+
+def getFingerprintColumn(model):
+    """
+    Function to get the attribute storing the content fingerprint of the OD matrices
+    """
+    return getOrCreateColumn(model, "GKODMatrix", MATRIX_FINGERPRINT_COLUMN, "Content Fingerprint", GKColumn.String)
+
+
+def getInputsFingerprintColumn(model):
+    """
+    Function to get the attribute storing the fingerprint of the inputs of a calculated matrix
+    """
+    return getOrCreateColumn(model, "GKODMatrix", MATRIX_INPUTS_FINGERPRINT_COLUMN, "Inputs Fingerprint", GKColumn.String)
+
+
+def getMatrixFingerprint(matrix, column):
+    """
+    Function to get the stored fingerprint of a matrix, an empty string if it has none
+    """
+    fingerprint = matrix.getDataValueString(column)
+    return fingerprint if fingerprint else ""
+
+
+def setMatrixFingerprint(matrix, column, fingerprint):
+    """
+    Function to store the fingerprint of a matrix
+    """
+    matrix.setDataValue(column, fingerprint)
+
+
+def matrixFingerprint(matrix, column, centroidIndex):
+    """
+    Function to get the content fingerprint of a matrix. Matrices without a stored
+    fingerprint are read once and their fingerprint is stored.
+    """
+    fingerprint = getMatrixFingerprint(matrix, column)
+    if fingerprint == "":
+        array = readMatrixArray(matrix, centroidIndex.centroids)
+        fingerprint = fingerprintArray(array, centroidIndex.ids)
+        setMatrixFingerprint(matrix, column, fingerprint)
+    return fingerprint
+
+
+def inputsFingerprint(model, matrices, *settings):
+    """
+    Function to combine the content fingerprints of the input matrices and the settings of a
+    tool into one fingerprint. A tool stores it with its results and compares it on the next
+    run to test whether any of its inputs changed.
+    """
+    column = getFingerprintColumn(model)
+    digest = hashlib.sha1()
+    for matrix in matrices:
+        centroidIndex = getCentroidIndex(matrix.getCentroidConfiguration())
+        digest.update(f"{matrix.getId()}:{matrixFingerprint(matrix, column, centroidIndex)};".encode("utf-8"))
+    digest.update(repr(settings).encode("utf-8"))
+    return digest.hexdigest()
@@ -0,0 +1,619 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Load in the required libraries
+import abc
+import hashlib
+import io
+import itertools
+import os
+import struct
+import numpy as np
+
+# Header of the memory mappable matrix files: magic, version, rows and columns.
+# The header is followed by the cells as little endian float32 in row major order.
+MATRIX_FILE_MAGIC = b"TMGM"
+MATRIX_FILE_VERSION = 1
+_MATRIX_FILE_HEADER = struct.Struct("<4sIII")
+
+
+def buildZoneLookup(zoneNumbers):
+    """
+    Function to build an array mapping each zone number to its index in zoneNumbers.
+    Zone numbers that are not in the list map to -1.
+    """
+    zoneNumbers = np.asarray(zoneNumbers, dtype=np.int64)
+    if len(zoneNumbers) == 0:
+        return np.empty(0, dtype=np.int64)
+    if zoneNumbers.min() < 0:
+        raise Exception("Zone numbers can not be negative")
+    lookup = np.full(int(zoneNumbers.max()) + 1, -1, dtype=np.int64)
+    lookup[zoneNumbers] = np.arange(len(zoneNumbers))
+    return lookup
+
+
+def mapZones(zones, zoneLookup):
+    """
+    Function to map an array of zone numbers to their indices.
+    Returns the indices and a boolean array of the zones that are not in the lookup.
+    """
+    zones = np.asarray(zones, dtype=np.int64)
+    inRange = (zones >= 0) & (zones < len(zoneLookup))
+    indices = np.full(len(zones), -1, dtype=np.int64)
+    indices[inRange] = zoneLookup[zones[inRange]]
+    return indices, indices < 0
+
+
+def readChunks(fileObject, chunkSize, columns, delimiter=","):
+    """
+    Generator to parse a delimited text file in chunks of rows into 2D float arrays
+    """
+    while True:
+        lines = list(itertools.islice(fileObject, chunkSize))
+        if len(lines) == 0:
+            return
+        lines = [line for line in lines if line.strip()]
+        if len(lines) == 0:
+            continue
+        yield np.loadtxt(lines, delimiter=delimiter, ndmin=2, usecols=columns)
+
+
+def readODColumns(fileLocation, header, zoneLookup, numberOfZones, numberOfValues, chunkSize=500000):
+    """
+    Function to read an origin,destination,value1,value2,... csv file. The file is read in
+    chunks, rows where every value is zero are ignored and duplicate OD pairs are summed.
+    Returns the origin indices, destination indices and an (OD pairs, numberOfValues) array
+    of values for each unique OD pair, and the set of zone numbers that are not in the lookup.
+    """
+    keys = []
+    rows = []
+    unknownZones = set()
+    with open(fileLocation) as csvfile:
+        if header is True:
+            next(csvfile, None)
+        for data in readChunks(csvfile, chunkSize, tuple(range(numberOfValues + 2))):
+            values = data[:, 2:]
+            # Only keep the OD pairs with a non zero value
+            nonZero = np.any(values != 0.0, axis=1)
+            origins = data[nonZero, 0].astype(np.int64)
+            destinations = data[nonZero, 1].astype(np.int64)
+            values = values[nonZero]
+            originIndex, originUnknown = mapZones(origins, zoneLookup)
+            destinationIndex, destinationUnknown = mapZones(destinations, zoneLookup)
+            unknownZones.update(origins[originUnknown].tolist())
+            unknownZones.update(destinations[destinationUnknown].tolist())
+            known = ~(originUnknown | destinationUnknown)
+            keys.append(originIndex[known] * numberOfZones + destinationIndex[known])
+            rows.append(values[known])
+    if len(keys) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty((0, numberOfValues), dtype=np.float64), unknownZones
+    keys, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+    # sum any duplicate OD pairs
+    values = np.zeros((len(keys), numberOfValues), dtype=np.float64)
+    np.add.at(values, inverse.reshape(-1), np.concatenate(rows))
+    return keys // numberOfZones, keys % numberOfZones, values, unknownZones
+
+
+def readSquareCSVRows(fileLocation, header, zoneLookup, numberOfZones, unknownZones):
+    """
+    Generator to stream a square csv matrix one origin row at a time. Each row starts with
+    the origin zone number followed by one value per destination. The destination zones are
+    read from the header row, without a header they are the zones of the centroid
+    configuration in order. Only one row is held in memory at a time.
+    Yields (origin index, destination indices, values) of the non zero cells and adds the
+    zone numbers that are not in the lookup to unknownZones.
+    """
+    with open(fileLocation) as csvfile:
+        if header is True:
+            headerLine = next(csvfile, "")
+            destinationZones = np.array(headerLine.strip().split(",")[1:], dtype=np.float64).astype(np.int64)
+            destinationIndex, destinationUnknown = mapZones(destinationZones, zoneLookup)
+        else:
+            destinationZones = None
+            destinationIndex = np.arange(numberOfZones, dtype=np.int64)
+            destinationUnknown = np.zeros(numberOfZones, dtype=bool)
+        columns = len(destinationIndex)
+        for lineNumber, line in enumerate(csvfile, 2 if header is True else 1):
+            line = line.strip()
+            if not line:
+                continue
+            fields = line.split(",")
+            if len(fields) - 1 != columns:
+                raise Exception(f"Line {lineNumber} of the matrix file has {len(fields) - 1} values "
+                                f"but {columns} destinations were expected")
+            values = np.array(fields[1:], dtype=np.float64)
+            # Only keep the cells with a non zero value
+            cells = np.flatnonzero(values)
+            if len(cells) == 0:
+                continue
+            origin = int(float(fields[0]))
+            originIndex = mapZones([origin], zoneLookup)[0][0]
+            unknownCells = destinationUnknown[cells]
+            if originIndex < 0 or unknownCells.any():
+                # collect the unknown zones and report them all at the end
+                if originIndex < 0:
+                    unknownZones.add(origin)
+                if destinationZones is not None:
+                    unknownZones.update(destinationZones[cells[unknownCells]].tolist())
+                continue
+            yield originIndex, destinationIndex[cells], values[cells]
+
+
+def readZoneVector(fileLocation):
+    """
+    Function to read the zone numbers of the rows and columns of a binary matrix from a
+    .npy file or a text file of zone numbers separated by commas or new lines
+    """
+    if fileLocation.lower().endswith(".npy"):
+        zones = np.load(fileLocation)
+    else:
+        zones = np.loadtxt(fileLocation, delimiter=",", ndmin=1)
+    return np.asarray(zones).reshape(-1).astype(np.int64)
+
+
+def openBinaryMatrix(fileLocation, numberOfZones, dataType="float32"):
+    """
+    Function to memory map a square matrix from a .npy file, a file written by
+    writeMatrixFile or a raw row major file of float32 or float64 values.
+    The cells are only read from disk when they are used.
+    """
+    if fileLocation.lower().endswith(".npy"):
+        array = np.load(fileLocation, mmap_mode="r")
+    elif isMatrixFile(fileLocation):
+        array = openMatrixFile(fileLocation)
+    else:
+        dataType = np.dtype(dataType)
+        expectedSize = numberOfZones * numberOfZones * dataType.itemsize
+        fileSize = os.path.getsize(fileLocation)
+        if fileSize != expectedSize:
+            raise Exception(f"The matrix file '{fileLocation}' has {fileSize} bytes but {expectedSize} bytes "
+                            f"were expected for {numberOfZones} zones of {dataType.name}")
+        array = np.memmap(fileLocation, dtype=dataType, mode="r", shape=(numberOfZones, numberOfZones))
+    if array.shape != (numberOfZones, numberOfZones):
+        raise Exception(f"The matrix in '{fileLocation}' has the shape {array.shape} but the zone vector "
+                        f"has {numberOfZones} zones")
+    return array
+
+
+def isMatrixFile(fileLocation):
+    """
+    Function to check if a file starts with the header written by writeMatrixFile
+    """
+    with open(fileLocation, "rb") as matrixFile:
+        return matrixFile.read(len(MATRIX_FILE_MAGIC)) == MATRIX_FILE_MAGIC
+
+
+def openMatrixFile(fileLocation):
+    """
+    Function to memory map a matrix file written by writeMatrixFile
+    """
+    with open(fileLocation, "rb") as matrixFile:
+        header = matrixFile.read(_MATRIX_FILE_HEADER.size)
+    if len(header) != _MATRIX_FILE_HEADER.size:
+        raise Exception(f"The matrix file '{fileLocation}' is missing its header")
+    magic, version, rows, columns = _MATRIX_FILE_HEADER.unpack(header)
+    if magic != MATRIX_FILE_MAGIC or version != MATRIX_FILE_VERSION:
+        raise Exception(f"The file '{fileLocation}' is not a version {MATRIX_FILE_VERSION} matrix file")
+    return np.memmap(fileLocation, dtype="<f4", mode="r", offset=_MATRIX_FILE_HEADER.size, shape=(rows, columns))
+
+
+def writeMatrixFile(fileLocation, array):
+    """
+    Function to write an array as a header followed by its float32 cells in row major order
+    so it can be memory mapped without parsing
+    """
+    array = np.ascontiguousarray(array, dtype="<f4")
+    rows, columns = array.shape
+    with open(fileLocation, "wb") as matrixFile:
+        matrixFile.write(_MATRIX_FILE_HEADER.pack(MATRIX_FILE_MAGIC, MATRIX_FILE_VERSION, rows, columns))
+        array.tofile(matrixFile)
+
+
+def zoneFilePath(fileLocation):
+    """
+    Function to get the zone sidecar file written next to a binary matrix file
+    """
+    base, extension = os.path.splitext(fileLocation)
+    return f"{base}_zones.csv"
+
+
+def writeZoneFile(fileLocation, zoneLabels):
+    """
+    Function to write the zone of each row and column of an exported matrix, one per line
+    """
+    with open(fileLocation, "w") as zoneFile:
+        for zone in zoneLabels:
+            zoneFile.write(f"{zone}\n")
+
+
+def writeMatrixArchive(fileLocation, arrays, zoneLabels):
+    """
+    Function to write a dictionary of matrix name -> array of cells in centroid order to one
+    compressed .npz file as float32, with a sidecar file of the zone order shared by the arrays
+    """
+    np.savez_compressed(fileLocation, **{name: np.asarray(array, dtype=np.float32) for name, array in arrays.items()})
+    writeZoneFile(zoneFilePath(fileLocation), zoneLabels)
+
+
+def readArrayCells(array, zones, zoneLookup, unknownZones, chunkRows=256):
+    """
+    Generator to read the non zero cells of a square array whose rows and columns are in
+    the order of zones, in blocks of rows so only a block is in memory at a time.
+    Yields (origin indices, destination indices, values) in the lookup's centroid order
+    and adds the zone numbers that are not in the lookup to unknownZones.
+    """
+    zoneIndex, zoneUnknown = mapZones(zones, zoneLookup)
+    for start in range(0, len(zones), chunkRows):
+        block = np.asarray(array[start:start + chunkRows], dtype=np.float64)
+        rows, columns = np.nonzero(block)
+        values = block[rows, columns]
+        rows += start
+        unknown = zoneUnknown[rows] | zoneUnknown[columns]
+        if unknown.any():
+            unknownZones.update(zones[rows[zoneUnknown[rows]]].tolist())
+            unknownZones.update(zones[columns[zoneUnknown[columns]]].tolist())
+        known = ~unknown
+        yield zoneIndex[rows[known]], zoneIndex[columns[known]], values[known]
+
+
+def writeMatrixCells(matrix, centroids, origins, destinations, values):
+    """
+    Function to write the non zero cells given by origin indices, destination indices and
+    values into a GKODMatrix. The indices are positions in centroids.
+    """
+    nonZero = values != 0.0
+    origins = origins[nonZero].tolist()
+    destinations = destinations[nonZero].tolist()
+    values = values[nonZero].tolist()
+    setTrips = matrix.setTrips
+    for o, d, value in zip(origins, destinations, values):
+        setTrips(centroids[o], centroids[d], value)
+    return len(values)
+
+
+def arrayCells(array):
+    """
+    Function to get the origin indices, destination indices and values of the non zero
+    cells of an array
+    """
+    origins, destinations = np.nonzero(array)
+    return origins, destinations, array[origins, destinations]
+
+
+def writeMatrixArray(matrix, centroids, array):
+    """
+    Function to write the non zero cells of an array into a GKODMatrix.
+    The rows and columns of the array are in the order of centroids.
+    """
+    return writeMatrixCells(matrix, centroids, *arrayCells(array))
+
+
+def readMatrixArray(matrix, centroids, dataType=np.float64):
+    """
+    Function to read every cell of a GKODMatrix into a preallocated array whose rows and
+    columns are in the order of centroids. GKODMatrix has no bulk or per row accessor in the
+    scripting API this toolbox targets, so this still makes one getTrips call for each of the
+    zones * zones cells. Only the Python side is trimmed: each origin row is filled straight
+    from the calls with np.fromiter, without building lists of trips or resolving centroids.
+    """
+    count = len(centroids)
+    array = np.empty((count, count), dtype=dataType)
+    getTrips = matrix.getTrips
+    for i, origin in enumerate(centroids):
+        array[i] = np.fromiter((getTrips(origin, destination) for destination in centroids),
+                               dtype=dataType, count=count)
+    return array
+
+
+# Record hashed for each non zero cell by the content fingerprint
+_FINGERPRINT_RECORD = np.dtype([("origin", "<i8"), ("destination", "<i8"), ("value", "<f4")])
+
+
+class CellFingerprint:
+    """
+    Content fingerprint of the non zero cells of a matrix, updated one block of cells at a
+    time so a matrix never has to be held in memory to be fingerprinted. Each cell is hashed
+    with SHA-1 as its origin and destination centroid ids and its value as float32, in the
+    order the cells are given. Matrices in memory are hashed in OD order and files in file
+    order, so the same trips read in another order only cost writing the cells again.
+    """
+
+    def __init__(self, centroidIds):
+        self.centroidIds = np.asarray(centroidIds, dtype="<i8")
+        self.digest = hashlib.sha1()
+
+    def update(self, origins, destinations, values):
+        """
+        Add the cells given by origin indices, destination indices and values
+        """
+        nonZero = values != 0.0
+        records = np.empty(np.count_nonzero(nonZero), dtype=_FINGERPRINT_RECORD)
+        records["origin"] = self.centroidIds[origins[nonZero]]
+        records["destination"] = self.centroidIds[destinations[nonZero]]
+        records["value"] = values[nonZero]
+        self.digest.update(records.tobytes())
+
+    def hexdigest(self):
+        return self.digest.hexdigest()
+
+
+def fingerprintCells(centroidIds, origins, destinations, values):
+    """
+    Function to compute the content fingerprint of the cells given by origin indices,
+    destination indices and values, in OD order
+    """
+    order = np.lexsort((destinations, origins))
+    fingerprint = CellFingerprint(centroidIds)
+    fingerprint.update(origins[order], destinations[order], values[order])
+    return fingerprint.hexdigest()
+
+
+def fingerprintArray(array, centroidIds):
+    """
+    Function to compute the content fingerprint of an array of cells in centroid order,
+    one origin row at a time
+    """
+    fingerprint = CellFingerprint(centroidIds)
+    for origin, row in enumerate(array):
+        destinations = np.flatnonzero(row)
+        fingerprint.update(np.full(len(destinations), origin), destinations, row[destinations])
+    return fingerprint.hexdigest()
+
+
+def writeThirdNormalizedCSV(fileLocation, zoneLabels, array, header=True, chunkSize=1000000):
+    """
+    Function to write the non zero cells of a square array to an origin,destination,value
+    csv file. Each chunk of cells is formatted by a single np.savetxt call.
+    """
+    zoneLabels = np.asarray(zoneLabels, dtype=str)
+    origins, destinations = np.nonzero(array)
+    rowType = np.dtype([("origin", zoneLabels.dtype), ("destination", zoneLabels.dtype), ("value", np.float64)])
+    with open(fileLocation, "w") as matfile:
+        if header is True:
+            matfile.write("origin,destination,value\n")
+        for start in range(0, len(origins), chunkSize):
+            o = origins[start:start + chunkSize]
+            d = destinations[start:start + chunkSize]
+            rows = np.empty(len(o), dtype=rowType)
+            rows["origin"] = zoneLabels[o]
+            rows["destination"] = zoneLabels[d]
+            rows["value"] = array[o, d]
+            np.savetxt(matfile, rows, fmt=["%s", "%s", "%f"], delimiter=",")
+
+
+def writeSquareCSV(fileLocation, zoneLabels, array, header=True, chunkRows=256):
+    """
+    Function to write a square array as one row per origin zone followed by its value for
+    each destination. Each block of rows is formatted by a single np.savetxt call.
+    """
+    with open(fileLocation, "w") as matfile:
+        if header is True:
+            matfile.write("," + ",".join(str(zone) for zone in zoneLabels) + "\n")
+        for start in range(0, len(zoneLabels), chunkRows):
+            block = io.StringIO()
+            np.savetxt(block, array[start:start + chunkRows], fmt="%f", delimiter=",")
+            lines = block.getvalue().splitlines()
+            matfile.write("".join(f"{zone},{line}\n" for zone, line in zip(zoneLabels[start:start + chunkRows], lines)))
+
+
+def matrixZoneLabels(centroidIndex):
+    """
+    Function to get the zone of each centroid as written in the matrix files
+    """
+    return centroidIndex.zoneLabels
+
+
+class MatrixFormat(abc.ABC):
+    """
+    Base class of the matrix file formats. A format streams the non zero cells of a file as
+    centroid indices and writes an array of cells in centroid order. prepare runs on the
+    Aimsun thread, write only uses what prepare returned so it can run on any thread.
+    """
+
+    name = None
+
+    def prepare(self, matrix, centroidIndex):
+        """
+        Return what write needs from the model, by default the zone of each centroid
+        """
+        return matrixZoneLabels(centroidIndex)
+
+    @abc.abstractmethod
+    def readCells(self, fileLocation, centroidIndex, unknownZones, header=True, **options):
+        """
+        Yield (origin indices, destination indices, values) of the non zero cells and add
+        the zones that are not in the centroid configuration to unknownZones
+        """
+
+    @abc.abstractmethod
+    def write(self, fileLocation, array, prepared, header=True, **options):
+        """
+        Write the array of cells in centroid order
+        """
+
+
+class ThirdNormalizedCSVFormat(MatrixFormat):
+    """
+    origin,destination,value csv files. Duplicate OD pairs are summed.
+    """
+
+    name = "csv"
+
+    def readCells(self, fileLocation, centroidIndex, unknownZones, header=True, **options):
+        origins, destinations, values, unknown = readODColumns(fileLocation, header, centroidIndex.zoneLookup,
+                                                               len(centroidIndex.centroids), 1)
+        unknownZones.update(unknown)
+        yield origins, destinations, values[:, 0]
+
+    def write(self, fileLocation, array, prepared, header=True, **options):
+        writeThirdNormalizedCSV(fileLocation, prepared, array, header)
+
+
+class SquareCSVFormat(MatrixFormat):
+    """
+    Square csv files with one row per origin, streamed one row at a time
+    """
+
+    name = "square"
+
+    def readCells(self, fileLocation, centroidIndex, unknownZones, header=True, **options):
+        for origin, destinations, values in readSquareCSVRows(fileLocation, header, centroidIndex.zoneLookup,
+                                                              len(centroidIndex.centroids), unknownZones):
+            yield np.full(len(destinations), origin, dtype=np.int64), destinations, values
+
+    def write(self, fileLocation, array, prepared, header=True, **options):
+        writeSquareCSV(fileLocation, prepared, array, header)
+
+
+class BinaryFormat(MatrixFormat):
+    """
+    Memory mapped matrix files with a header and float32 cells, or raw float32/float64 files,
+    with a sidecar file of the zone order
+    """
+
+    name = "bin"
+
+    def readCells(self, fileLocation, centroidIndex, unknownZones, header=True, zoneFile=None,
+                  dataType="float32", **options):
+        zones = readZoneVector(zoneFile if zoneFile is not None else zoneFilePath(fileLocation))
+        array = openBinaryMatrix(fileLocation, len(zones), dataType)
+        yield from readArrayCells(array, zones, centroidIndex.zoneLookup, unknownZones)
+
+    def write(self, fileLocation, array, prepared, header=True, **options):
+        writeMatrixFile(fileLocation, array)
+        writeZoneFile(zoneFilePath(fileLocation), prepared)
+
+
+class NumpyFormat(BinaryFormat):
+    """
+    .npy files of float32 cells with a sidecar file of the zone order
+    """
+
+    name = "npy"
+
+    def write(self, fileLocation, array, prepared, header=True, **options):
+        np.save(fileLocation, np.asarray(array, dtype=np.float32))
+        writeZoneFile(zoneFilePath(fileLocation), prepared)
+
+
+class AimsunASCIIFormat(MatrixFormat):
+    """
+    The Aimsun ASCII matrix format: the matrix id and name, the vehicle id and name, the
+    start time and duration, then one 'origin destination trips' line per cell using the
+    ids of the centroids
+    """
+
+    name = "ascii"
+
+    def prepare(self, matrix, centroidIndex):
+        vehicle = matrix.getVehicle()
+        lines = [f"{matrix.getId()} {matrix.getName()}",
+                 f"{vehicle.getId()} {vehicle.getName()}" if vehicle is not None else "0 None",
+                 matrix.getFrom().toString(),
+                 matrix.getDuration().toString()]
+        return lines, centroidIndex.ids
+
+    def readCells(self, fileLocation, centroidIndex, unknownZones, header=True, chunkSize=500000, **options):
+        idLookup = centroidIndex.idLookup
+        with open(fileLocation) as matfile:
+            # skip the matrix, vehicle, start time and duration lines
+            for _ in range(4):
+                next(matfile, None)
+            for data in readChunks(matfile, chunkSize, (0, 1, 2), None):
+                nonZero = data[:, 2] != 0.0
+                ids = data[nonZero, :2].astype(np.int64)
+                origins, originUnknown = mapZones(ids[:, 0], idLookup)
+                destinations, destinationUnknown = mapZones(ids[:, 1], idLookup)
+                unknownZones.update(ids[originUnknown, 0].tolist())
+                unknownZones.update(ids[destinationUnknown, 1].tolist())
+                known = ~(originUnknown | destinationUnknown)
+                yield origins[known], destinations[known], data[nonZero, 2][known]
+
+    def write(self, fileLocation, array, prepared, header=True, **options):
+        lines, centroidIds = prepared
+        centroidIds = np.asarray(centroidIds, dtype=np.int64)
+        origins, destinations = np.nonzero(array)
+        rows = np.empty(len(origins), dtype=[("origin", np.int64), ("destination", np.int64), ("value", np.float64)])
+        rows["origin"] = centroidIds[origins]
+        rows["destination"] = centroidIds[destinations]
+        rows["value"] = array[origins, destinations]
+        with open(fileLocation, "w") as matfile:
+            matfile.write("\n".join(lines) + "\n")
+            np.savetxt(matfile, rows, fmt=["%d", "%d", "%f"], delimiter=" ")
+
+
+# The registered matrix file formats by name
+MATRIX_FORMATS = dict()
+
+
+def registerMatrixFormat(matrixFormat):
+    """
+    Function to add a matrix file format so every import and export tool can use it
+    """
+    MATRIX_FORMATS[matrixFormat.name] = matrixFormat
+
+
+def getMatrixFormat(name):
+    """
+    Function to get a registered matrix file format by name
+    """
+    matrixFormat = MATRIX_FORMATS.get(name)
+    if matrixFormat is None:
+        raise Exception(f"The matrix format '{name}' is not supported, use one of {', '.join(MATRIX_FORMATS)}")
+    return matrixFormat
+
+
+for _matrixFormat in (ThirdNormalizedCSVFormat(), SquareCSVFormat(), BinaryFormat(), NumpyFormat(), AimsunASCIIFormat()):
+    registerMatrixFormat(_matrixFormat)
+
+
+def importMatrixFile(matrix, fileLocation, formatName, centroidIndex, unknownZones, **options):
+    """
+    Function to fill a GKODMatrix from a file in one of the registered formats.
+    The zones that are not in the centroid configuration are added to unknownZones.
+    Returns the number of cells written.
+    """
+    matrixFormat = getMatrixFormat(formatName)
+    count = 0
+    for origins, destinations, values in matrixFormat.readCells(fileLocation, centroidIndex, unknownZones, **options):
+        count += writeMatrixCells(matrix, centroidIndex.centroids, origins, destinations, values)
+    return count
+
+
+def fingerprintMatrixFile(fileLocation, formatName, centroidIndex, unknownZones, **options):
+    """
+    Function to compute the content fingerprint of a file in one of the registered formats,
+    streaming its cells in file order. The zones that are not in the centroid configuration
+    are added to unknownZones.
+    """
+    matrixFormat = getMatrixFormat(formatName)
+    fingerprint = CellFingerprint(centroidIndex.ids)
+    for origins, destinations, values in matrixFormat.readCells(fileLocation, centroidIndex, unknownZones, **options):
+        fingerprint.update(origins, destinations, values)
+    return fingerprint.hexdigest()
+
+
+def exportMatrixFile(matrix, fileLocation, formatName, centroidIndex, **options):
+    """
+    Function to write a GKODMatrix to a file in one of the registered formats
+    """
+    matrixFormat = getMatrixFormat(formatName)
+    array = readMatrixArray(matrix, centroidIndex.centroids)
+    matrixFormat.write(fileLocation, array, matrixFormat.prepare(matrix, centroidIndex), **options)
@@ -0,0 +1,86 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+class MatrixIndex:
+    """
+    Lookup of the OD matrices in the model by name and by external id, built in one
+    pass over every GKODMatrix subtype so each matrix id does not rescan the catalog.
+    Only GKODMatrix objects and their subtypes are indexed, so the matrix tools only
+    replace matrices. Another type of object sharing the id of a matrix is left in place.
+    """
+
+    def __init__(self, model, catalog):
+        self.model = model
+        self.byName = dict()
+        self.byExternalId = dict()
+        matrixType = model.getType("GKODMatrix")
+        for types in catalog.getUsedSubTypesFromType(matrixType):
+            for matrix in iter(types.values()):
+                if matrix is not None:
+                    self._add(matrix)
+
+    def _add(self, matrix):
+        self.byName.setdefault(matrix.getName(), dict())[matrix.getId()] = matrix
+        self.byExternalId.setdefault(matrix.getExternalId(), dict())[matrix.getId()] = matrix
+
+    def find(self, matrixId):
+        """
+        Return every matrix whose name or external id is matrixId
+        """
+        found = dict()
+        found.update(self.byName.get(matrixId, {}))
+        found.update(self.byExternalId.get(matrixId, {}))
+        return list(found.values())
+
+    def findODMatrix(self, matrixId):
+        """
+        Return the GKODMatrix whose name or external id is matrixId, or None
+        """
+        for matrix in self.find(matrixId):
+            if matrix.getTypeName() == "GKODMatrix":
+                return matrix
+        return None
+
+    def findInputMatrix(self, matrixId, centroidConfiguration):
+        """
+        Return the GKODMatrix whose name or external id is matrixId, raising when it does not
+        exist or does not use the centroid configuration
+        """
+        matrix = self.findODMatrix(matrixId)
+        if matrix is None:
+            raise Exception(f"The matrix '{matrixId}' does not exist")
+        if (matrix.getCentroidConfiguration() is None
+                or matrix.getCentroidConfiguration().getId() != centroidConfiguration.getId()):
+            raise Exception(f"The matrix '{matrixId}' does not use the centroid configuration '{centroidConfiguration.getName()}'")
+        return matrix
+
+    def add(self, matrix):
+        """
+        Add a newly created matrix to the index
+        """
+        self._add(matrix)
+
+    def delete(self, matrix):
+        """
+        Delete the matrix from the model and the index
+        """
+        self.byName.get(matrix.getName(), {}).pop(matrix.getId(), None)
+        self.byExternalId.get(matrix.getExternalId(), {}).pop(matrix.getId(), None)
+        self.model.getCommander().addCommand(matrix.getDelCmd())
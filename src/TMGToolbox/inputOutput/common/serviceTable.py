@@ -0,0 +1,153 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Load in the required libraries
+import csv
+import datetime
+import hashlib
+import itertools
+import numpy as np
+
+# The last second of the day. Aimsun schedules can not go past midnight.
+LAST_SECOND_OF_DAY = 24 * 3600 - 1
+
+
+def parseTimes(times):
+    """
+    Function to parse a list of hh:mm:ss strings into an array of seconds
+    """
+    if len(times) == 0:
+        return np.empty(0, dtype=np.int32)
+    fields = [time.split(":") for time in times]
+    for time, timeFields in zip(times, fields):
+        if len(timeFields) != 3:
+            raise Exception(f"The service table contains the time {time} that is not in the hh:mm:ss format")
+    fields = np.array(fields, dtype=np.int32)
+    return fields[:, 0] * 3600 + fields[:, 1] * 60 + fields[:, 2]
+
+
+def clampToDay(seconds):
+    """
+    Function to clamp times after midnight to 23:59:59
+    """
+    return np.minimum(seconds, LAST_SECOND_OF_DAY)
+
+
+def secondsToTime(seconds):
+    """
+    Function to convert a number of seconds after midnight into a datetime.time
+    """
+    seconds = int(seconds)
+    return datetime.time(seconds // 3600, (seconds // 60) % 60, seconds % 60)
+
+
+def readServiceTables(fileLocation, header=True, chunkSize=100000):
+    """Read and parse the ServiceTableCV csv file
+    The file is streamed in chunks and each chunk is parsed into integer arrays, so only
+    the line code, departure and arrival seconds of each trip are kept in memory.
+    input: the servicetable csv file
+    output: servicetables list of (transit line id, departure seconds, arrival seconds)
+    sorted in the order the lines first appear in the file
+    """
+    lineIndex = dict()
+    lineCodes = []
+    departures = []
+    arrivals = []
+    with open(fileLocation, newline="") as csvfile:
+        reader = csv.reader(csvfile)
+        if header is True:
+            next(reader, None)
+        while True:
+            chunk = list(itertools.islice(reader, chunkSize))
+            if len(chunk) == 0:
+                break
+            # Check that the line has reuqired number of values
+            chunk = [line for line in chunk if len(line) >= 3]
+            if len(chunk) == 0:
+                continue
+            lineIds, departureTimes, arrivalTimes = zip(*((line[0], line[1], line[2]) for line in chunk))
+            # map the line ids of the chunk to integer codes in the order they first appear
+            uniqueIds, firstRows, inverse = np.unique(np.array(lineIds), return_index=True, return_inverse=True)
+            codes = np.empty(len(uniqueIds), dtype=np.int32)
+            for k in np.argsort(firstRows):
+                codes[k] = lineIndex.setdefault(str(uniqueIds[k]), len(lineIndex))
+            lineCodes.append(codes[inverse.reshape(-1)])
+            departures.append(parseTimes(departureTimes))
+            arrivals.append(parseTimes(arrivalTimes))
+    if len(lineIndex) == 0:
+        return []
+    lineCodes = np.concatenate(lineCodes)
+    departures = np.concatenate(departures)
+    arrivals = np.concatenate(arrivals)
+    # group the trips by line keeping the order of the trips within each line
+    order = np.argsort(lineCodes, kind="stable")
+    sortedCodes = lineCodes[order]
+    starts = np.flatnonzero(np.r_[True, sortedCodes[1:] != sortedCodes[:-1]])
+    ends = np.r_[starts[1:], len(order)]
+    lineIds = list(lineIndex)
+    serviceTables = []
+    for start, end in zip(starts, ends):
+        rows = order[start:end]
+        serviceTables.append((lineIds[sortedCodes[start]], departures[rows], arrivals[rows]))
+    return serviceTables
+
+
+def findHeadwayRuns(departures, tolerance, minimumTrips):
+    """
+    Function to split the sorted departures of a line into segments. Runs of at least
+    minimumTrips departures whose headways stay within the tolerance of the run's first
+    headway are returned with their mean headway in seconds, the departures between
+    the runs are returned with a headway of None.
+    output: list of (first index, end index, headway)
+    """
+    count = len(departures)
+    headways = np.diff(departures).tolist()
+    segments = []
+    fixedStart = 0
+    i = 0
+    while i < count - 1:
+        firstHeadway = headways[i]
+        j = i + 1
+        while j < count - 1 and abs(headways[j] - firstHeadway) <= tolerance:
+            j += 1
+        # departures i to j are at a constant headway
+        if firstHeadway > 0 and j - i + 1 >= minimumTrips:
+            if fixedStart < i:
+                segments.append((fixedStart, i, None))
+            meanHeadway = int(round((departures[j] - departures[i]) / (j - i)))
+            segments.append((i, j + 1, meanHeadway))
+            fixedStart = j + 1
+            i = j + 1
+        else:
+            i += 1
+    if fixedStart < count:
+        segments.append((fixedStart, count, None))
+    return segments
+
+
+def fingerprintService(departures, arrivals, *settings):
+    """
+    Function to compute a fingerprint of a line's departure and arrival times and the
+    settings used to build its timetable, used to detect lines whose service changed
+    """
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(departures, dtype="<i4").tobytes())
+    digest.update(np.ascontiguousarray(arrivals, dtype="<i4").tobytes())
+    digest.update(repr(settings).encode("utf-8"))
+    return digest.hexdigest()
@@ -0,0 +1,169 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Load in the required libraries
+import numpy as np
+
+# Offsets to the neighbouring grid cells that are visited when pairing points.
+# Only half of the neighbourhood is used so each pair of cells is visited once.
+_HALF_NEIGHBOURHOOD = ((1, 0), (-1, 1), (0, 1), (1, 1))
+
+
+def readPositions(objects):
+    """
+    Function to read the absolute positions of a list of Aimsun objects into an
+    (n, 2) array of x and y coordinates
+    """
+    positions = np.empty((len(objects), 2), dtype=np.float64)
+    for i, o in enumerate(objects):
+        point = o.absolutePosition()
+        positions[i, 0] = point.x
+        positions[i, 1] = point.y
+    return positions
+
+
+class PointGridIndex:
+    """
+    Uniform grid over a set of 2D points used to answer radius queries.
+    The cell size is the search radius so every point within the radius
+    of a point is in the same or a neighbouring cell.
+    """
+
+    def __init__(self, points, cellSize):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.cellSize = float(cellSize)
+        if self.cellSize <= 0.0:
+            raise Exception("The cell size of the grid index must be greater than zero")
+        if len(self.points) == 0:
+            self.order = np.empty(0, dtype=np.int64)
+            self.cellIds = np.empty(0, dtype=np.int64)
+            self.cellStarts = np.empty(0, dtype=np.int64)
+            self.cellCounts = np.empty(0, dtype=np.int64)
+            self.width = 1
+            return
+        cells = np.floor(self.points / self.cellSize).astype(np.int64)
+        cells -= cells.min(axis=0)
+        # leave an empty column on each side so neighbour ids never wrap around
+        self.width = int(cells[:, 0].max()) + 3
+        pointCellIds = (cells[:, 1] + 1) * self.width + (cells[:, 0] + 1)
+        # sort the points by cell so each cell is a contiguous block of self.order
+        self.order = np.argsort(pointCellIds, kind="stable")
+        self.cellIds, self.cellStarts, self.cellCounts = np.unique(
+            pointCellIds[self.order], return_index=True, return_counts=True)
+
+    def _pairsBetweenCells(self, cellsA, cellsB, sameCell):
+        """
+        Return every pair of point indices from the cells cellsA[k] and cellsB[k]
+        """
+        countsA = self.cellCounts[cellsA]
+        countsB = self.cellCounts[cellsB]
+        pairCounts = countsA * countsB
+        total = int(pairCounts.sum())
+        if total == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        match = np.repeat(np.arange(len(cellsA)), pairCounts)
+        offset = np.arange(total) - np.repeat(np.cumsum(pairCounts) - pairCounts, pairCounts)
+        positionA = self.cellStarts[cellsA][match] + offset // countsB[match]
+        positionB = self.cellStarts[cellsB][match] + offset % countsB[match]
+        if sameCell:
+            # keep each unordered pair once and drop the point paired with itself
+            keep = positionA < positionB
+            positionA = positionA[keep]
+            positionB = positionB[keep]
+        return self.order[positionA], self.order[positionB]
+
+    def pairsWithinRadius(self, radius=None):
+        """
+        Return the unordered pairs (i, j, distance) of points that are within
+        the radius of each other. Each pair is only computed once.
+        """
+        if radius is None:
+            radius = self.cellSize
+        if radius > self.cellSize:
+            raise Exception("The search radius can not be larger than the cell size of the grid index")
+        if len(self.points) == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0, dtype=np.float64)
+        allI = []
+        allJ = []
+        # pairs of points in the same cell
+        everyCell = np.arange(len(self.cellIds))
+        i, j = self._pairsBetweenCells(everyCell, everyCell, True)
+        allI.append(i)
+        allJ.append(j)
+        # pairs of points in neighbouring cells
+        for dx, dy in _HALF_NEIGHBOURHOOD:
+            neighbourIds = self.cellIds + dy * self.width + dx
+            position = np.searchsorted(self.cellIds, neighbourIds)
+            position[position >= len(self.cellIds)] = 0
+            found = np.nonzero(self.cellIds[position] == neighbourIds)[0]
+            i, j = self._pairsBetweenCells(found, position[found], False)
+            allI.append(i)
+            allJ.append(j)
+        i = np.concatenate(allI)
+        j = np.concatenate(allJ)
+        delta = self.points[i] - self.points[j]
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        keep = distance <= radius
+        return i[keep], j[keep], distance[keep]
+
+    def nearestNeighbours(self, maxNeighbours, radius=None):
+        """
+        Return the directed pairs (source, destination, distance) linking each point to
+        at most maxNeighbours of its closest other points within the radius.
+        The pairs are sorted by source and then by distance.
+        """
+        i, j, distance = self.pairsWithinRadius(radius)
+        # each unordered pair is used in both directions
+        source = np.concatenate((i, j))
+        destination = np.concatenate((j, i))
+        distance = np.concatenate((distance, distance))
+        order = np.lexsort((distance, source))
+        source = source[order]
+        destination = destination[order]
+        distance = distance[order]
+        # rank of each pair within its source
+        groupStart = np.searchsorted(source, source, side="left")
+        keep = (np.arange(len(source)) - groupStart) < maxNeighbours
+        return source[keep], destination[keep], distance[keep]
+
+
+def nearestPoint(points, queries, maxCells=1 << 22):
+    """
+    Function to find the index of the closest point to each of the query points.
+    Queries are processed in chunks sized so the distance array of a chunk has at
+    most maxCells cells whatever the number of points.
+    Returns an array of -1 if there are no points.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    queries = np.asarray(queries, dtype=np.float64).reshape(-1, 2)
+    closest = np.full(len(queries), -1, dtype=np.int64)
+    if len(points) == 0:
+        return closest
+    chunkSize = max(1, maxCells // len(points))
+    for start in range(0, len(queries), chunkSize):
+        chunk = queries[start:start + chunkSize]
+        distance = chunk[:, 0, np.newaxis] - points[np.newaxis, :, 0]
+        distance *= distance
+        dy = chunk[:, 1, np.newaxis] - points[np.newaxis, :, 1]
+        dy *= dy
+        distance += dy
+        closest[start:start + chunkSize] = np.argmin(distance, axis=1)
+    return closest
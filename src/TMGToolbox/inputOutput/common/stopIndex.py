@@ -0,0 +1,72 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# Load in the required libraries
+import numpy as np
+from common.spatialIndex import readPositions, nearestPoint
+
+
+class StopIndex:
+    """
+    Index of the transit stops in the model by section and by node, built in one
+    pass over the GKBusStop objects. Used to connect the stops to centroids.
+    """
+
+    def __init__(self, model, catalog):
+        busStopType = model.getType("GKBusStop")
+        self.stops = list(catalog.getObjectsByType(busStopType).values())
+        self.sectionStops = dict()
+        # the stops of a node are kept in a dict to keep them unique and in order
+        self.nodeStops = dict()
+        for stop in self.stops:
+            section = stop.getSection()
+            if section is None:
+                continue
+            self.sectionStops.setdefault(section, []).append(stop)
+            # a stop is near both the nodes at the ends of its section
+            for node in (section.getOrigin(), section.getDestination()):
+                if node is not None:
+                    self.nodeStops.setdefault(node, dict())[stop] = None
+        self.positions = readPositions(self.stops)
+
+    def findNearbyStops(self, centroid):
+        """
+        Returns the stops on any section to or from a node on a centroid connector
+        """
+        nearbyStops = dict()
+        for centroidConnection in iter(centroid.getConnections()):
+            stops = self.nodeStops.get(centroidConnection.getConnectionObject())
+            if stops is not None:
+                nearbyStops.update(stops)
+        return list(nearbyStops)
+
+    def findStopsForCentroids(self, centroidIndex):
+        """
+        Returns the list of stops to connect to each centroid of a CentroidIndex. Centroids
+        without nearby stops are connected to the closest stop which are all found in one
+        vectorized search over the centroid positions of the index.
+        """
+        centroids = centroidIndex.centroids
+        centroidStops = [self.findNearbyStops(centroid) for centroid in centroids]
+        missing = [i for i, stops in enumerate(centroidStops) if len(stops) == 0]
+        if len(missing) > 0 and len(self.stops) > 0:
+            closest = nearestPoint(self.positions, centroidIndex.positions[missing])
+            for i, stopIndex in zip(missing, closest):
+                centroidStops[i] = [self.stops[stopIndex]]
+        return centroidStops
@@ -0,0 +1,84 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from PyANGBasic import *
+from PyANGKernel import *
+from PyANGConsole import *
+from common.matrixIndex import MatrixIndex
+from common.centroidIndex import getCentroidIndex, reportUnknownZones
+from common.matrixIO import arrayCells, readMatrixArray
+from common.matrixFingerprint import getFingerprintColumn
+from common.matrixBalancing import readCorrespondence, convertZones
+from importMatrixFromCSVThirdNormalized import find_centroid_configuration, store_matrix_cells, add_to_matrix_folder
+
+def run_xtmf(parameters, model, console):
+    """
+    A general function called in all python modules called by bridge. Responsible
+    for extracting data and running appropriate functions.
+    """
+    _execute(model, console, parameters)
+
+def convert_matrix(sourceMatrix, correspondenceFile, header, sourceIndex, centroidIndex):
+    """
+    Function to read the source matrix and aggregate or split it into the zones of
+    centroidIndex with the correspondence file
+    """
+    unknownZones = set()
+    shares = readCorrespondence(correspondenceFile, header, sourceIndex.zoneLookup, len(sourceIndex.centroids),
+                                centroidIndex.zoneLookup, len(centroidIndex.centroids), unknownZones)
+    reportUnknownZones(unknownZones)
+    array = readMatrixArray(sourceMatrix, sourceIndex.centroids)
+    converted = convertZones(array, shares)
+    dropped = array.sum() - converted.sum()
+    if abs(dropped) > 1e-6 * max(abs(array.sum()), 1.0):
+        print(f"{dropped} trips of zones without a correspondence were dropped")
+    return converted
+
+def _execute(model, console, parameters):
+    """
+    Main execute function to run the simulation.
+    """
+    catalog = model.getCatalog()
+    #extract the json parameters
+    sourceMatrixId = str(parameters["SourceMatrixID"])
+    correspondenceFile = str(parameters["CorrespondenceFile"])
+    header = bool(parameters.get("IncludesHeader", True))
+    matrixId = str(parameters["MatrixID"])
+    centroidConfigurationId = str(parameters["CentroidConfiguration"])
+    vehicleEID = str(parameters["VehicleType"])
+    initialTime = str(parameters["InitialTime"])
+    durationTime = str(parameters["DurationTime"])
+
+    matrixIndex = MatrixIndex(model, catalog)
+    sourceMatrix = matrixIndex.findODMatrix(sourceMatrixId)
+    if sourceMatrix is None or sourceMatrix.getCentroidConfiguration() is None:
+        raise Exception(f"The matrix '{sourceMatrixId}' does not exist")
+    sourceIndex = getCentroidIndex(sourceMatrix.getCentroidConfiguration())
+    centroidConfiguration = find_centroid_configuration(model, catalog, centroidConfigurationId)
+    centroidIndex = getCentroidIndex(centroidConfiguration)
+
+    converted = convert_matrix(sourceMatrix, correspondenceFile, header, sourceIndex, centroidIndex)
+
+    matrix, isNew = store_matrix_cells(model, catalog, matrixIndex, getFingerprintColumn(model),
+                                       (matrixId, vehicleEID, initialTime, durationTime), centroidConfiguration,
+                                       centroidIndex, *arrayCells(converted))
+    if isNew:
+        add_to_matrix_folder(model, [matrix])
+
+    return console
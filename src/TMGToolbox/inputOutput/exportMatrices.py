@@ -0,0 +1,114 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from PyANGBasic import *
+from PyANGKernel import *
+from PyANGConsole import *
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from common.centroidIndex import getCentroidIndex
+from common.matrixIO import getMatrixFormat, matrixZoneLabels, readMatrixArray, writeMatrixArchive
+from exportMatrix import EXPORT_FORMATS
+
+def run_xtmf(parameters, model, console):
+    """
+    A general function called in all python modules called by bridge. Responsible
+    for extracting data and running appropriate functions.
+    """
+    _execute(model, console, parameters)
+
+def writeMatrix(exportFormat, filePath, arrays, prepared):
+    """
+    Function to format and write the extracted matrices of one file. Runs on a writer
+    thread so it must not use the Aimsun API.
+    """
+    if exportFormat == "npz":
+        writeMatrixArchive(filePath, arrays, prepared)
+    else:
+        array, = arrays.values()
+        getMatrixFormat(exportFormat).write(filePath, array, prepared)
+
+def groupByFile(matrices, exportFormat):
+    """
+    Function to group the list of (name, matrix, file path) by output file. npz writes every
+    matrix given the same file path to one archive, like exportMatrix, the other formats
+    write one file per matrix.
+    """
+    files = dict()
+    for name, matrix, filePath in matrices:
+        files.setdefault(filePath, (filePath, []))[1].append((name, matrix))
+    for filePath, fileMatrices in files.values():
+        if exportFormat != "npz" and len(fileMatrices) > 1:
+            raise Exception(f"Several matrices are exported to '{filePath}', only npz can hold several matrices")
+        configurationId = fileMatrices[0][1].getCentroidConfiguration().getId()
+        for name, matrix in fileMatrices:
+            if matrix.getCentroidConfiguration().getId() != configurationId:
+                raise Exception(f"The matrix '{name}' does not use the same centroid configuration as '{fileMatrices[0][0]}'")
+    return list(files.values())
+
+def exportMatrices(model, matrices, exportFormat, workers):
+    """
+    Function to export a list of (name, matrix, file path). The cells of each file are
+    read on the Aimsun thread while the previous files are formatted, compressed and
+    written by a pool of writer threads. At most workers files wait for or are being
+    written while the next one is read, so at most workers + 1 files of cells are in
+    memory. npz cells are read as float32.
+    """
+    matrixFormat = None if exportFormat == "npz" else getMatrixFormat(exportFormat)
+    dataType = np.float32 if exportFormat == "npz" else np.float64
+    pending = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for filePath, fileMatrices in groupByFile(matrices, exportFormat):
+            # wait for a writer before reading more cells
+            while len(pending) >= workers:
+                pending.pop(0).result()
+            centroidIndex = getCentroidIndex(fileMatrices[0][1].getCentroidConfiguration())
+            arrays = dict()
+            for name, matrix in fileMatrices:
+                arrays[name] = readMatrixArray(matrix, centroidIndex.centroids, dataType)
+            if matrixFormat is None:
+                prepared = matrixZoneLabels(centroidIndex)
+            else:
+                prepared = matrixFormat.prepare(fileMatrices[0][1], centroidIndex)
+            pending.append(pool.submit(writeMatrix, exportFormat, filePath, arrays, prepared))
+        # raise any error from the writers
+        for future in pending:
+            future.result()
+
+def _execute(model, console, parameters):
+    """
+    Main execute function to run the simulation
+    """
+    catalog = model.getCatalog()
+    exportFormat = str(parameters.get("Format", "csv")).lower()
+    workers = int(parameters.get("Workers", 4))
+    if exportFormat not in EXPORT_FORMATS:
+        raise Exception(f"The export format '{exportFormat}' is not supported, use one of {', '.join(EXPORT_FORMATS)}")
+    if workers < 1:
+        raise Exception("The number of writer threads must be at least 1")
+    # find the matrix objects based by string name
+    matrices = []
+    for item in parameters["Matrices"]:
+        matrixName = str(item["MatrixName"])
+        matrix = catalog.findByName(matrixName)
+        if matrix is None:
+            raise Exception(f"The specified matrix '{matrixName}' does not exist")
+        matrices.append((matrixName, matrix, str(item["FilePath"])))
+    exportMatrices(model, matrices, exportFormat, workers)
+    print(f"Exported {len(matrices)} matrices")
@@ -28,23 +28,53 @@ from PyMacroPTPlugin import *
 from PyFrankWolfePlugin import *
 import sys
 import os
+import numpy as np
+from common.centroidIndex import getCentroidIndex
+from common.matrixIO import MATRIX_FORMATS, exportMatrixFile, matrixZoneLabels, readMatrixArray, writeMatrixArchive
+
+# The file formats a matrix can be exported to, npz writes every matrix to one file
+EXPORT_FORMATS = tuple(MATRIX_FORMATS) + ("npz",)
 
 def exportMatrix(model, console, filePath, matrix):
     """
-    Function to export a matrix to a csv or txt file
+    Function to export a matrix to a csv or txt file. The matrix is read into an
+    array once and the non zero cells are written with the zone of each centroid.
+    """
+    centroidIndex = getCentroidIndex(matrix.getCentroidConfiguration())
+    exportMatrixFile(matrix, filePath, "csv", centroidIndex)
+
+def matrixFilePath(filePath, matrixName, count):
+    """
+    Function to get the file of a matrix. When several matrices are exported to
+    separate files the matrix name is added to the file name.
     """
-    # Full path to the file in where matrices will be written
-    matrixFilePath = filePath
-    #open the file 
-    with open(matrixFilePath, 'w') as matfile:
-        centroids = matrix.getCentroidConfiguration().getCentroidsInOrder()
-        print (centroids)
-        matfile.write('%s,%s,%s\n' %("origin", "destination", "value"))
-        for origin in centroids:
-            for destination in centroids:
-                trips = matrix.getTrips(origin, destination)
-                if trips > 0:
-                    matfile.write('%u,%u,%f\n' %(origin.getId(), destination.getId(), trips))
+    if count == 1:
+        return filePath
+    base, extension = os.path.splitext(filePath)
+    return f"{base}_{matrixName}{extension}"
+
+def exportMatrices(model, filePath, matrices, exportFormat):
+    """
+    Function to export a list of (name, matrix) to filePath in the given format.
+    npz writes every matrix as float32 to one compressed file with a sidecar file of the
+    zone order, the other formats write one file per matrix.
+    """
+    if exportFormat not in EXPORT_FORMATS:
+        raise Exception(f"The export format '{exportFormat}' is not supported, use one of {', '.join(EXPORT_FORMATS)}")
+    if exportFormat != "npz":
+        for name, matrix in matrices:
+            centroidIndex = getCentroidIndex(matrix.getCentroidConfiguration())
+            exportMatrixFile(matrix, matrixFilePath(filePath, name, len(matrices)), exportFormat, centroidIndex)
+        return
+    centroidConfiguration = matrices[0][1].getCentroidConfiguration()
+    for name, matrix in matrices:
+        if matrix.getCentroidConfiguration().getId() != centroidConfiguration.getId():
+            raise Exception(f"The matrix '{name}' does not use the same centroid configuration as '{matrices[0][0]}'")
+    centroidIndex = getCentroidIndex(centroidConfiguration)
+    arrays = dict()
+    for name, matrix in matrices:
+        arrays[name] = readMatrixArray(matrix, centroidIndex.centroids, np.float32)
+    writeMatrixArchive(filePath, arrays, matrixZoneLabels(centroidIndex))
 
 def run_xtmf(parameters, model, console):
     """
@@ -54,9 +84,10 @@ def run_xtmf(parameters, model, console):
     # extract the parameters and save to dictionary
     xtmf_parameters = {
          "filePath": parameters["FilePath"],
-         "matrixName": parameters["MatrixName"]
+         "matrixName": parameters["MatrixName"],
+         "matrixNames": parameters.get("MatrixNames", []),
+         "format": parameters.get("Format", "csv")
     }
-    print (parameters)
     _execute(model, console, xtmf_parameters)
     
 def _execute(inputModel, console, xtmf_parameters):
@@ -64,11 +95,18 @@ def _execute(inputModel, console, xtmf_parameters):
     Main execute function to run the simulation
     """
     model = inputModel
-    matrix_name = xtmf_parameters["matrixName"]
-    file_path = xtmf_parameters["filePath"]
-    # find the matrix object based by string name
-    experiment_matrix = model.getCatalog().findByName(matrix_name)
-    # run the export matrix function to save the file
-    exportMatrix(model, console, file_path, experiment_matrix)
-
-    print ('export of matrix was successful')
+    file_path = str(xtmf_parameters["filePath"])
+    matrix_names = list(xtmf_parameters.get("matrixNames", []))
+    if xtmf_parameters["matrixName"]:
+        matrix_names.insert(0, xtmf_parameters["matrixName"])
+    if len(matrix_names) == 0:
+        raise Exception("No matrix was given to export")
+    # find the matrix objects based by string name
+    matrices = []
+    for matrix_name in matrix_names:
+        experiment_matrix = model.getCatalog().findByName(matrix_name)
+        if experiment_matrix is None:
+            raise Exception(f"The specified matrix '{matrix_name}' does not exist")
+        matrices.append((matrix_name, experiment_matrix))
+    # run the export matrix function to save the files
+    exportMatrices(model, file_path, matrices, str(xtmf_parameters.get("format", "csv")).lower())
@@ -0,0 +1,74 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from PyANGBasic import *
+from PyANGKernel import *
+from PyANGConsole import *
+from common.matrixIndex import MatrixIndex
+from common.centroidIndex import getCentroidIndex
+from common.matrixFingerprint import getFingerprintColumn
+from importMatrixFromCSVThirdNormalized import find_centroid_configuration, store_matrix_file, add_to_matrix_folder
+
+def run_xtmf(parameters, model, console):
+    """
+    A general function called in all python modules called by bridge. Responsible
+    for extracting data and running appropriate functions.
+    """
+    _execute(model, console, parameters)
+
+def binary_format(matrixFile):
+    """
+    Function to get the matrix format of a memory mapped .npy or raw binary file
+    """
+    return "npy" if matrixFile.lower().endswith(".npy") else "bin"
+
+def _execute(model, console, parameters):
+    """
+    Main execute function to run the simulation.
+    """
+    catalog = model.getCatalog()
+    #extract the json parameters
+    matrixFile = str(parameters["MatrixFile"])
+    zoneFile = str(parameters["ZoneFile"])
+    dataType = str(parameters.get("DataType", "float32"))
+    matrixId = str(parameters["MatrixID"])
+    centroidConfigurationId = str(parameters["CentroidConfiguration"])
+    vehicleEID = str(parameters["VehicleType"])
+    initialTime = str(parameters["InitialTime"])
+    durationTime = str(parameters["DurationTime"])
+    if dataType not in ("float32", "float64"):
+        raise Exception(f"The data type '{dataType}' is not supported, use float32 or float64")
+
+    # find the centroid configuration
+    centroidConfiguration = find_centroid_configuration(model, catalog, centroidConfigurationId)
+
+    # reuse or create the matrix, replacing any other object with the same id. The cells are
+    # streamed from the memory mapped file and only written when they changed.
+    centroidIndex = getCentroidIndex(centroidConfiguration)
+    matrixIndex = MatrixIndex(model, catalog)
+    matrix, isNew = store_matrix_file(model, catalog, matrixIndex, getFingerprintColumn(model),
+                                      (matrixId, vehicleEID, initialTime, durationTime), centroidConfiguration,
+                                      centroidIndex, matrixFile, binary_format(matrixFile),
+                                      zoneFile=zoneFile, dataType=dataType)
+
+    # Save add the matrix to the network file
+    if isNew:
+        add_to_matrix_folder(model, [matrix])
+
+    return console
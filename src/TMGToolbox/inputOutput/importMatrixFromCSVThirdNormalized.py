@@ -24,7 +24,11 @@ from PyANGBasic import *
 from PyANGKernel import *
 from PyANGConsole import *
 from datetime import time
-from common.common import loadModel, deleteAimsunObject
+from common.common import loadModel
+from common.matrixIndex import MatrixIndex
+from common.centroidIndex import getCentroidIndex, reportUnknownZones
+from common.matrixIO import fingerprintCells, fingerprintMatrixFile, importMatrixFile, readODColumns, writeMatrixCells
+from common.matrixFingerprint import getFingerprintColumn, getMatrixFingerprint, setMatrixFingerprint
 
 def run_xtmf(parameters, model, console):
     """
@@ -33,7 +37,7 @@ def run_xtmf(parameters, model, console):
     """
     _execute(model, console, parameters)
 
-def find_centroid_configuration(model, catalog, centroidConfigurationId, matrixId):
+def find_centroid_configuration(model, catalog, centroidConfigurationId):
     """
     Function to find the centroid configuration
     """
@@ -41,16 +45,24 @@ def find_centroid_configuration(model, catalog, centroidConfigurationId, matrixI
     centroidConfiguration = catalog.findObjectByExternalId(centroidConfigurationId, sectionType)
     if centroidConfiguration is None:
         raise Exception(f"The specified centroid configuration '{centroidConfigurationId}' does not exist")
-    #check if matrix with given id exists and delete it if it does
-    if catalog.findObjectByExternalId(matrixId) != None:
-        while catalog.findObjectByExternalId(matrixId) != None:
-            obj = catalog.findObjectByExternalId(matrixId)
-            cmd = obj.getDelCmd()
-            model.getCommander().addCommand(cmd)
-            model.getCommander().addCommand(None)
-
     return centroidConfiguration
 
+def set_matrix_settings(model, catalog, matrix, vehicleEID, initialTime, durationTime):
+    """
+    function to set the vehicle and time window of a matrix
+    """
+    sectionType = model.getType("GKVehicle")
+    vehicleType = catalog.findByName(vehicleEID, sectionType)
+    if vehicleType is None:
+        raise Exception(f"The specified vehicle type '{vehicleEID}' does not exist")
+    matrix.setVehicle(vehicleType)
+
+    initialTime = initialTime.split(":")
+    startTime = time(int(initialTime[0]),int(initialTime[1]),int(initialTime[2]),int(initialTime[3]))
+    matrix.setFrom(startTime)
+    durationTime = durationTime.split(":")
+    matrix.setDuration(GKTimeDuration(int(durationTime[0]), int(durationTime[1]), int(durationTime[2])))
+
 def build_matrix(model, catalog, vehicleEID, matrixId, centroidConfiguration, initialTime, durationTime):
     """
     function to build and create a new matrix
@@ -63,52 +75,124 @@ def build_matrix(model, catalog, vehicleEID, matrixId, centroidConfiguration, in
     matrix.setCentroidConfiguration(centroidConfiguration)
     matrix.setValueToAllCells(0.0)
     matrix.setEnableStore(True)
-    
-    sectionType = model.getType("GKVehicle")
-    if catalog.findByName(vehicleEID, sectionType) is None:
-        raise Exception(f"The specified vehicle type '{vehicleEID}' does not exist")
-    else:
-        vehicleType = catalog.findByName(vehicleEID, sectionType)
-        matrix.setVehicle(vehicleType)
-
-    initialTime = initialTime.split(":")
-    startTime = time(int(initialTime[0]),int(initialTime[1]),int(initialTime[2]),int(initialTime[3]))
-    matrix.setFrom(startTime)
-    durationTime = durationTime.split(":")
-    matrix.setDuration(GKTimeDuration(int(durationTime[0]), int(durationTime[1]), int(durationTime[2])))
-    
+    set_matrix_settings(model, catalog, matrix, vehicleEID, initialTime, durationTime)
     return matrix
 
-def extract_OD_Data(fileLocation, model, catalog, header, thirdNormalized, vehicleEID, matrix):
+def select_matrix(matrixIndex, matrixId, centroidConfiguration):
     """
-    Function to extract the data from the OD csv file 
+    function to find the GKODMatrix with the given id and centroid configuration that can be
+    reused. Any other matrix with the id is deleted, objects that are not matrices are kept.
+    Returns None if there is no such matrix.
     """
-    #read file and import
-    with open(fileLocation) as csvfile:
-        reader = csv.reader(csvfile)
-        sectionType = model.getType("GKCentroid")
-        entranceCentroidType = model.getType("GKCenConnection")
-        exitCentroidType = model.getType("GKCenConnection")
+    reused = None
+    for existing in matrixIndex.find(matrixId):
+        if (reused is None and existing.getTypeName() == "GKODMatrix"
+                and existing.getExternalId() == matrixId and existing.getName() == matrixId
+                and existing.getCentroidConfiguration() is not None
+                and existing.getCentroidConfiguration().getId() == centroidConfiguration.getId()):
+            reused = existing
+        else:
+            matrixIndex.delete(existing)
+    return reused
 
-        if header is True:
-            next(reader)
-        for line in reader:
-            if thirdNormalized is True:
-                value = float(line[2])
-                # Only create object if OD value is non zero
-                if value != 0.0:
-                    originEID = f"centroid_{line[0]}"
-                    destinationEID = f"centroid_{line[1]}"
-                    origin = catalog.findObjectByExternalId(originEID, sectionType)
-                    destination = catalog.findObjectByExternalId(destinationEID, sectionType)
-                    
-                    if origin is None:
-                        raise Exception(f"The specified centroid '{originEID}' does not exist")
-                    if destination is None:
-                        raise Exception(f"The specified centroid '{destinationEID}' does not exist")
-                    matrix.setTrips(origin, destination, value)
-            else:
-                raise Exception("Functionality has not been implemented yet")
+def replace_matrix(model, catalog, matrixIndex, fingerprintColumn, vehicleEID, matrixId, centroidConfiguration,
+                   initialTime, durationTime):
+    """
+    function to get an empty matrix with the given id. An existing GKODMatrix with the same
+    centroid configuration is zeroed and reused, any other matrix with the id is deleted.
+    Returns the matrix and True if it is a new matrix that still has to be added to a folder.
+    """
+    reused = select_matrix(matrixIndex, matrixId, centroidConfiguration)
+    if reused is not None:
+        # clear the fingerprint first so a failed write never leaves a stale one behind
+        setMatrixFingerprint(reused, fingerprintColumn, "")
+        reused.setValueToAllCells(0.0)
+        set_matrix_settings(model, catalog, reused, vehicleEID, initialTime, durationTime)
+        return reused, False
+    matrix = build_matrix(model, catalog, vehicleEID, matrixId, centroidConfiguration, initialTime, durationTime)
+    matrixIndex.add(matrix)
+    return matrix, True
+
+def store_matrix(model, catalog, matrixIndex, fingerprintColumn, matrixParameters, centroidConfiguration,
+                 fingerprint, writeCells):
+    """
+    function to fill the matrix given by matrixParameters, (id, vehicle type, initial time,
+    duration time), with writeCells(matrix) and store the content fingerprint of the cells.
+    The cells are not written again when the existing matrix already has the same fingerprint,
+    so this relies on every tool that writes matrix cells keeping the fingerprint up to date.
+    Returns the matrix and True if it is a new matrix that still has to be added to a folder.
+    """
+    matrixId, vehicleEID, initialTime, durationTime = matrixParameters
+    existing = select_matrix(matrixIndex, matrixId, centroidConfiguration)
+    if existing is not None and getMatrixFingerprint(existing, fingerprintColumn) == fingerprint:
+        set_matrix_settings(model, catalog, existing, vehicleEID, initialTime, durationTime)
+        print(f"The matrix '{matrixId}' is unchanged, its cells were not written again")
+        return existing, False
+    matrix, isNew = replace_matrix(model, catalog, matrixIndex, fingerprintColumn, vehicleEID, matrixId,
+                                   centroidConfiguration, initialTime, durationTime)
+    writeCells(matrix)
+    setMatrixFingerprint(matrix, fingerprintColumn, fingerprint)
+    return matrix, isNew
+
+def store_matrix_cells(model, catalog, matrixIndex, fingerprintColumn, matrixParameters, centroidConfiguration,
+                       centroidIndex, origins, destinations, values):
+    """
+    function to write the non zero cells into the matrix given by matrixParameters,
+    see store_matrix
+    """
+    fingerprint = fingerprintCells(centroidIndex.ids, origins, destinations, values)
+    writeCells = lambda matrix: writeMatrixCells(matrix, centroidIndex.centroids, origins, destinations, values)
+    return store_matrix(model, catalog, matrixIndex, fingerprintColumn, matrixParameters, centroidConfiguration,
+                        fingerprint, writeCells)
+
+def store_matrix_file(model, catalog, matrixIndex, fingerprintColumn, matrixParameters, centroidConfiguration,
+                      centroidIndex, fileLocation, formatName, **options):
+    """
+    function to write the cells of a file in one of the registered matrix formats into the
+    matrix given by matrixParameters, see store_matrix. The file is streamed once for its
+    fingerprint and again to write the cells only when they changed, so it is never held in
+    memory. Reports the zones that are not in the centroid configuration.
+    """
+    unknownZones = set()
+    fingerprint = fingerprintMatrixFile(fileLocation, formatName, centroidIndex, unknownZones, **options)
+    reportUnknownZones(unknownZones)
+    writeCells = lambda matrix: importMatrixFile(matrix, fileLocation, formatName, centroidIndex, set(), **options)
+    return store_matrix(model, catalog, matrixIndex, fingerprintColumn, matrixParameters, centroidConfiguration,
+                        fingerprint, writeCells)
+
+def add_to_matrix_folder(model, matrices):
+    """
+    function to add new matrices to the matrices folder of the model
+    """
+    folderName = "GKCentroidConfiguration::matrices"
+    folder = model.getCreateRootFolder().findFolder( folderName )
+    if folder is None:
+        folder = GKSystem.getSystem().createFolder( model.getCreateRootFolder(), folderName )
+    for matrix in matrices:
+        folder.append(matrix)
+
+def extract_OD_Data(fileLocation, header, numberOfMatrices, centroidIndex):
+    """
+    Function to read the non zero cells of each matrix from a third normalized OD csv file.
+    The file is parsed in chunks with NumPy and duplicate OD pairs are summed, column i + 2
+    of the file holds matrix i.
+    Returns a list of (origin indices, destination indices, values), one per matrix.
+    """
+    origins, destinations, values, unknownZones = readODColumns(fileLocation, header, centroidIndex.zoneLookup,
+                                                                len(centroidIndex.centroids), numberOfMatrices)
+    reportUnknownZones(unknownZones)
+    return [(origins, destinations, values[:, i]) for i in range(numberOfMatrices)]
+
+def read_matrix_parameters(parameters):
+    """
+    Function to get the id, vehicle type and time window of each matrix to import.
+    Uses the Matrices list when it is given, otherwise the single matrix parameters.
+    """
+    matrices = parameters.get("Matrices")
+    if matrices is None or len(matrices) == 0:
+        matrices = [parameters]
+    return [(str(m["MatrixID"]), str(m["VehicleType"]), str(m["InitialTime"]), str(m["DurationTime"]))
+            for m in matrices]
 
 def _execute(model, console, parameters):
     """ 
@@ -119,30 +203,37 @@ def _execute(model, console, parameters):
     fileLocation = str(parameters["ODCSV"])
     thirdNormalized = bool(parameters["ThirdNormalized"])
     header = bool(parameters["IncludesHeader"])
-    matrixId = str(parameters["MatrixID"])
     centroidConfigurationId = str(parameters["CentroidConfiguration"])
-    vehicleEID = str(parameters["VehicleType"])
-    initialTime = str(parameters["InitialTime"])
-    durationTime = str(parameters["DurationTime"])
-    
-    # check and delete all pre-existing Aimsun objects
-    deleteAimsunObject(model, catalog, "GKODMatrix", matrixId)
+    matrixParameters = read_matrix_parameters(parameters)
+    if len(matrixParameters) > 1 and thirdNormalized is not True:
+        raise Exception(f"A square OD file holds a single matrix but {len(matrixParameters)} matrix ids were given, "
+                        "importing several matrices in one pass requires a third normalized file")
 
     # find the centroid configuration
-    centroidConfiguration = find_centroid_configuration(model, catalog, centroidConfigurationId, matrixId)
+    centroidConfiguration = find_centroid_configuration(model, catalog, centroidConfigurationId)
 
-    # Create new matrix
-    matrix = build_matrix(model, catalog, vehicleEID, matrixId, centroidConfiguration, initialTime, durationTime)
+    # reuse or create the matrices, replacing any other object with the same id
+    centroidIndex = getCentroidIndex(centroidConfiguration)
+    matrixIndex = MatrixIndex(model, catalog)
+    fingerprintColumn = getFingerprintColumn(model)
+    newMatrices = []
+    if thirdNormalized is not True:
+        # square files are streamed one origin row at a time
+        matrix, isNew = store_matrix_file(model, catalog, matrixIndex, fingerprintColumn, matrixParameters[0],
+                                          centroidConfiguration, centroidIndex, fileLocation, "square", header=header)
+        if isNew:
+            newMatrices.append(matrix)
+    else:
+        # read the cells of every matrix from the OD Data csv file
+        cells = extract_OD_Data(fileLocation, header, len(matrixParameters), centroidIndex)
+        for matrixParameter, (origins, destinations, values) in zip(matrixParameters, cells):
+            matrix, isNew = store_matrix_cells(model, catalog, matrixIndex, fingerprintColumn, matrixParameter,
+                                               centroidConfiguration, centroidIndex, origins, destinations, values)
+            if isNew:
+                newMatrices.append(matrix)
 
-    # extract data from the OD Data csv file read file and import
-    extract_OD_Data(fileLocation, model, catalog, header, thirdNormalized, vehicleEID, matrix)
-    
-    # Save add the matrix to the network file
-    folderName = "GKCentroidConfiguration::matrices"
-    folder = model.getCreateRootFolder().findFolder( folderName )
-    if folder is None:
-        folder = GKSystem.getSystem().createFolder( model.getCreateRootFolder(), folderName )
-    folder.append(matrix)
+    # Save add the new matrices to the network file
+    add_to_matrix_folder(model, newMatrices)
 
     return console
 
@@ -23,7 +23,9 @@ import time
 from PyANGBasic import *
 from PyANGKernel import *
 from PyANGConsole import *
-from common.common import loadModel, cacheAllOfTypeByExternalId, cacheNodeConnections
+from common.common import loadModel
+from common.stopIndex import StopIndex
+from common.centroidIndex import getCentroidIndex
 
 
 def definePedestrianType(model):
@@ -111,41 +113,7 @@ def createGlobalPedArea(model, geomodel, catalog, layer, name):
     geomodel.add(layer, pedArea)
     return pedArea
 
-def findNearbySections(centroid, nodeConnections, model):
-    nearbySections = []
-    nodeType = model.getType("GKNode")
-    sectionType = model.getType("GKSection")
-    # Get the nodes connected to the centroid
-    centroidConnections = centroid.getConnections()
-    for centroidConnection in iter(centroidConnections):
-        node = centroidConnection.getConnectionObject()
-        if node.getType() == nodeType:
-            # Get the links from/to the nodes
-            linkConnections = nodeConnections[node]
-            for link in linkConnections:
-                if link.getType() == sectionType:
-                    nearbySections.append(link)
-    if len(nearbySections) == 0:
-        nearbySections = None
-    return nearbySections
-
-# Method takes a centroid as argument and returns a list of nearby bus stops
-# Nearby bus stops are stops on any link to or from a node on a centroid connector
-def findNearbyStops(centroid, nodeConnections, model):
-    nearbyStops = []
-    nearbySections = findNearbySections(centroid, nodeConnections, model)
-    if nearbySections is not None:
-        for section in nearbySections:
-            potentialStops = section.getTopObjects()
-            if potentialStops is not None:
-                for stop in potentialStops:
-                    nearbyStops.append(stop)
-    # If no stops found make output none
-    if len(nearbyStops) == 0:
-        nearbyStops = None
-    return nearbyStops
-
-def createTransitCentroidConnections(centroidConfiguration, nodeConnections, model, catalog, geomodel):
+def createTransitCentroidConnections(centroidConfiguration, model, catalog, geomodel):
     print("Create pedestrian centroid configuration")
     # create pedestrian layer
     pedestrianLayer = geomodel.findLayer("Pedestrians Layer")
@@ -153,21 +121,19 @@ def createTransitCentroidConnections(centroidConfiguration, nodeConnections, mod
         pedestrianLayer = createPedestrianLayer(model)
     # Create a new pedestrian centroid configuration
     pedCentroidConfig = createPedestrianCentroidConfig(model)
-    centroids = centroidConfiguration.getCentroids()
+    centroidIndex = getCentroidIndex(centroidConfiguration)
+    centroids = centroidIndex.centroids
     # Create a global pedestrian area
     pedArea = createGlobalPedArea(model, geomodel, catalog, pedestrianLayer, "full")
     # Create centroids and connect all nearby bus stops
     print("Create pedestiran centroids and connections")
-    sectionType = model.getType("GKBusStop")
-    for centroid in centroids:
+    # index the stops once and find the stops for every centroid
+    stopIndex = StopIndex(model, catalog)
+    centroidStops = stopIndex.findStopsForCentroids(centroidIndex)
+    for centroid, nearbyStops in zip(centroids, centroidStops):
         pedCentroids = list()
-        # Get all nearby stops
-        nearbyStops = findNearbyStops(centroid, nodeConnections, model)
-        # If no stops found get the closest stop
-        if nearbyStops is None:
-            nearbyStops = [geomodel.findClosestObject(centroid.getPosition(), sectionType)]
         # If no stops found move to the next centroid
-        if nearbyStops is not None:
+        if len(nearbyStops) > 0:
             # check if there is an existing pedestrian centroid
             pedCentroidType = model.getType("GKPedestrianEntranceCentroid")
             entranceCentroid = catalog.findObjectByExternalId(f"ped_entrance_{centroid.getExternalId()}", pedCentroidType)
@@ -227,17 +193,13 @@ def _execute(inputModel, console):
     model = inputModel
     catalog = model.getCatalog()
     geomodel = model.getGeoModel()
-    
-    nodes = cacheAllOfTypeByExternalId("GKNode", model, catalog)
-    sections = cacheAllOfTypeByExternalId("GKSection", model, catalog)
-    nodeConnections = cacheNodeConnections(nodes.values(), sections.values())
     loadModelEndTime = time.perf_counter()
     print(f"Time to load model: {loadModelEndTime-loadModelStartTime}")
     pedStartTime = time.perf_counter()
     print("Add pedestrians")
     pedestrianType = definePedestrianType(model)
     centroidConfig = catalog.findObjectByExternalId("baseCentroidConfig", model.getType("GKCentroidConfiguration"))
-    createTransitCentroidConnections(centroidConfig, nodeConnections, model, catalog, geomodel)
+    createTransitCentroidConnections(centroidConfig, model, catalog, geomodel)
     pedEndTime = time.perf_counter()
     print(f"Time to import pedestrians: {pedEndTime-pedStartTime}")
     overallEndTime = time.perf_counter()
@@ -24,47 +24,18 @@ from PyANGBasic import *
 from PyANGKernel import *
 from PyANGConsole import *
 import shlex
-from common.common import read_datafile, extract_network_packagefile, createTurn, loadModel, getTransitNodesStopsAndLinesFromNWP, cacheAllOfTypeByExternalId, cacheNodeConnections
-
-
-def addAllowedVehicle(section, vehicle):
-    if section.canUseVehicle(vehicle) is False:
-        bannedVehicles = []
-        for veh in section.getNonAllowedVehicles():
-            if veh != vehicle:
-                bannedVehicles.append(veh)
-        if len(bannedVehicles)>0:
-            section.setUseRoadTypeNonAllowedVehicles(False)
-            section.setNonAllowedVehicles(bannedVehicles)
-
-def turnCheck(fromSection, toSection, model):
-    turnsOut = fromSection.getDestTurnings()
-    for turn in turnsOut:
-        destination = turn.getDestination()
-        if destination == toSection:
-            return
-    createTurn(fromSection.getDestination(), fromSection, toSection, model)
-
-def addDummyLink(transitVehicle, node, nextLink, allVehicles, roadTypes, layer, catalog, model):
-    # Check if the dummy link already exists
-    sectionType = model.getType("GKSection")
-    busStopType = model.getType("GKBusStop")
-    existingDummyLink = catalog.findObjectByExternalId(f"dummylink_at_{node.getExternalId()}", sectionType)
-    if existingDummyLink is not None:
-        # Find the bus stop on the dummy link
-        busStop = None
-        dummyLink = existingDummyLink
-        potentialStops = dummyLink.getTopObjects()
-        if potentialStops is not None:
-            for stop in potentialStops:
-                if stop.getType() == busStopType:
-                    busStop = stop
-        # Check the allowed vehicles
-        addAllowedVehicle(dummyLink, transitVehicle)
-        # Check can turn onto nextLink
-        turnCheck(dummyLink, nextLink, model)
-        if busStop is not None:
-            return dummyLink, busStop
+import numpy as np
+from common.spatialIndex import PointGridIndex, readPositions
+from common.stopIndex import StopIndex
+from common.centroidIndex import getCentroidIndex
+from common.common import read_datafile, extract_network_packagefile, createTurn, loadModel, getTransitNodesStopsAndLinesFromNWP, cacheAllOfTypeByExternalId, cacheNodeConnections, getOrCreateColumn, TRANSIT_VEHICLE_COLUMN
+
+
+def addDummyLink(node, nextLink, roadTypes, layer, catalog, model):
+    """
+    Function to create the dummy link and stop where the transit lines starting at the node enter the network.
+    The vehicles allowed on the link are set by DummyLinkRegistry.setPermittedVehicles
+    """
     # Create the link
     numberOfLanes = 1
     laneWidth = 2.0
@@ -86,16 +57,6 @@ def addDummyLink(transitVehicle, node, nextLink, allVehicles, roadTypes, layer,
     # Set the desination link to the node
     newLink.setDestination(node)
 
-    # Set the allowed mode to only include transit vehicle
-    newLink.setUseRoadTypeNonAllowedVehicles(False)
-    # create list of banned vehicles
-    bannedVehicles = []
-    for vehicle in allVehicles:
-        if vehicle is not transitVehicle:
-            bannedVehicles.append(vehicle)
-    # set the banned vehicles on the section
-    if len(bannedVehicles)>0:
-        newLink.setNonAllowedVehicles(bannedVehicles)
     # Make the turning object to the first link in the transit line
     newTurn = createTurn(node, newLink, nextLink, model)
     # add a transit stop
@@ -110,6 +71,84 @@ def addDummyLink(transitVehicle, node, nextLink, allVehicles, roadTypes, layer,
     busStop.setLength(linkLength/2)
     return newLink, busStop
 
+class DummyLinkRegistry:
+    """
+    Registry of the dummy links at the start of the transit lines keyed by node.
+    Records the stop, the turns and the transit vehicles permitted on each dummy link
+    so the vehicle permissions are written once after all the lines are imported.
+    """
+
+    def __init__(self, allVehicles, roadTypes, layer, catalog, model):
+        self.allVehicles = allVehicles
+        self.roadTypes = roadTypes
+        self.layer = layer
+        self.catalog = catalog
+        self.model = model
+        # node external id -> (dummy link, bus stop)
+        self.dummyLinks = dict()
+        # node external id -> set of ids of the vehicles permitted on the dummy link
+        self.permittedVehicles = dict()
+        # node external id -> set of ids of the sections the dummy link turns onto
+        self.turnDestinations = dict()
+        self.createdCount = 0
+
+    def _findExistingDummyLink(self, nodeId):
+        """
+        Find a dummy link and its stop left in the model by a previous import
+        """
+        sectionType = self.model.getType("GKSection")
+        busStopType = self.model.getType("GKBusStop")
+        dummyLink = self.catalog.findObjectByExternalId(f"dummylink_at_{nodeId}", sectionType)
+        if dummyLink is None:
+            return None
+        # Find the bus stop on the dummy link
+        busStop = None
+        potentialStops = dummyLink.getTopObjects()
+        if potentialStops is not None:
+            for stop in potentialStops:
+                if stop.getType() == busStopType:
+                    busStop = stop
+        if busStop is None:
+            return None
+        # keep the vehicles that are already allowed on the link
+        self.permittedVehicles[nodeId] = set(vehicle.getId() for vehicle in self.allVehicles if dummyLink.canUseVehicle(vehicle))
+        self.turnDestinations[nodeId] = set(turn.getDestination().getId() for turn in dummyLink.getDestTurnings())
+        return dummyLink, busStop
+
+    def getDummyLink(self, transitVehicle, node, nextLink):
+        """
+        Return the dummy link and stop at the node, creating them the first time the node is used
+        """
+        nodeId = node.getExternalId()
+        entry = self.dummyLinks.get(nodeId)
+        if entry is None:
+            entry = self._findExistingDummyLink(nodeId)
+        if entry is None:
+            entry = addDummyLink(node, nextLink, self.roadTypes, self.layer, self.catalog, self.model)
+            self.permittedVehicles[nodeId] = set()
+            self.turnDestinations[nodeId] = set([nextLink.getId()])
+            self.createdCount += 1
+        self.dummyLinks[nodeId] = entry
+        dummyLink = entry[0]
+        if transitVehicle is not None:
+            self.permittedVehicles[nodeId].add(transitVehicle.getId())
+        # Check can turn onto nextLink
+        if nextLink.getId() not in self.turnDestinations[nodeId]:
+            createTurn(node, dummyLink, nextLink, self.model)
+            self.turnDestinations[nodeId].add(nextLink.getId())
+        return entry
+
+    def setPermittedVehicles(self):
+        """
+        Ban every vehicle that is not used by a transit line starting at each dummy link
+        """
+        for nodeId, (dummyLink, busStop) in self.dummyLinks.items():
+            permitted = self.permittedVehicles[nodeId]
+            bannedVehicles = [vehicle for vehicle in self.allVehicles if vehicle.getId() not in permitted]
+            dummyLink.setUseRoadTypeNonAllowedVehicles(False)
+            dummyLink.setNonAllowedVehicles(bannedVehicles)
+        print(f"Dummy links used: {len(self.dummyLinks)}, created: {self.createdCount}")
+
 def importTransitVehicles(networkZipFileObject, filename, catalog, model):
     vehicles = []
     # read the file
@@ -141,22 +180,10 @@ def importTransitVehicles(networkZipFileObject, filename, catalog, model):
         folder.append(veh)
     return vehicles
 
-def addBusStop(fromNodeId, toNodeId, link, start, repeatNumber, catalog, model):
+def addBusStop(externalId, link, start, catalog, model):
     """
     Function to create the bus stop objects in the Aimsun network
-    repeatNumber is the number of times that same busStop is in a line
     """
-    # Check if the stop already exists
-    busStopType = model.getType("GKBusStop")
-    if start is True:
-        externalId = f"stop_{fromNodeId}_{link.getExternalId()}_{repeatNumber}"
-    else:
-        externalId = f"stop_{toNodeId}_{link.getExternalId()}_{repeatNumber}"
-    existingBusStop = catalog.findObjectByExternalId(externalId, busStopType)
-    # If the stop exists return it
-    if existingBusStop is not None:
-        return existingBusStop
-    # Otherwise create a new object
     busStop=GKSystem.getSystem().newObject("GKBusStop",model)
     catalog.add(busStop)
     busStop.setName(externalId)
@@ -177,8 +204,54 @@ def addBusStop(fromNodeId, toNodeId, link, start, repeatNumber, catalog, model):
     # TODO add a parameter to set the stop length and position
     return busStop
 
+class StopRegistry:
+    """
+    Registry of the bus stops used by the transit lines keyed by (node, link, repeat)
+    repeat is the number of times that same stop has already been used in the current line
+    """
+
+    def __init__(self, catalog, model):
+        self.catalog = catalog
+        self.model = model
+        # stops left in the model by a previous import are looked up once here
+        self.existingStops = cacheAllOfTypeByExternalId("GKBusStop", model, catalog)
+        self.stops = dict()
+        self.lineKeys = set()
+        self.createdCount = 0
+        self.reusedCount = 0
 
-def addTransitLine(lineId, lineName, pathLinks, busStops, transitVehicle, allVehicles, roadTypes, layer, catalog, model):
+    def startLine(self):
+        """
+        Clear the stops of the line being built so the next line starts at repeat 0
+        """
+        self.lineKeys = set()
+
+    def getStop(self, fromNodeId, toNodeId, link, start):
+        """
+        Return the stop for the node and link, creating it if it does not exist yet
+        """
+        nodeId = fromNodeId if start is True else toNodeId
+        linkId = link.getExternalId()
+        # if the stop is already used in the line make a new stop in the same place
+        repeatNumber = 0
+        while (nodeId, linkId, repeatNumber) in self.lineKeys:
+            repeatNumber += 1
+        key = (nodeId, linkId, repeatNumber)
+        self.lineKeys.add(key)
+        busStop = self.stops.get(key)
+        if busStop is not None:
+            # the stop was registered by an earlier line
+            self.reusedCount += 1
+            return busStop
+        externalId = f"stop_{nodeId}_{linkId}_{repeatNumber}"
+        busStop = self.existingStops.get(externalId)
+        if busStop is None:
+            busStop = addBusStop(externalId, link, start, self.catalog, self.model)
+            self.createdCount += 1
+        self.stops[key] = busStop
+        return busStop
+
+def addTransitLine(lineId, lineName, pathLinks, busStops, transitVehicle, dummyLinks, vehicleColumn, model):
     """
     Function to build the transit lines Aimsun
     """
@@ -188,10 +261,13 @@ def addTransitLine(lineId, lineName, pathLinks, busStops, transitVehicle, allVeh
     ptLine = cmd.createdObject()
     ptLine.setExternalId(lineId)
     ptLine.setName(lineName)
+    # store the transit vehicle on the line so the schedule import can find it
+    if transitVehicle is not None:
+        ptLine.setDataValue(vehicleColumn, transitVehicle.getExternalId())
     links = []
     # Add the dummy link at the start of the line
     firstLink = pathLinks[0]
-    dummyLink, dummyLinkStop = addDummyLink(transitVehicle, firstLink.getOrigin(), firstLink, allVehicles, roadTypes, layer, catalog, model)
+    dummyLink, dummyLinkStop = dummyLinks.getDummyLink(transitVehicle, firstLink.getOrigin(), firstLink)
     ptLine.add(dummyLink, None)
     # add the dummyLink to the busStops list
     allBusStops = busStops
@@ -201,23 +277,54 @@ def addTransitLine(lineId, lineName, pathLinks, busStops, transitVehicle, allVeh
         ptLine.add(link, None)
     # add the stop list to the line
     ptLine.setStops(allBusStops)
-    # Check that the route defined by the line is valid
+    # Check that the route defined by the line is valid. Missing turns have already been
+    # created by createMissingTurns, fix any remaining discontinuity one turn at a time
     check = ptLine.isCorrect()
     # Set a max number of attempts to fix the line
     fixTries = 5
     while check[0] is False and fixTries > 0:
         print(f"Fix a discontinuity in transit line {lineId} {lineName}")
         # create a new turn to fix the discrepancy
-        fromLink = catalog.find(check[3])
-        toLink = catalog.find(check[1])
-        node = fromLink.getDestination()
-        createTurn(node, fromLink, toLink, model)
+        fromLink = model.getCatalog().find(check[3])
+        toLink = model.getCatalog().find(check[1])
+        if fromLink is None or toLink is None:
+            break
+        createTurn(fromLink.getDestination(), fromLink, toLink, model)
         # update the check and the maximum tries counter
         check = ptLine.isCorrect()
         fixTries -= 1
     if check[0] is False:
         print (f"Issue importing transit line {lineId} {lineName}")
 
+def findMissingTurns(linkPaths):
+    """
+    Function to collect every (fromSection, toSection) turn needed by the
+    transit line paths that does not exist in the network yet
+    """
+    # destinations of the turns out of each section, read once per section
+    turnDestinations = dict()
+    missingTurns = []
+    for linkPath in linkPaths:
+        for fromSection, toSection in zip(linkPath[:-1], linkPath[1:]):
+            if fromSection is None or toSection is None:
+                continue
+            destinations = turnDestinations.get(fromSection)
+            if destinations is None:
+                destinations = set(turn.getDestination() for turn in fromSection.getDestTurnings())
+                turnDestinations[fromSection] = destinations
+            if toSection not in destinations:
+                destinations.add(toSection)
+                missingTurns.append((fromSection, toSection))
+    return missingTurns
+
+def createMissingTurns(missingTurns, model):
+    """
+    Function to create all of the missing turns before the transit lines are built
+    """
+    for fromSection, toSection in missingTurns:
+        createTurn(fromSection.getDestination(), fromSection, toSection, model)
+    print(f"Number of turns created for transit lines: {len(missingTurns)}")
+
 def getPath(pathList, nodeConnections, catalog, model):
     """
     Takes a path list as argument
@@ -261,11 +368,13 @@ def importTransit(networkZipFileObject, fileName, roadTypes, layer, nodeConnecti
     for types in catalog.getUsedSubTypesFromType( sectionType ):
         for vehicle in iter(types.values()):
             allVehicles.append(vehicle)
-    # add each line one at a time
+    # resolve the path and stops of each line
     lineName = None
     lineId = None
     pathList = None
     stopsList = None
+    itineraries = []
+    stopRegistry = StopRegistry(catalog, model)
     print(f"Number of transit lines to import: {len(lines)}")
     for i in range(len(lines)):
         lineName = lines[i][5]
@@ -275,115 +384,83 @@ def importTransit(networkZipFileObject, fileName, roadTypes, layer, nodeConnecti
         pathList = nodes[i]
         stopsList = stops[i]
         busStops = []
-        # print(f"Adding Line {lineId} {lineName}")
         # Get the path links and nodes
         nodePath, linkPath = getPath(pathList, nodeConnections, catalog, model)
         # add all of the stops in the line to the network
         # fist stop will be on dummy link so don't add bus stop
+        stopRegistry.startLine()
         for j in range(1, len(nodePath)):
             # add a stop if there is a non zero dwell time or if is end of line
             if stopsList[j] != 0.0 or j==(len(nodePath)-1):
                 link = linkPath[j-1]
-                repeatNumber = 0
-                newBusStop = addBusStop(nodePath[j-1].getExternalId(),nodePath[j].getExternalId(),link,False, repeatNumber, catalog, model)
-                # Check to see if the bus stop is already used in the line
-                # if yes make a new stop in the same place
-                while newBusStop in busStops:
-                    repeatNumber = repeatNumber + 1
-                    newBusStop = addBusStop(nodePath[j-1].getExternalId(),nodePath[j].getExternalId(),link,False, repeatNumber, catalog, model)
+                newBusStop = stopRegistry.getStop(nodePath[j-1].getExternalId(),nodePath[j].getExternalId(),link,False)
                 busStops.append(newBusStop)
             else:
                 busStops.append(None)
-        # add the transit line
-        addTransitLine(lineId,lineName,linkPath,busStops,lineVehicle,allVehicles, roadTypes, layer, catalog, model)
+        itineraries.append((lineId, lineName, linkPath, busStops, lineVehicle))
+    # create every turn the lines need in one batch so each line is only validated once
+    createMissingTurns(findMissingTurns([itinerary[2] for itinerary in itineraries]), model)
+    # add each line one at a time
+    dummyLinks = DummyLinkRegistry(allVehicles, roadTypes, layer, catalog, model)
+    vehicleColumn = getOrCreateColumn(model, "GKPublicLine", TRANSIT_VEHICLE_COLUMN, "Transit Vehicle", GKColumn.String)
+    for lineId, lineName, linkPath, busStops, lineVehicle in itineraries:
+        # print(f"Adding Line {lineId} {lineName}")
+        addTransitLine(lineId,lineName,linkPath,busStops,lineVehicle,dummyLinks, vehicleColumn, model)
+    # write the transit vehicles allowed on the dummy links once all of the lines are added
+    dummyLinks.setPermittedVehicles()
+    print(f"Bus stops created: {stopRegistry.createdCount}, reused across lines: {stopRegistry.reusedCount}")
     print("Transit import complete")
 
-def addWalkingTimes(busStop, geomodel, transferDistance, maxTransfers, busStopType, model):
-    location = busStop.absolutePosition()
-    walkingTime = busStop.getWalkingTime() # map to store the walking times
-    times = walkingTime.getWalkingTimes(busStop, model)
-    # Search for all points within the specified transfer distance
-    nearbyStops = geomodel.findClosestObjects(location, transferDistance, busStopType)
-    walkingSpeed = 1.4 # walking speed in m/s
-    walkingSpeedInv = 1.0/walkingSpeed
-    # limit to a maximum number of stops
-    transferDistances = []
-    for stop in nearbyStops:
-        transferDistances.append((stop,walkingSpeedInv*location.distance2D(stop.absolutePosition())))
-    transferDistances.sort(key=lambda tup: tup[1])
-    if len(transferDistances) < maxTransfers:
-        maxTransfers = len(transferDistances)
-    for i in range(maxTransfers):
-        times[transferDistances[i][0]] = transferDistances[i][1]
-    walkingTime.setWalkingTimes(times)
-    busStop.setWalkingTime(walkingTime)
-
-def buildWalkingTransfers(catalog, geomodel, model):
-    busStopType = model.getType("GKBusStop")
-    busStops = catalog.getObjectsByType(busStopType)
-    for stop in iter(busStops.values()):
-        addWalkingTimes(stop, geomodel, 200.0, 10, busStopType, model)
-
-def findNearbySections(centroid, nodeConnections, model):
-    """
-    function to find nearby sections around a centroid
-    """
-    nearbySections = []
-    nodeType = model.getType("GKNode")
-    sectionType = model.getType("GKSection")
-    # Get the nodes connected to the centroid
-    centroidConnections = centroid.getConnections()
-    for centroidConnection in iter(centroidConnections):
-        node = centroidConnection.getConnectionObject()
-        if node.getType() == nodeType:
-            # Get the links from/to the nodes
-            linkConnections = nodeConnections[node]
-            for link in linkConnections:
-                if link.getType() == sectionType:
-                    nearbySections.append(link)
-    return nearbySections
-
-def findNearbyStops(centroid, nodeConnections, model):
+def buildWalkingTransfers(catalog, model, transferDistance, maxTransfers, walkingSpeed):
     """
-    Method takes a centroid as argument and returns a list of nearby transit stops
-    Nearby bus stops are stops on any link to or from a node on a centroid connector
+    Function to add walking transfers between each bus stop and its closest stops
+    within the transfer distance
     """
-    nearbyStops = []
-    nearbySections = findNearbySections(centroid, nodeConnections, model)
-    for section in nearbySections:
-        potentialStops = section.getTopObjects()
-        if potentialStops is not None:
-            for stop in potentialStops:
-                nearbyStops.append(stop)
-    return nearbyStops
+    busStopType = model.getType("GKBusStop")
+    busStops = list(catalog.getObjectsByType(busStopType).values())
+    # read all of the stop positions once and index them on a grid
+    positions = readPositions(busStops)
+    gridIndex = PointGridIndex(positions, transferDistance)
+    source, destination, distance = gridIndex.nearestNeighbours(maxTransfers)
+    transferTimes = distance / walkingSpeed
+    print(f"Number of walking transfers: {len(source)}")
+    if len(source) == 0:
+        return
+    # the pairs are grouped by source stop so each stop's walking times are written once
+    groupStarts = np.flatnonzero(np.r_[True, source[1:] != source[:-1]])
+    groupEnds = np.r_[groupStarts[1:], len(source)]
+    for start, end in zip(groupStarts, groupEnds):
+        busStop = busStops[source[start]]
+        walkingTime = busStop.getWalkingTime() # map to store the walking times
+        times = walkingTime.getWalkingTimes(busStop, model)
+        for k in range(start, end):
+            times[busStops[destination[k]]] = float(transferTimes[k])
+        walkingTime.setWalkingTimes(times)
+        busStop.setWalkingTime(walkingTime)
 
-def createTransitCentroidConnections(centroidConfiguration, nodeConnections, model, catalog, geomodel):
+def createTransitCentroidConnections(centroidConfiguration, model, catalog):
     """
     function to connect the transit stops to the centroids
     """
-    centroids = centroidConfiguration.getCentroids()
-    sectionType = model.getType("GKBusStop")
-    for centroid in centroids:
-        # Get all nearby stops
-        nearbyStops = findNearbyStops(centroid, nodeConnections, model)
-        # If no stops found get the closest stop
-        if len(nearbyStops) == 0:
-            nearbyStops = [geomodel.findClosestObject(centroid.getPosition(), sectionType)]
-        # If no stops found move to the next centroid
-        if nearbyStops is not None:
-            # Connect the nearby transit stops to the centroids
-            for stop in nearbyStops:
-                # TODO change to newCmd for centroid connection causes crash
-                entranceConnection = GKSystem.getSystem().newObject("GKCenConnection", model)
-                entranceConnection.setOwner(centroid)
-                entranceConnection.setConnectionObject(stop)
-                entranceConnection.setConnectionType(1) # from connection
-                centroid.addConnection(entranceConnection)
-                exitConnection = GKSystem.getSystem().newObject("GKCenConnection", model)
-                exitConnection.setOwner(centroid)
-                exitConnection.setConnectionObject(stop)
-                exitConnection.setConnectionType(2) # to connection
-                centroid.addConnection(exitConnection)
+    centroidIndex = getCentroidIndex(centroidConfiguration)
+    centroids = centroidIndex.centroids
+    # index the stops once and find the stops for every centroid
+    stopIndex = StopIndex(model, catalog)
+    centroidStops = stopIndex.findStopsForCentroids(centroidIndex)
+    for centroid, nearbyStops in zip(centroids, centroidStops):
+        # Connect the nearby transit stops to the centroids
+        for stop in nearbyStops:
+            # TODO change to newCmd for centroid connection causes crash
+            entranceConnection = GKSystem.getSystem().newObject("GKCenConnection", model)
+            entranceConnection.setOwner(centroid)
+            entranceConnection.setConnectionObject(stop)
+            entranceConnection.setConnectionType(1) # from connection
+            centroid.addConnection(entranceConnection)
+            exitConnection = GKSystem.getSystem().newObject("GKCenConnection", model)
+            exitConnection.setOwner(centroid)
+            exitConnection.setConnectionObject(stop)
+            exitConnection.setConnectionType(2) # to connection
+            centroid.addConnection(exitConnection)
 
 def run_xtmf(parameters, model, console):
     """
@@ -391,9 +468,13 @@ def run_xtmf(parameters, model, console):
      for extracting data and running appropriate functions.
     """
     networkPackage = parameters["NetworkPackageFile"]
-    _execute(networkPackage, model, console)
+    # walking transfer settings, defaults match the values used before they were parameters
+    transferDistance = float(parameters.get("TransferDistance", 200.0))
+    maxTransfers = int(parameters.get("MaxTransfers", 10))
+    walkingSpeed = float(parameters.get("WalkingSpeed", 1.4))
+    _execute(networkPackage, model, console, transferDistance, maxTransfers, walkingSpeed)
 
-def _execute(networkPackage, inputModel, console):
+def _execute(networkPackage, inputModel, console, transferDistance=200.0, maxTransfers=10, walkingSpeed=1.4):
     """ 
     Main execute function to run the simulation 
     """
@@ -418,11 +499,11 @@ def _execute(networkPackage, inputModel, console):
     allVehicles = cacheAllOfTypeByExternalId("GKVehicle", model, catalog)
     roadTypes = cacheAllOfTypeByExternalId("GKRoadType", model, catalog)
     importTransit(networkZipFileObject, "transit.221", roadTypes, networkLayer, nodeConnections, catalog, model)
-    buildWalkingTransfers(catalog, geomodel, model)
+    buildWalkingTransfers(catalog, model, transferDistance, maxTransfers, walkingSpeed)
     transitEndTime = time.perf_counter()
     print(f"Time to import transit: {transitEndTime-transitStartTime}")
     centroidConfig = catalog.findObjectByExternalId("baseCentroidConfig", model.getType("GKCentroidConfiguration"))
-    createTransitCentroidConnections(centroidConfig, nodeConnections, model, catalog, geomodel)
+    createTransitCentroidConnections(centroidConfig, model, catalog)
     overallEndTime = time.perf_counter()
     print(f"Overall runtime: {overallEndTime-overallStartTime}")
     return console
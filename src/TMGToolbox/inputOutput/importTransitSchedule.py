@@ -23,120 +23,144 @@ import datetime
 from PyANGBasic import *
 from PyANGKernel import *
 from PyANGConsole import *
-import csv
-from common.common import extract_network_packagefile, getTransitNodesStopsAndLinesFromNWP, loadModel
-
-
-def readServiceTables(fileLocation, header=True):
-    """Read and parse the ServiceTableCV csv file
-    input: the servicetable csv file
-    output: servicetables list
-    """
-    serviceTables = []
-    transitLine = None
-    departures = []
-    arrivals = []
-    with open(fileLocation) as csvfile:
-        reader = csv.reader(csvfile)
-        if header is True:
-            next(reader)
-        for line in reader:
-            # Check that the line has reuqired number of values
-            if len(line) >= 3:
-                # if there is a change in the transit line being read add to the output
-                if transitLine != None and line[0] != transitLine:
-                    serviceTables.append((transitLine, departures, arrivals))
-                    transitLine = None
-                    departures = []
-                    arrivals = []
-                # Read the current line in
-                transitLine = line[0]
-                departures.append(line[1])
-                arrivals.append(line[2])
-    # add in the last line
-    if transitLine != None:
-        serviceTables.append((transitLine, departures, arrivals))
-    return serviceTables
-
-def buildTransitVehDict(networkZipFileObject, model):
-    transitVehDict = dict()
-    vehType = model.getType("GKVehicle")
-    node, stops, lines = getTransitNodesStopsAndLinesFromNWP(networkZipFileObject)
-    for i in range(len(lines)):
-        lineId = lines[i][0]
-        lineVehicle = model.getCatalog().findObjectByExternalId(f"transitVeh_{lines[i][2]}", vehType)
-        transitVehDict[lineId] = lineVehicle
-    return transitVehDict
+import numpy as np
+from common.common import extract_network_packagefile, getTransitNodesStopsAndLinesFromNWP, loadModel, cacheAllOfTypeByExternalId, getOrCreateColumn, TRANSIT_VEHICLE_COLUMN, SERVICE_FINGERPRINT_COLUMN
+from common.serviceTable import readServiceTables, clampToDay, secondsToTime, findHeadwayRuns, fingerprintService
 
 
-def findTransitVehicle(transitLine, transitVehDict):
+def buildLineIndex(model, catalog):
     """
-    Function uses the dummy link at the start of the transit line to find the transit vehicle
+    Function to index the transit lines in the model by external id in one catalog pass.
+    Each entry is the line and the transit vehicle stored in the line's attribute.
     """
-    lineId = transitLine.getExternalId()
-    transitVehicle = transitVehDict[lineId]
-    return transitVehicle
+    lineIndex = dict()
+    vehicles = cacheAllOfTypeByExternalId("GKVehicle", model, catalog)
+    vehicleColumn = model.getType("GKPublicLine").getColumn(TRANSIT_VEHICLE_COLUMN, GKType.eSearchOnlyThisType)
+    lines = catalog.getObjectsByType(model.getType("GKPublicLine"))
+    for transitLine in iter(lines.values()):
+        transitVehicle = None
+        if vehicleColumn is not None:
+            transitVehicle = vehicles.get(transitLine.getDataValueString(vehicleColumn))
+        lineIndex[transitLine.getExternalId()] = (transitLine, transitVehicle)
+    return lineIndex
 
-def addServiceToLine(model, lineId, departures, arrivals, transitVehDict, vehicle=None):
-    sectionType = model.getType("GKPublicLine")
-    transitLine = model.getCatalog().findObjectByExternalId(lineId, sectionType)
-    if transitLine is None:
-        print(f"Could not find line {lineId}")
-        return None
-    timeTable = GKSystem.getSystem().newObject("GKPublicLineTimeTable", model)
-    schedule = timeTable.createNewSchedule()
-    startTime = departures[0].split(":")
-    hour = int(startTime[0])
-    minute = int(startTime[1])
-    second = int(startTime[2])
-    if hour>23:
-        hour = 23
-        minute = 59
-        second = 59
-    startTimeTime = datetime.time(hour,minute,second)
-    schedule.setTime(startTimeTime)
-    endTime = arrivals[-1].split(":")
-    hour = int(endTime[0])
-    minute = int(endTime[1])
-    second = int(endTime[2])
-    if hour>23:
-        hour = 23
-        minute = 59
-        second = 59
-    endTimeTime = datetime.time(hour,minute,second)
-    timeDelta = (datetime.datetime.combine(datetime.date.today(),endTimeTime)-datetime.datetime.combine(datetime.date.today(),startTimeTime)).total_seconds()
-    duration = GKTimeDuration(0,0,0)
-    duration = duration.addSecs(timeDelta)
-    schedule.setDuration(duration)
-    departureVeh = vehicle
-    if departureVeh is None:
-        departureVeh = findTransitVehicle(transitLine, transitVehDict)
-    for d in departures:
-        timeElements = d.split(":")
-        hour = int(timeElements[0])
-        minute = int(timeElements[1])
-        second = int(timeElements[2])
-        if hour>23:
-            hour = 23
-            minute = 59
-            second = 59
-        departureTime = datetime.time(hour,minute,second)
-        departure = GKPublicLineTimeTableScheduleDeparture()
-        departure.setDepartureTime(departureTime)
-        departure.setVehicle(departureVeh)
-        schedule.addDepartureTime(departure)
-    # add in dwell times
-    stops = transitLine.getStops()
+def addVehiclesFromNWP(networkZipFileObject, lineIndex, model, catalog):
+    """
+    Function to fill in the vehicles of lines that were imported without the
+    transit vehicle attribute from the transit file of the network package
+    """
+    vehicles = cacheAllOfTypeByExternalId("GKVehicle", model, catalog)
+    node, stops, lines = getTransitNodesStopsAndLinesFromNWP(networkZipFileObject)
+    for line in lines:
+        entry = lineIndex.get(line[0])
+        if entry is not None and entry[1] is None:
+            lineIndex[line[0]] = (entry[0], vehicles.get(f"transitVeh_{line[2]}"))
+
+def addStopTimes(schedule, stops):
+    """
+    Function to add the dwell times of the line's stops to a schedule
+    """
     for stop in stops:
         if stop is not None:
             stopTime = GKPublicLineTimeTableScheduleStopTime()
             # stop time determined based on pedestrians during simulation
             stopTime.pedestriansToGenerate = 0 # Aimsun will use HCM to determine time for on/off
             schedule.setStopTime(stop, 1, stopTime)
+
+def addFixedSchedule(timeTable, departures, startTime, endTime, departureVeh, stops):
+    """
+    Function to add a schedule with one departure object per trip
+    """
+    schedule = timeTable.createNewSchedule()
+    schedule.setTime(secondsToTime(startTime))
+    duration = GKTimeDuration(0,0,0)
+    duration = duration.addSecs(endTime - startTime)
+    schedule.setDuration(duration)
+    # split the departure times into hours, minutes and seconds in one pass
+    hours, remainder = np.divmod(departures, 3600)
+    minutes, seconds = np.divmod(remainder, 60)
+    for hour, minute, second in zip(hours.tolist(), minutes.tolist(), seconds.tolist()):
+        departure = GKPublicLineTimeTableScheduleDeparture()
+        departure.setDepartureTime(datetime.time(hour,minute,second))
+        departure.setVehicle(departureVeh)
+        schedule.addDepartureTime(departure)
+    addStopTimes(schedule, stops)
+    timeTable.addSchedule(schedule)
+
+def addFrequencySchedule(timeTable, startTime, headway, trips, departureVeh, stops):
+    """
+    Function to add a schedule where the trips depart at a constant headway
+    """
+    schedule = timeTable.createNewSchedule()
+    schedule.setTime(secondsToTime(startTime))
+    # the schedule ends just after the last trip departs
+    duration = GKTimeDuration(0,0,0)
+    duration = duration.addSecs((trips - 1) * headway + 1)
+    schedule.setDuration(duration)
+    schedule.setDepartureType(GKPublicLineTimeTableSchedule.eInterval)
+    schedule.setMean(GKTimeDuration(0,0,0).addSecs(headway))
+    schedule.setDeviation(GKTimeDuration(0,0,0))
+    schedule.setVehicle(departureVeh)
+    addStopTimes(schedule, stops)
     timeTable.addSchedule(schedule)
+
+def addServiceToLine(model, lineId, departures, arrivals, lineIndex, vehicle=None, headwayRuns=None, fingerprint=None, fingerprintColumn=None):
+    """
+    Function to add a timetable to the line. The departures and arrivals are in seconds after midnight.
+    headwayRuns are the segments from findHeadwayRuns, if given the runs at a constant headway
+    are added as frequency based schedules instead of one departure per trip.
+    The fingerprint of the service is stored on the timetable if given.
+    """
+    entry = lineIndex.get(lineId)
+    if entry is None:
+        print(f"Could not find line {lineId}")
+        return None
+    transitLine, lineVehicle = entry
+    departureVeh = vehicle
+    if departureVeh is None:
+        departureVeh = lineVehicle
+    if departureVeh is None:
+        print(f"The transit vehicle of line {lineId} is unknown, skipping the line. Provide the network package file to find it")
+        return None
+    # times past midnight are set to 23:59:59
+    departures = clampToDay(departures)
+    arrivals = clampToDay(arrivals)
+    stops = transitLine.getStops()
+    timeTable = GKSystem.getSystem().newObject("GKPublicLineTimeTable", model)
+    if headwayRuns is None:
+        addFixedSchedule(timeTable, departures, int(departures[0]), int(arrivals[-1]), departureVeh, stops)
+    else:
+        for k, (first, end, headway) in enumerate(headwayRuns):
+            startTime = int(departures[first])
+            if headway is not None:
+                addFrequencySchedule(timeTable, startTime, headway, end - first, departureVeh, stops)
+            else:
+                # end the schedule when the next one starts so the schedules do not overlap
+                if k + 1 < len(headwayRuns):
+                    endTime = int(departures[end])
+                else:
+                    endTime = int(arrivals[end - 1])
+                addFixedSchedule(timeTable, departures[first:end], startTime, max(endTime, startTime), departureVeh, stops)
+    if fingerprint is not None:
+        timeTable.setDataValue(fingerprintColumn, fingerprint)
     transitLine.addTimeTable(timeTable)
     return transitLine
 
+def isServiceUnchanged(transitLine, fingerprint, fingerprintColumn):
+    """
+    Function to check if the line has a single timetable built from the same service
+    """
+    timeTables = transitLine.getTimeTables()
+    return len(timeTables) == 1 and timeTables[0].getDataValueString(fingerprintColumn) == fingerprint
+
+def deleteTimeTables(model, transitLine):
+    """
+    Function to delete all of the timetables of a line
+    """
+    for timeTable in list(transitLine.getTimeTables()):
+        cmd = timeTable.getDelCmd()
+        model.getCommander().addCommand(cmd)
+
 def run_xtmf(parameters, model, console):
     """
     A general function called in all python modules called by bridge. Responsible
@@ -148,16 +172,80 @@ def _execute(model, console, parameters):
     """
     Main execute function to run the tool
     """
-    networkPackage = parameters["NetworkPackageFile"]
-    # ZipFile object of the network file do this once
-    networkZipFileObject = extract_network_packagefile(networkPackage)
-    
-    # get the transitfile
-    transitVehDict = buildTransitVehDict(networkZipFileObject, model)
+    catalog = model.getCatalog()
+    # index the lines and their transit vehicles
+    lineIndex = buildLineIndex(model, catalog)
+    # the network package is only needed for lines imported without the transit vehicle attribute
+    networkPackage = parameters.get("NetworkPackageFile")
+    if networkPackage:
+        # ZipFile object of the network file do this once
+        networkZipFileObject = extract_network_packagefile(networkPackage)
+        addVehiclesFromNWP(networkZipFileObject, lineIndex, model, catalog)
     
+    # frequency based schedules for the runs of departures at a constant headway
+    frequencyBased = bool(parameters.get("FrequencyBasedSchedules", False))
+    headwayTolerance = float(parameters.get("HeadwayTolerance", 30.0))
+    minimumTrips = int(parameters.get("MinimumFrequencyTrips", 4))
+    replacedDepartures = 0
+    frequencySchedules = 0
+    # in incremental mode lines whose service has not changed since the last import are skipped
+    incremental = bool(parameters.get("Incremental", False))
+    fingerprintColumn = getOrCreateColumn(model, "GKPublicLineTimeTable", SERVICE_FINGERPRINT_COLUMN, "Service Fingerprint", GKColumn.String)
+    skippedLines = 0
+    replacedLines = 0
+    addedLines = 0
+    missingLines = 0
+    unknownVehicleLines = 0
+
     serviceTables = readServiceTables(parameters["ServiceTableCSV"])
-    for serviceTable in serviceTables:
-        addServiceToLine(model, serviceTable[0], serviceTable[1], serviceTable[2], transitVehDict)
+    for lineId, departures, arrivals in serviceTables:
+        headwayRuns = None
+        if frequencyBased is True:
+            order = np.argsort(departures, kind="stable")
+            departures = departures[order]
+            arrivals = arrivals[order]
+            headwayRuns = findHeadwayRuns(clampToDay(departures), headwayTolerance, minimumTrips)
+        entry = lineIndex.get(lineId)
+        if entry is None:
+            print(f"Could not find line {lineId}")
+            missingLines += 1
+            continue
+        transitLine, lineVehicle = entry
+        if lineVehicle is None:
+            # keep the existing timetables of a line whose vehicle is unknown
+            print(f"The transit vehicle of line {lineId} is unknown, skipping the line. Provide the network package file to find it")
+            unknownVehicleLines += 1
+            continue
+        fingerprint = fingerprintService(departures, arrivals, lineVehicle.getExternalId(), frequencyBased,
+                                         headwayTolerance, minimumTrips)
+        hadTimeTables = len(transitLine.getTimeTables()) > 0
+        if incremental is True:
+            if isServiceUnchanged(transitLine, fingerprint, fingerprintColumn):
+                skippedLines += 1
+                continue
+            # replace the timetables of a new or changed line
+            deleteTimeTables(model, transitLine)
+        if addServiceToLine(model, lineId, departures, arrivals, lineIndex, headwayRuns=headwayRuns,
+                            fingerprint=fingerprint, fingerprintColumn=fingerprintColumn) is None:
+            continue
+        if incremental is True and hadTimeTables:
+            replacedLines += 1
+        else:
+            addedLines += 1
+        if headwayRuns is not None:
+            for first, end, headway in headwayRuns:
+                if headway is not None:
+                    replacedDepartures += end - first
+                    frequencySchedules += 1
+    if incremental is True:
+        print(f"Lines unchanged: {skippedLines}, replaced: {replacedLines}, added: {addedLines}")
+    if missingLines > 0:
+        print(f"Lines skipped because they are not in the model: {missingLines}")
+    if unknownVehicleLines > 0:
+        print(f"Lines skipped because their transit vehicle is unknown: {unknownVehicleLines}")
+    if frequencyBased is True:
+        print(f"Frequency based schedules: {frequencySchedules}, replacing {replacedDepartures} departures, "
+              f"objects saved: {replacedDepartures - frequencySchedules}")
     return console
 
 def saveNetwork(console, model, outputNetworkFile):
@@ -187,7 +275,7 @@ def runFromConsole(inputArgs):
     outputNetworkFile = inputArgs[4]
     #create a dictionary of additional argument parameters from the command line
     parameters = {
-                    "TransitFile":inputArgs[3],
+                    "NetworkPackageFile":inputArgs[3],
                     "ServiceTableCSV": inputArgs[2]
                  }
     # generate a model of the input network
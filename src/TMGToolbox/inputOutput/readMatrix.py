@@ -0,0 +1,44 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from PyANGBasic import *
+from PyANGKernel import *
+from PyANGConsole import *
+import numpy as np
+from common.centroidIndex import getCentroidIndex
+from common.matrixIO import matrixZoneLabels, readMatrixArray
+
+def run_xtmf(parameters, model, console):
+    """
+    A general function called in all python modules called by bridge. Responsible
+    for extracting data and running appropriate functions.
+    """
+    zones, cells = read_matrix(model, str(parameters["MatrixName"]))
+    print(f"The matrix '{parameters['MatrixName']}' has {len(zones)} zones and a total of {cells.sum()}")
+
+def read_matrix(model, matrixName):
+    """
+    Function to read the cells of a GKODMatrix into a float32 array in centroid order along
+    with the zone of each centroid. Called by the bridge to send a matrix to XTMF.
+    """
+    matrix = model.getCatalog().findByName(matrixName, model.getType("GKODMatrix"))
+    if matrix is None:
+        raise Exception(f"The specified matrix '{matrixName}' does not exist")
+    centroidIndex = getCentroidIndex(matrix.getCentroidConfiguration())
+    return matrixZoneLabels(centroidIndex), readMatrixArray(matrix, centroidIndex.centroids, np.float32)
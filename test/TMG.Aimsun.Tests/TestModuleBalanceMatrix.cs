@@ -0,0 +1,82 @@
+﻿/*
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+using Microsoft.VisualStudio.TestTools.UnitTesting;
+using System.Globalization;
+using System.IO;
+using System.Text;
+
+namespace TMG.Aimsun.Tests
+{
+    [TestClass]
+    public class TestModuleBalanceMatrix
+    {
+        [TestInitialize]
+        public void LoadTestMatrix()
+        {
+            Utility.LoadTestMatrix();
+        }
+
+        [TestMethod]
+        public void TestBalanceMatrixToDoubledTargets()
+        {
+            var source = Helper.Modeller.ReadMatrix(null, "testOD", out var zones);
+            int count = zones.Length;
+            var originTargets = new double[count];
+            var destinationTargets = new double[count];
+            for (int i = 0; i < count; i++)
+            {
+                for (int j = 0; j < count; j++)
+                {
+                    originTargets[i] += 2.0 * source[i * count + j];
+                    destinationTargets[j] += 2.0 * source[i * count + j];
+                }
+            }
+            var targets = new StringBuilder("zone,origin,destination\n");
+            for (int i = 0; i < count; i++)
+            {
+                targets.Append(zones[i]).Append(',')
+                       .Append(originTargets[i].ToString("R", CultureInfo.InvariantCulture)).Append(',')
+                       .Append(destinationTargets[i].ToString("R", CultureInfo.InvariantCulture)).Append('\n');
+            }
+            string targetFile = Helper.BuildFilePath("aimsunFiles\\results\\balanceTargets.csv");
+            Directory.CreateDirectory(Path.GetDirectoryName(targetFile));
+            File.WriteAllText(targetFile, targets.ToString());
+
+            Utility.RunBalanceMatrixTool("testOD", targetFile, true, "balancedOD", "baseCentroidConfig",
+                                         "Car Class ", "06:00:00:000", "03:00:00:000");
+            var result = Helper.Modeller.ReadMatrix(null, "balancedOD", out var balancedZones);
+            var rowTotals = new double[count];
+            var columnTotals = new double[count];
+            for (int i = 0; i < count; i++)
+            {
+                for (int j = 0; j < count; j++)
+                {
+                    rowTotals[i] += result[i * count + j];
+                    columnTotals[j] += result[i * count + j];
+                }
+            }
+            for (int i = 0; i < count; i++)
+            {
+                Assert.AreEqual(originTargets[i], rowTotals[i], 1e-2 * System.Math.Max(1.0, originTargets[i]));
+                Assert.AreEqual(destinationTargets[i], columnTotals[i], 1e-2 * System.Math.Max(1.0, destinationTargets[i]));
+            }
+        }
+    }
+}
@@ -0,0 +1,72 @@
+﻿/*
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+using Microsoft.VisualStudio.TestTools.UnitTesting;
+using XTMF;
+
+namespace TMG.Aimsun.Tests
+{
+    [TestClass]
+    public class TestModuleCalculateMatrix
+    {
+        [TestInitialize]
+        public void LoadTestMatrix()
+        {
+            Utility.LoadTestMatrix();
+        }
+
+        [TestMethod]
+        public void TestCalculateMatrix()
+        {
+            var source = Helper.Modeller.ReadMatrix(null, "testOD", out var sourceZones);
+            Utility.RunCalculateMatrixTool("testOD * 2 + 1", "calculatedOD", "baseCentroidConfig",
+                                           "Car Class ", "06:00:00:000", "03:00:00:000");
+            var result = Helper.Modeller.ReadMatrix(null, "calculatedOD", out var zones);
+            Assert.AreEqual(source.Length, result.Length);
+            for (int i = 0; i < source.Length; i++)
+            {
+                Assert.AreEqual(source[i] * 2 + 1, result[i], 1e-3);
+            }
+        }
+
+        [TestMethod]
+        public void TestCalculateMatrixWithQuotedName()
+        {
+            var source = Helper.Modeller.ReadMatrix(null, "testOD", out var sourceZones);
+            Utility.RunCalculateMatrixTool("matrix(\"testOD\") * intrazonal", "intrazonalOD", "baseCentroidConfig",
+                                           "Car Class ", "06:00:00:000", "03:00:00:000");
+            var result = Helper.Modeller.ReadMatrix(null, "intrazonalOD", out var zones);
+            for (int i = 0; i < zones.Length; i++)
+            {
+                for (int j = 0; j < zones.Length; j++)
+                {
+                    Assert.AreEqual(i == j ? source[i * zones.Length + j] : 0.0f, result[i * zones.Length + j], 1e-3);
+                }
+            }
+        }
+
+        [TestMethod]
+        public void TestCalculateMatrixMissingOperand()
+        {
+            Assert.ThrowsException<XTMFRuntimeException>(() =>
+                Utility.RunCalculateMatrixTool("missingOD + testOD", "calculatedOD", "baseCentroidConfig",
+                                               "Car Class ", "06:00:00:000", "03:00:00:000"));
+        }
+    }
+}
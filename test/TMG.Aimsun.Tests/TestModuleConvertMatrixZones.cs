@@ -0,0 +1,61 @@
+﻿/*
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+using Microsoft.VisualStudio.TestTools.UnitTesting;
+using System.IO;
+
+namespace TMG.Aimsun.Tests
+{
+    [TestClass]
+    public class TestModuleConvertMatrixZones
+    {
+        [TestInitialize]
+        public void LoadTestMatrix()
+        {
+            Utility.LoadTestMatrix();
+        }
+
+        [TestMethod]
+        public void TestConvertMatrixZonesWithIdentity()
+        {
+            var source = Helper.Modeller.ReadMatrix(null, "testOD", out var zones);
+
+            // every zone corresponds to itself so the converted matrix keeps every cell
+            string correspondenceFile = Helper.BuildFilePath("aimsunFiles\\results\\identityCorrespondence.csv");
+            Directory.CreateDirectory(Path.GetDirectoryName(correspondenceFile));
+            var lines = new string[zones.Length + 1];
+            lines[0] = "from,to";
+            for (int i = 0; i < zones.Length; i++)
+            {
+                lines[i + 1] = zones[i] + "," + zones[i];
+            }
+            File.WriteAllLines(correspondenceFile, lines);
+
+            Utility.RunConvertMatrixZonesTool("testOD", correspondenceFile, true, "convertedOD", "baseCentroidConfig",
+                                              "Car Class ", "06:00:00:000", "03:00:00:000");
+            var result = Helper.Modeller.ReadMatrix(null, "convertedOD", out var convertedZones);
+            CollectionAssert.AreEqual(zones, convertedZones);
+            Assert.AreEqual(source.Length, result.Length);
+            for (int i = 0; i < source.Length; i++)
+            {
+                Assert.AreEqual(source[i], result[i], 1e-3);
+            }
+        }
+    }
+}
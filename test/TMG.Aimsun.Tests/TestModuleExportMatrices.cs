@@ -0,0 +1,149 @@
+﻿/*
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+using Microsoft.VisualStudio.TestTools.UnitTesting;
+using System.IO;
+using System.IO.Compression;
+using System.Text;
+using System.Text.RegularExpressions;
+using XTMF;
+
+namespace TMG.Aimsun.Tests
+{
+    [TestClass]
+    public class TestModuleExportMatrices
+    {
+        [TestInitialize]
+        public void LoadTestMatrices()
+        {
+            Utility.LoadTestMatrix();
+            Utility.RunImportMatrixFromCSVThirdNormalizedTool(Helper.BuildFilePath("inputFiles\\frabitztownOd.csv"),
+                                                              true, true, "transitOD", "baseCentroidConfig",
+                                                              "Transit Users", "06:00:00:000", "03:00:00:000");
+            Directory.CreateDirectory(Helper.BuildFilePath("aimsunFiles\\results"));
+        }
+
+        /// <summary>
+        /// Read a little endian float32 array from a .npy stream
+        /// </summary>
+        private static float[] ReadNpy(Stream stream, out int rows, out int columns)
+        {
+            using (var reader = new BinaryReader(stream))
+            {
+                var magic = reader.ReadBytes(6);
+                Assert.AreEqual(0x93, magic[0]);
+                Assert.AreEqual("NUMPY", Encoding.ASCII.GetString(magic, 1, 5));
+                var majorVersion = reader.ReadByte();
+                reader.ReadByte();
+                int headerLength = majorVersion == 1 ? reader.ReadUInt16() : (int)reader.ReadUInt32();
+                var header = Encoding.ASCII.GetString(reader.ReadBytes(headerLength));
+                StringAssert.Contains(header, "'descr': '<f4'");
+                StringAssert.Contains(header, "'fortran_order': False");
+                var shape = Regex.Match(header, @"'shape': \((\d+), (\d+)\)");
+                Assert.IsTrue(shape.Success);
+                rows = int.Parse(shape.Groups[1].Value);
+                columns = int.Parse(shape.Groups[2].Value);
+                var cells = new float[rows * columns];
+                for (int i = 0; i < cells.Length; i++)
+                {
+                    cells[i] = reader.ReadSingle();
+                }
+                return cells;
+            }
+        }
+
+        /// <summary>
+        /// Check the cells and zone sidecar of an exported .npy array against the matrix in the model
+        /// </summary>
+        private static void AssertNpyMatches(Stream stream, string matrixName)
+        {
+            var expected = Helper.Modeller.ReadMatrix(null, matrixName, out var zones);
+            var cells = ReadNpy(stream, out var rows, out var columns);
+            Assert.AreEqual(zones.Length, rows);
+            Assert.AreEqual(zones.Length, columns);
+            CollectionAssert.AreEqual(expected, cells);
+        }
+
+        [TestMethod]
+        public void TestExportMatricesToCSV()
+        {
+            string[] matrixNames = new string[] { "testOD", "transitOD" };
+            string[] filePaths = new string[]
+            {
+                Helper.BuildFilePath("aimsunFiles\\results\\exportTestOD.csv"),
+                Helper.BuildFilePath("aimsunFiles\\results\\exportTransitOD.csv")
+            };
+            Utility.RunExportMatricesTool("csv", matrixNames, filePaths);
+            for (int i = 0; i < matrixNames.Length; i++)
+            {
+                var expected = Helper.Modeller.ReadMatrix(null, matrixNames[i], out var zones);
+                var cells = Utility.ReadThirdNormalizedCSV(filePaths[i], zones);
+                for (int j = 0; j < expected.Length; j++)
+                {
+                    Assert.AreEqual(expected[j], cells[j], 1e-4 * System.Math.Max(1.0, System.Math.Abs(expected[j])));
+                }
+            }
+        }
+
+        [TestMethod]
+        public void TestExportMatricesToNpy()
+        {
+            string filePath = Helper.BuildFilePath("aimsunFiles\\results\\exportTestOD.npy");
+            Utility.RunExportMatricesTool("npy", new string[] { "testOD" }, new string[] { filePath });
+            using (var stream = File.OpenRead(filePath))
+            {
+                AssertNpyMatches(stream, "testOD");
+            }
+            Helper.Modeller.ReadMatrix(null, "testOD", out var zones);
+            CollectionAssert.AreEqual(zones, File.ReadAllLines(Helper.BuildFilePath("aimsunFiles\\results\\exportTestOD_zones.csv")));
+        }
+
+        [TestMethod]
+        public void TestExportMatricesToOneArchive()
+        {
+            string filePath = Helper.BuildFilePath("aimsunFiles\\results\\exportMatrices.npz");
+            Utility.RunExportMatricesTool("npz", new string[] { "testOD", "transitOD" }, new string[] { filePath, filePath });
+            using (var archive = new ZipArchive(File.OpenRead(filePath), ZipArchiveMode.Read))
+            {
+                Assert.AreEqual(2, archive.Entries.Count);
+                foreach (var matrixName in new string[] { "testOD", "transitOD" })
+                {
+                    var entry = archive.GetEntry(matrixName + ".npy");
+                    Assert.IsNotNull(entry);
+                    using (var stream = entry.Open())
+                    {
+                        AssertNpyMatches(stream, matrixName);
+                    }
+                }
+            }
+            // the matrices of the archive share one zone sidecar
+            Helper.Modeller.ReadMatrix(null, "testOD", out var zones);
+            CollectionAssert.AreEqual(zones, File.ReadAllLines(Helper.BuildFilePath("aimsunFiles\\results\\exportMatrices_zones.csv")));
+        }
+
+        [TestMethod]
+        public void TestExportMatricesToTheSameCSV()
+        {
+            // only npz archives can hold several matrices
+            string filePath = Helper.BuildFilePath("aimsunFiles\\results\\exportShared.csv");
+            Assert.ThrowsException<XTMFRuntimeException>(() =>
+                Utility.RunExportMatricesTool("csv", new string[] { "testOD", "transitOD" }, new string[] { filePath, filePath }));
+        }
+    }
+}
@@ -0,0 +1,87 @@
+﻿/*
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+using Microsoft.VisualStudio.TestTools.UnitTesting;
+using System.IO;
+
+namespace TMG.Aimsun.Tests
+{
+    [TestClass]
+    public class TestModuleImportMatrixFromBinary
+    {
+        /// <summary>
+        /// Write cells as a raw float32 file along with the zone file of its rows and columns
+        /// </summary>
+        private static void WriteRawMatrix(float[] data, string[] zones, string matrixFile, string zoneFile)
+        {
+            Directory.CreateDirectory(Path.GetDirectoryName(matrixFile));
+            using (var writer = new BinaryWriter(File.Create(matrixFile)))
+            {
+                foreach (var value in data)
+                {
+                    writer.Write(value);
+                }
+            }
+            File.WriteAllText(zoneFile, string.Join(",", zones));
+        }
+
+        [TestInitialize]
+        public void LoadTestMatrix()
+        {
+            Utility.LoadTestMatrix();
+        }
+
+        [TestMethod]
+        public void TestImportMatrixFromRawBinary()
+        {
+            string matrixFile = Helper.BuildFilePath("aimsunFiles\\results\\testOD.bin");
+            string zoneFile = Helper.BuildFilePath("aimsunFiles\\results\\testOD_zones.csv");
+            var expected = Helper.Modeller.ReadMatrix(null, "testOD", out var testZones);
+            WriteRawMatrix(expected, testZones, matrixFile, zoneFile);
+
+            Utility.RunImportMatrixFromBinaryTool(matrixFile, zoneFile, "float32", "binaryOD", "baseCentroidConfig",
+                                                  "Car Class ", "06:00:00:000", "03:00:00:000");
+            CollectionAssert.AreEqual(expected, Helper.Modeller.ReadMatrix(null, "binaryOD", out var zones));
+        }
+
+        [TestMethod]
+        public void TestReimportBinaryMatrix()
+        {
+            string matrixFile = Helper.BuildFilePath("aimsunFiles\\results\\testOD.bin");
+            string zoneFile = Helper.BuildFilePath("aimsunFiles\\results\\testOD_zones.csv");
+            var expected = Helper.Modeller.ReadMatrix(null, "testOD", out var testZones);
+            WriteRawMatrix(expected, testZones, matrixFile, zoneFile);
+
+            // the second import finds the same fingerprint and keeps the cells of the first
+            Utility.RunImportMatrixFromBinaryTool(matrixFile, zoneFile, "float32", "binaryOD", "baseCentroidConfig",
+                                                  "Car Class ", "06:00:00:000", "03:00:00:000");
+            Utility.RunImportMatrixFromBinaryTool(matrixFile, zoneFile, "float32", "binaryOD", "baseCentroidConfig",
+                                                  "Transit Users", "06:00:00:000", "03:00:00:000");
+            CollectionAssert.AreEqual(expected, Helper.Modeller.ReadMatrix(null, "binaryOD", out var zones));
+
+            // a changed file no longer matches the fingerprint and is written again
+            expected[0] += 1.0f;
+            expected[expected.Length - 1] = 0.0f;
+            WriteRawMatrix(expected, testZones, matrixFile, zoneFile);
+            Utility.RunImportMatrixFromBinaryTool(matrixFile, zoneFile, "float32", "binaryOD", "baseCentroidConfig",
+                                                  "Car Class ", "06:00:00:000", "03:00:00:000");
+            CollectionAssert.AreEqual(expected, Helper.Modeller.ReadMatrix(null, "binaryOD", out zones));
+        }
+    }
+}
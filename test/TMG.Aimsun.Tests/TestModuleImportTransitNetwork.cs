@@ -51,5 +51,19 @@ namespace TMG.Aimsun.Tests
             //build an output file location of where to save the file
             Helper.Modeller.SaveNetworkModel(null, Helper.BuildFilePath("aimsunFiles\\Transit2.ang"));
         }
+
+        [TestMethod]
+        public void TestReimportTransitNetwork()
+        {
+            //change the network
+            string newNetwork = Helper.BuildFilePath("aimsunFiles\\FrabitztownNetwork.ang");
+            Helper.Modeller.SwitchModel(null, newNetwork);
+
+            // the second import reuses the stops, dummy links and turns left by the first one
+            string networkPath = Helper.BuildFilePath("inputFiles\\Frabitztown.nwp");
+            string modulePath = Helper.BuildModulePath("inputOutput\\importTransitNetwork.py");
+            Utility.RunImportNetworkTool(networkPath, modulePath);
+            Utility.RunImportNetworkTool(networkPath, modulePath);
+        }
     }
 }
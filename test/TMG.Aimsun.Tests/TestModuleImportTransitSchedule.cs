@@ -19,6 +19,10 @@
 
 using Microsoft.VisualStudio.TestTools.UnitTesting;
 using Newtonsoft.Json;
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Linq;
 
 namespace TMG.Aimsun.Tests
 {
@@ -51,5 +55,29 @@ namespace TMG.Aimsun.Tests
             string outputPath = Helper.BuildFilePath("aimsunFiles\\test3\\FrabitztownNetworkWithTransitSchedule.ang");
             Helper.Modeller.SaveNetworkModel(null, outputPath);
         }
+
+        [TestMethod]
+        public void TestImportTransitScheduleFrequencyBased()
+        {
+            //change the network
+            string newNetwork = Helper.BuildFilePath("aimsunFiles\\FrabitztownNetworkWithPedestrians.ang");
+            Helper.Modeller.SwitchModel(null, newNetwork);
+
+            // give the first line of the service table a run of trips every ten minutes followed by two irregular trips
+            string lineId = File.ReadLines(Helper.BuildFilePath("inputFiles\\frab_service_table.csv")).Skip(1).First().Split(',')[0];
+            string serviceTable = Helper.BuildFilePath("aimsunFiles\\results\\frequencyServiceTable.csv");
+            Directory.CreateDirectory(Path.GetDirectoryName(serviceTable));
+            var lines = new List<string> { "line,departure,arrival" };
+            foreach (var departure in new[] { "06:00:00", "06:10:00", "06:20:05", "06:29:55", "06:40:00", "06:55:00", "07:20:00" })
+            {
+                var arrival = TimeSpan.Parse(departure).Add(TimeSpan.FromMinutes(20));
+                lines.Add(lineId + "," + departure + "," + arrival.ToString("hh\\:mm\\:ss"));
+            }
+            File.WriteAllLines(serviceTable, lines);
+
+            string networkPath = Helper.BuildFilePath("inputFiles\\Frabitztown.nwp");
+            Utility.RunImportTransitScheduleTool(networkPath, serviceTable, 30.0f, 4);
+            Utility.RunImportTransitScheduleTool(networkPath, Helper.BuildFilePath("inputFiles\\frab_service_table.csv"), 30.0f, 4);
+        }
     }
 }
@@ -76,6 +76,32 @@ namespace TMG.Aimsun.Tests
             Helper.Modeller.SaveNetworkModel(null, Helper.BuildFilePath("aimsunFiles\\xxx.ang"));
         }
 
+        [TestMethod]
+        public void RunRoadAssignmentWarmStart()
+        {
+            //change the network
+            string newNetwork = Path.Combine(Helper.TestConfiguration.NetworkFolder, "aimsunFiles\\PipelineTest2.ang");
+            Helper.Modeller.SwitchModel(null, newNetwork);
+            List<MatrixName> matrixParameters = new List<MatrixName>()
+            {
+                new MatrixName() { VehicleType="Car Class ", ACostName="WS - Car Class ACost", AIVTT="WS - Car Class Distance AIVTT", AToll="WS - Car Class Toll"}
+            };
+            // the first run has no previous path assignment and starts from all or nothing
+            Utility.RunAssignmentTool("assignment\\roadAssignment.py", "WSRoadScenario", "WSExperiment", "CarAndTransitDemand", "PublicTransitTest1", matrixParameters, true);
+            var coldCost = Helper.Modeller.ReadMatrix(null, "WS - Car Class ACost", out var coldZones);
+            // the second run starts from the path assignment of the first and replaces it
+            Utility.RunAssignmentTool("assignment\\roadAssignment.py", "WSRoadScenario", "WSExperiment", "CarAndTransitDemand", "PublicTransitTest1", matrixParameters, true);
+            var warmCost = Helper.Modeller.ReadMatrix(null, "WS - Car Class ACost", out var warmZones);
+            CollectionAssert.AreEqual(coldZones, warmZones);
+            Assert.AreEqual(coldCost.Length, warmCost.Length);
+            // the same demand converges to the same costs from either start
+            for (int i = 0; i < coldCost.Length; i++)
+            {
+                Assert.AreEqual(coldCost[i], warmCost[i], 1e-2 * System.Math.Max(1.0, System.Math.Abs(coldCost[i])));
+            }
+            Helper.Modeller.SaveNetworkModel(null, Helper.BuildFilePath("aimsunFiles\\WarmStart.ang"));
+        }
+
         [TestMethod]
         public void TestToolPipeline()
         {
@@ -0,0 +1,67 @@
+﻿/*
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+*/
+
+using Microsoft.VisualStudio.TestTools.UnitTesting;
+using XTMF;
+
+namespace TMG.Aimsun.Tests
+{
+    [TestClass]
+    public class TestModuleReadMatrix
+    {
+        [TestInitialize]
+        public void LoadTestMatrix()
+        {
+            Utility.LoadTestMatrix();
+        }
+
+        [TestMethod]
+        public void TestReadImportedMatrix()
+        {
+            var data = Helper.Modeller.ReadMatrix(null, "testOD", out var zones);
+            Assert.IsTrue(zones.Length > 0);
+            Assert.AreEqual(zones.Length * zones.Length, data.Length);
+            // the zones follow the centroid_<zone> external ids of the imported network
+            foreach (var zone in zones)
+            {
+                Assert.IsTrue(int.TryParse(zone, out var zoneNumber));
+            }
+        }
+
+        [TestMethod]
+        public void TestReadMatrixMatchesTheImportedFile()
+        {
+            var data = Helper.Modeller.ReadMatrix(null, "testOD", out var zones);
+            var expected = Utility.ReadThirdNormalizedCSV(Helper.BuildFilePath("inputFiles\\frabitztownOd.csv"), zones);
+            for (int i = 0; i < expected.Length; i++)
+            {
+                Assert.AreEqual(expected[i], data[i], 1e-4 * System.Math.Max(1.0, System.Math.Abs(expected[i])));
+            }
+        }
+
+        [TestMethod]
+        public void TestReadMissingMatrix()
+        {
+            // the error is reported before any cells are sent so the bridge stays usable
+            Assert.ThrowsException<XTMFRuntimeException>(() => Helper.Modeller.ReadMatrix(null, "missingOD", out var zones));
+            var data = Helper.Modeller.ReadMatrix(null, "testOD", out var readZones);
+            Assert.AreEqual(readZones.Length * readZones.Length, data.Length);
+        }
+    }
+}
@@ -19,6 +19,7 @@
 
 using Newtonsoft.Json;
 using System.Collections.Generic;
+using System.Globalization;
 using System.IO;
 
 namespace TMG.Aimsun.Tests
@@ -68,6 +69,27 @@ namespace TMG.Aimsun.Tests
             Helper.Modeller.Run(null, modulePath, jsonParameters);
         }
 
+        /// <summary>
+        /// Run the ImportTransitScheduleTool adding the runs of departures at a constant headway as frequency based schedules
+        /// </summary>
+        /// <param name="nwpFile">Path to network nwp package file as a string</param>
+        /// <param name="serviceTablePath">Path to csv serviceTable csv file as a string</param>
+        /// <param name="headwayTolerance">The largest difference in seconds between the headways of a run</param>
+        /// <param name="minimumTrips">The fewest departures in a run added as a frequency based schedule</param>
+        public static void RunImportTransitScheduleTool(string nwpFile, string serviceTablePath, float headwayTolerance, int minimumTrips)
+        {
+            string modulePath = Helper.BuildModulePath("inputOutput\\importTransitSchedule.py");
+            string jsonParameters = JsonConvert.SerializeObject(new
+            {
+                NetworkPackageFile = nwpFile,
+                ServiceTableCSV = serviceTablePath,
+                FrequencyBasedSchedules = true,
+                HeadwayTolerance = headwayTolerance,
+                MinimumFrequencyTrips = minimumTrips
+            });
+            Helper.Modeller.Run(null, modulePath, jsonParameters);
+        }
+
         /// <summary>
         /// Method to run the ImportMatrixThirdCSVNormalized tool which imports the OD (Origin-Destination) matrices 
         /// </summary>
@@ -98,6 +120,50 @@ namespace TMG.Aimsun.Tests
             Helper.Modeller.Run(null, modulePath, jsonParameters);
         }
 
+        /// <summary>
+        /// Switch to the transch test network and import frabitztownOd.csv into the testOD matrix,
+        /// the starting point of the matrix tool tests
+        /// </summary>
+        public static void LoadTestMatrix()
+        {
+            Helper.Modeller.SwitchModel(null, Helper.BuildFilePath("aimsunFiles\\transch.ang"));
+            RunImportMatrixFromCSVThirdNormalizedTool(Helper.BuildFilePath("inputFiles\\frabitztownOd.csv"),
+                                                      true, true, "testOD", "baseCentroidConfig",
+                                                      "Car Class ", "06:00:00:000", "03:00:00:000");
+        }
+
+        /// <summary>
+        /// Read an origin,destination,value csv file into a row major array in the order of zones,
+        /// summing repeated cells and skipping the zones that are not in zones
+        /// </summary>
+        /// <param name="filePath">path to the third normalized csv file</param>
+        /// <param name="zones">the zone of each row and column of the array</param>
+        /// <param name="includeHeader">boolean value if the file has a header</param>
+        public static double[] ReadThirdNormalizedCSV(string filePath, string[] zones, bool includeHeader = true)
+        {
+            var zoneIndex = new Dictionary<string, int>();
+            for (int i = 0; i < zones.Length; i++)
+            {
+                zoneIndex[zones[i]] = i;
+            }
+            var cells = new double[zones.Length * zones.Length];
+            bool skip = includeHeader;
+            foreach (var line in File.ReadLines(filePath))
+            {
+                if (skip || string.IsNullOrWhiteSpace(line))
+                {
+                    skip = false;
+                    continue;
+                }
+                var parts = line.Split(',');
+                if (zoneIndex.TryGetValue(parts[0].Trim(), out var origin) && zoneIndex.TryGetValue(parts[1].Trim(), out var destination))
+                {
+                    cells[origin * zones.Length + destination] += double.Parse(parts[2], CultureInfo.InvariantCulture);
+                }
+            }
+            return cells;
+        }
+
         /// <summary>
         /// Method to run the Road Assignment tool and generate the roads in the model
         /// </summary>
@@ -105,9 +171,10 @@ namespace TMG.Aimsun.Tests
         /// <param name="nameOfTrafficDemand">string name of the traffic demand name</param>
         /// <param name="nameOfPublicTransitPlan">string name of the public transit plan</param>
         /// <param name="matrixNames">List of matrix names to change for various skim matrices</param>
+        /// <param name="warmStart">Start from the path assignment of the previous warm started run of the scenario</param>
         public static void RunAssignmentTool(string toolPath, string ScenarioName, string ExperimentName,
             string nameOfTrafficDemand, string nameOfPublicTransitPlan, 
-            List<TMG.Aimsun.Tests.MatrixName> matrixNames)
+            List<TMG.Aimsun.Tests.MatrixName> matrixNames, bool warmStart = false)
         {
             string modulePath = Path.Combine(Helper.TestConfiguration.ModulePath, toolPath);
             string jsonParameters = JsonConvert.SerializeObject(new
@@ -116,6 +183,7 @@ namespace TMG.Aimsun.Tests
                 experimentName = ExperimentName,
                 nameOfTrafficDemand = nameOfTrafficDemand,
                 nameOfPublicTransitPlan = nameOfPublicTransitPlan,
+                warmStart = warmStart,
                 matrixName = matrixNames
             });
             Helper.Modeller.Run(null, modulePath, jsonParameters);
@@ -166,5 +234,144 @@ namespace TMG.Aimsun.Tests
             });
             Helper.Modeller.Run(null, modulePath, jsonParameters);
         }
+
+        /// <summary>
+        /// Method to run the ImportMatrixFromBinary tool which imports an OD matrix from a .npy or raw binary file
+        /// </summary>
+        /// <param name="matrixFile">path to the .npy or raw binary matrix file as a string</param>
+        /// <param name="zoneFile">path to the file of the zone of each row and column as a string</param>
+        /// <param name="dataType">float32 or float64, the type of the cells of a raw binary file</param>
+        /// <param name="matrixID">string name of the matrix to be used as an ID</param>
+        /// <param name="centroidconfig">string name of the centroid configuration to be used as an ID</param>
+        /// <param name="vehicleType">string type of vehicle to use eg car, bus, etc....</param>
+        /// <param name="initialTime">string of initial time in minutes</param>
+        /// <param name="durationTime">string of duration in minutes</param>
+        public static void RunImportMatrixFromBinaryTool(string matrixFile, string zoneFile, string dataType,
+                                                         string matrixID, string centroidconfig, string vehicleType,
+                                                         string initialTime, string durationTime)
+        {
+            string modulePath = Helper.BuildModulePath("inputOutput\\importMatrixFromBinary.py");
+            string jsonParameters = JsonConvert.SerializeObject(new
+            {
+                MatrixFile = matrixFile,
+                ZoneFile = zoneFile,
+                DataType = dataType,
+                MatrixID = matrixID,
+                CentroidConfiguration = centroidconfig,
+                VehicleType = vehicleType,
+                InitialTime = initialTime,
+                DurationTime = durationTime
+            });
+            Helper.Modeller.Run(null, modulePath, jsonParameters);
+        }
+
+        /// <summary>
+        /// Method to run the ExportMatrices tool which exports several matrices in one pass
+        /// </summary>
+        /// <param name="format">the export format, one of csv, square, bin, npy, ascii or npz</param>
+        /// <param name="matrixNames">The names of the matrices to export</param>
+        /// <param name="filePaths">The file path to export each matrix to, matrices exported as npz can share one file</param>
+        public static void RunExportMatricesTool(string format, string[] matrixNames, string[] filePaths)
+        {
+            string modulePath = Helper.BuildModulePath("inputOutput\\exportMatrices.py");
+            var matrices = new List<object>();
+            for (int i = 0; i < matrixNames.Length; i++)
+            {
+                matrices.Add(new { MatrixName = matrixNames[i], FilePath = filePaths[i] });
+            }
+            string jsonParameters = JsonConvert.SerializeObject(new
+            {
+                Format = format,
+                Matrices = matrices
+            });
+            Helper.Modeller.Run(null, modulePath, jsonParameters);
+        }
+
+        /// <summary>
+        /// Method to run the CalculateMatrix tool which evaluates an expression over the matrices of the model
+        /// </summary>
+        /// <param name="expression">the matrix expression to evaluate</param>
+        /// <param name="matrixID">string name of the result matrix to be used as an ID</param>
+        /// <param name="centroidconfig">string name of the centroid configuration to be used as an ID</param>
+        /// <param name="vehicleType">string type of vehicle to use eg car, bus, etc....</param>
+        /// <param name="initialTime">string of initial time in minutes</param>
+        /// <param name="durationTime">string of duration in minutes</param>
+        public static void RunCalculateMatrixTool(string expression, string matrixID, string centroidconfig, string vehicleType,
+                                                  string initialTime, string durationTime)
+        {
+            string modulePath = Helper.BuildModulePath("inputOutput\\calculateMatrix.py");
+            string jsonParameters = JsonConvert.SerializeObject(new
+            {
+                Expression = expression,
+                MatrixID = matrixID,
+                CentroidConfiguration = centroidconfig,
+                VehicleType = vehicleType,
+                InitialTime = initialTime,
+                DurationTime = durationTime
+            });
+            Helper.Modeller.Run(null, modulePath, jsonParameters);
+        }
+
+        /// <summary>
+        /// Method to run the BalanceMatrix tool which balances a matrix to origin and destination targets
+        /// </summary>
+        /// <param name="sourceMatrixID">string name of the matrix to balance</param>
+        /// <param name="targetFile">path to the zone,origin,destination csv file of targets as a string</param>
+        /// <param name="includeHeader">boolean value if the target file has a header</param>
+        /// <param name="matrixID">string name of the balanced matrix to be used as an ID</param>
+        /// <param name="centroidconfig">string name of the centroid configuration to be used as an ID</param>
+        /// <param name="vehicleType">string type of vehicle to use eg car, bus, etc....</param>
+        /// <param name="initialTime">string of initial time in minutes</param>
+        /// <param name="durationTime">string of duration in minutes</param>
+        public static void RunBalanceMatrixTool(string sourceMatrixID, string targetFile, bool includeHeader,
+                                                string matrixID, string centroidconfig, string vehicleType,
+                                                string initialTime, string durationTime)
+        {
+            string modulePath = Helper.BuildModulePath("inputOutput\\balanceMatrix.py");
+            string jsonParameters = JsonConvert.SerializeObject(new
+            {
+                SourceMatrixID = sourceMatrixID,
+                TargetFile = targetFile,
+                IncludesHeader = includeHeader,
+                Tolerance = 0.0001,
+                MaxIterations = 100,
+                MatrixID = matrixID,
+                CentroidConfiguration = centroidconfig,
+                VehicleType = vehicleType,
+                InitialTime = initialTime,
+                DurationTime = durationTime
+            });
+            Helper.Modeller.Run(null, modulePath, jsonParameters);
+        }
+
+        /// <summary>
+        /// Method to run the ConvertMatrixZones tool which moves a matrix to the zones of another centroid configuration
+        /// </summary>
+        /// <param name="sourceMatrixID">string name of the matrix to convert</param>
+        /// <param name="correspondenceFile">path to the fromZone,toZone[,weight] csv file as a string</param>
+        /// <param name="includeHeader">boolean value if the correspondence file has a header</param>
+        /// <param name="matrixID">string name of the converted matrix to be used as an ID</param>
+        /// <param name="centroidconfig">string name of the centroid configuration of the converted matrix</param>
+        /// <param name="vehicleType">string type of vehicle to use eg car, bus, etc....</param>
+        /// <param name="initialTime">string of initial time in minutes</param>
+        /// <param name="durationTime">string of duration in minutes</param>
+        public static void RunConvertMatrixZonesTool(string sourceMatrixID, string correspondenceFile, bool includeHeader,
+                                                     string matrixID, string centroidconfig, string vehicleType,
+                                                     string initialTime, string durationTime)
+        {
+            string modulePath = Helper.BuildModulePath("inputOutput\\convertMatrixZones.py");
+            string jsonParameters = JsonConvert.SerializeObject(new
+            {
+                SourceMatrixID = sourceMatrixID,
+                CorrespondenceFile = correspondenceFile,
+                IncludesHeader = includeHeader,
+                MatrixID = matrixID,
+                CentroidConfiguration = centroidconfig,
+                VehicleType = vehicleType,
+                InitialTime = initialTime,
+                DurationTime = durationTime
+            });
+            Helper.Modeller.Run(null, modulePath, jsonParameters);
+        }
     }
 }
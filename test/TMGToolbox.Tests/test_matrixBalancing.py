@@ -0,0 +1,103 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+import pytest
+from common.matrixIO import buildZoneLookup
+from common.matrixBalancing import balanceMatrix, convertZones, readCorrespondence, readZoneTargets
+
+
+def write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_balance_matrix_matches_targets():
+    array = np.array([[1.0, 2.0, 1.0], [3.0, 1.0, 2.0], [1.0, 1.0, 4.0]])
+    origins = np.array([10.0, 20.0, 30.0])
+    destinations = np.array([15.0, 25.0, 20.0])
+    balanced, iterations, error = balanceMatrix(array, origins, destinations, tolerance=1e-8, maxIterations=1000)
+    assert error <= 1e-8
+    assert iterations < 1000
+    np.testing.assert_allclose(balanced.sum(axis=1), origins, rtol=1e-6)
+    np.testing.assert_allclose(balanced.sum(axis=0), destinations, rtol=1e-6)
+
+
+def test_balance_matrix_scales_destinations_to_origins():
+    array = np.ones((2, 2))
+    balanced, _, _ = balanceMatrix(array, np.array([10.0, 10.0]), np.array([1.0, 3.0]))
+    np.testing.assert_allclose(balanced.sum(axis=0), [5.0, 15.0])
+
+
+def test_balance_matrix_keeps_empty_rows_empty():
+    array = np.array([[0.0, 0.0], [1.0, 1.0]])
+    balanced, _, _ = balanceMatrix(array, np.array([5.0, 5.0]), np.array([5.0, 5.0]), maxIterations=10)
+    np.testing.assert_array_equal(balanced[0], [0.0, 0.0])
+    assert np.all(np.isfinite(balanced))
+
+
+def test_balance_matrix_does_not_change_the_input():
+    array = np.ones((2, 2))
+    balanceMatrix(array, np.array([4.0, 2.0]), np.array([3.0, 3.0]))
+    np.testing.assert_array_equal(array, np.ones((2, 2)))
+
+
+def test_balance_matrix_rejects_negative_targets():
+    with pytest.raises(Exception):
+        balanceMatrix(np.ones((2, 2)), np.array([-1.0, 1.0]), np.array([1.0, 1.0]))
+
+
+def test_read_zone_targets(tmp_path):
+    fileLocation = write(tmp_path / "targets.csv", "zone,origin,destination\n5,10,1\n9,30,3\n7,20,2\n8,99,99\n5,1,1\n")
+    unknownZones = set()
+    origins, destinations = readZoneTargets(fileLocation, True, buildZoneLookup([5, 7, 9]), 3, unknownZones)
+    np.testing.assert_array_equal(origins, [11.0, 20.0, 30.0])
+    np.testing.assert_array_equal(destinations, [2.0, 2.0, 3.0])
+    assert unknownZones == {"8"}
+
+
+def test_read_correspondence_splits_by_weight(tmp_path):
+    fileLocation = write(tmp_path / "correspondence.csv", "1,10,1\n1,20,3\n2,20,2\n3,99,1\n")
+    unknownZones = set()
+    shares = readCorrespondence(fileLocation, False, buildZoneLookup([1, 2, 3]), 3,
+                                buildZoneLookup([10, 20]), 2, unknownZones)
+    np.testing.assert_array_equal(shares, [[0.25, 0.75], [0.0, 1.0], [0.0, 0.0]])
+    assert unknownZones == {"99"}
+
+
+def test_read_correspondence_without_weights(tmp_path):
+    fileLocation = write(tmp_path / "correspondence.csv", "from,to\n1,10\n2,10\n2,20\n")
+    shares = readCorrespondence(fileLocation, True, buildZoneLookup([1, 2]), 2, buildZoneLookup([10, 20]), 2, set())
+    np.testing.assert_array_equal(shares, [[1.0, 0.0], [0.5, 0.5]])
+
+
+def test_convert_zones_keeps_the_total():
+    array = np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0], [7.0, 8.0, 9.0]])
+    shares = np.array([[1.0, 0.0], [0.5, 0.5], [0.0, 1.0]])
+    converted = convertZones(array, shares)
+    assert converted.shape == (2, 2)
+    assert converted.sum() == pytest.approx(array.sum())
+    np.testing.assert_allclose(converted, [[5.25, 8.25], [14.25, 17.25]])
+
+
+def test_convert_zones_matches_the_dense_product():
+    rng = np.random.default_rng(3)
+    array = rng.uniform(0.0, 10.0, size=(40, 40))
+    shares = np.where(rng.uniform(size=(40, 15)) < 0.1, rng.uniform(size=(40, 15)), 0.0)
+    np.testing.assert_allclose(convertZones(array, shares), shares.T @ array @ shares)
@@ -0,0 +1,91 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+import pytest
+from common.matrixExpression import evaluateExpression, findMatrixNames
+
+MATRICES = {
+    "auto": np.array([[1.0, 2.0], [3.0, 4.0]]),
+    "transit": np.array([[0.0, 1.0], [2.0, 0.0]]),
+    "auto trips": np.array([[5.0, 5.0], [5.0, 5.0]]),
+}
+
+
+def evaluate(expression):
+    return evaluateExpression(expression, MATRICES.__getitem__, 2)
+
+
+def test_find_matrix_names():
+    assert findMatrixNames("auto + transit * 2") == ["auto", "transit"]
+    assert findMatrixNames("maximum(auto, transit) - auto") == ["auto", "transit"]
+    assert findMatrixNames("auto * intrazonal") == ["auto"]
+
+
+def test_find_quoted_matrix_names():
+    assert findMatrixNames('matrix("auto trips") + auto') == ["auto trips", "auto"]
+    assert findMatrixNames('sqrt(matrix("auto trips"))') == ["auto trips"]
+
+
+def test_arithmetic():
+    np.testing.assert_array_equal(evaluate("auto + transit * 2"), [[1.0, 4.0], [7.0, 4.0]])
+    np.testing.assert_array_equal(evaluate("-auto ** 2"), [[-1.0, -4.0], [-9.0, -16.0]])
+
+
+def test_quoted_matrix():
+    np.testing.assert_array_equal(evaluate('matrix("auto trips") - auto'), [[4.0, 3.0], [2.0, 1.0]])
+
+
+def test_division_by_zero_is_zero():
+    np.testing.assert_array_equal(evaluate("auto / transit"), [[0.0, 2.0], [1.5, 0.0]])
+
+
+def test_functions_and_comparisons():
+    np.testing.assert_array_equal(evaluate("where(auto > 2, auto, 0)"), [[0.0, 0.0], [3.0, 4.0]])
+    np.testing.assert_array_equal(evaluate("transpose(auto)"), [[1.0, 3.0], [2.0, 4.0]])
+    np.testing.assert_array_equal(evaluate("auto * intrazonal"), [[1.0, 0.0], [0.0, 4.0]])
+    np.testing.assert_array_equal(evaluate("(auto > 1) and (transit > 0)"), [[0.0, 1.0], [1.0, 0.0]])
+
+
+def test_scalar_fills_the_matrix():
+    np.testing.assert_array_equal(evaluate("3"), np.full((2, 2), 3.0))
+
+
+def test_matrices_are_read_once():
+    reads = []
+
+    def getMatrix(name):
+        reads.append(name)
+        return MATRICES[name]
+
+    evaluateExpression("auto + auto * auto", getMatrix, 2)
+    assert reads == ["auto"]
+
+
+@pytest.mark.parametrize("expression", [
+    "auto +",
+    "__import__('os')",
+    "auto.T",
+    "auto[0]",
+    "log(transit)",
+    "matrix(auto)",
+])
+def test_invalid_expressions(expression):
+    with pytest.raises(Exception):
+        evaluate(expression)
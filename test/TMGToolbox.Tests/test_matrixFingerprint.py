@@ -0,0 +1,62 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+from common.centroidIndex import CentroidIndex
+from common.matrixIO import arrayCells, fingerprintArray, fingerprintCells, fingerprintMatrixFile, getMatrixFormat
+
+
+class Centroid:
+    def __init__(self, centroidId, zone):
+        self.centroidId = centroidId
+        self.zone = zone
+
+    def getId(self):
+        return self.centroidId
+
+    def getExternalId(self):
+        return f"centroid_{self.zone}"
+
+
+CENTROID_INDEX = CentroidIndex(None, [Centroid(100, 5), Centroid(101, 7), Centroid(102, 9)])
+ARRAY = np.array([[0.0, 1.5, 2.0], [3.0, 0.0, 0.0], [0.0, 4.0, 5.0]])
+
+
+def test_array_and_cells_agree():
+    fingerprint = fingerprintArray(ARRAY, CENTROID_INDEX.ids)
+    origins, destinations, values = arrayCells(ARRAY)
+    order = np.arange(len(values))[::-1]
+    assert fingerprintCells(CENTROID_INDEX.ids, origins[order], destinations[order], values[order]) == fingerprint
+
+
+def test_fingerprint_changes_with_the_cells():
+    changed = ARRAY.copy()
+    changed[1, 2] = 1.0
+    assert fingerprintArray(changed, CENTROID_INDEX.ids) != fingerprintArray(ARRAY, CENTROID_INDEX.ids)
+    assert fingerprintArray(ARRAY, CENTROID_INDEX.ids) != fingerprintArray(ARRAY, CENTROID_INDEX.ids + 1)
+
+
+def test_streamed_files_match_the_array(tmp_path):
+    expected = fingerprintArray(ARRAY, CENTROID_INDEX.ids)
+    for formatName, fileName in (("npy", "matrix.npy"), ("square", "matrix.csv")):
+        fileLocation = str(tmp_path / fileName)
+        getMatrixFormat(formatName).write(fileLocation, ARRAY, CENTROID_INDEX.zoneLabels)
+        unknownZones = set()
+        assert fingerprintMatrixFile(fileLocation, formatName, CENTROID_INDEX, unknownZones) == expected
+        assert unknownZones == set()
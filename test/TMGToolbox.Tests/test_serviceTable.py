@@ -0,0 +1,63 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+import pytest
+from common.serviceTable import findHeadwayRuns, parseTimes, readServiceTables
+
+
+def test_parse_times_to_seconds():
+    np.testing.assert_array_equal(parseTimes(["00:00:00", "06:30:15", "25:01:02"]), [0, 23415, 90062])
+    assert parseTimes([]).shape == (0,)
+
+
+@pytest.mark.parametrize("times", [["12:00", "1:2:3:4"], ["12:00:00", "12:00"], ["12:00:00:00"]])
+def test_parse_times_rejects_malformed_times(times):
+    with pytest.raises(Exception, match="hh:mm:ss"):
+        parseTimes(times)
+
+
+def test_read_service_tables_groups_trips_by_line(tmp_path):
+    path = tmp_path / "serviceTable.csv"
+    path.write_text("line,departure,arrival\n"
+                    "B,06:10:00,06:20:00\n"
+                    "A,06:00:00,06:15:00\n"
+                    "B,06:00:00,06:10:00\n")
+    serviceTables = readServiceTables(str(path), chunkSize=2)
+    assert [lineId for lineId, _, _ in serviceTables] == ["B", "A"]
+    np.testing.assert_array_equal(serviceTables[0][1], [22200, 21600])
+    np.testing.assert_array_equal(serviceTables[0][2], [22800, 22200])
+    np.testing.assert_array_equal(serviceTables[1][1], [21600])
+
+
+def test_headway_run_followed_by_irregular_trips():
+    departures = np.array([0, 600, 1205, 1795, 2400, 3300, 4800])
+    assert findHeadwayRuns(departures, 30, 4) == [(0, 5, 600), (5, 7, None)]
+
+
+def test_headway_run_between_irregular_trips():
+    departures = np.array([0, 1000, 1300, 1600, 1900, 2200, 5000])
+    assert findHeadwayRuns(departures, 0, 4) == [(0, 1, None), (1, 6, 300), (6, 7, None)]
+
+
+def test_short_runs_and_repeated_departures_stay_fixed():
+    assert findHeadwayRuns(np.array([0, 600, 1200, 3000]), 30, 4) == [(0, 4, None)]
+    assert findHeadwayRuns(np.array([600, 600, 600, 600]), 30, 4) == [(0, 4, None)]
+    assert findHeadwayRuns(np.array([600]), 30, 4) == [(0, 1, None)]
+    assert findHeadwayRuns(np.empty(0, dtype=np.int32), 30, 4) == []
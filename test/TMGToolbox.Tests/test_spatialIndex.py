@@ -0,0 +1,85 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+import pytest
+from common.spatialIndex import PointGridIndex, nearestPoint
+
+
+def brutePairs(points, radius):
+    pairs = dict()
+    for i in range(len(points)):
+        for j in range(i + 1, len(points)):
+            distance = np.hypot(*(points[i] - points[j]))
+            if distance <= radius:
+                pairs[(i, j)] = distance
+    return pairs
+
+
+def test_pairs_within_radius_matches_brute_force():
+    points = np.random.default_rng(7).uniform(-500.0, 500.0, size=(300, 2))
+    index = PointGridIndex(points, 75.0)
+    i, j, distance = index.pairsWithinRadius()
+    found = {(min(a, b), max(a, b)): d for a, b, d in zip(i.tolist(), j.tolist(), distance.tolist())}
+    # each unordered pair is returned once
+    assert len(found) == len(i)
+    expected = brutePairs(points, 75.0)
+    assert found.keys() == expected.keys()
+    for key, d in expected.items():
+        assert found[key] == pytest.approx(d)
+
+
+def test_pairs_within_smaller_radius():
+    points = np.array([[0.0, 0.0], [30.0, 0.0], [0.0, 60.0], [200.0, 200.0]])
+    i, j, distance = PointGridIndex(points, 100.0).pairsWithinRadius(50.0)
+    assert sorted(zip(i.tolist(), j.tolist())) == [(0, 1)]
+    np.testing.assert_allclose(distance, [30.0])
+
+
+def test_radius_larger_than_cell_size_is_rejected():
+    with pytest.raises(Exception):
+        PointGridIndex(np.zeros((2, 2)), 10.0).pairsWithinRadius(20.0)
+
+
+def test_empty_index():
+    i, j, distance = PointGridIndex(np.empty((0, 2)), 10.0).pairsWithinRadius()
+    assert len(i) == len(j) == len(distance) == 0
+
+
+def test_nearest_neighbours_keeps_closest_per_source():
+    points = np.array([[0.0, 0.0], [10.0, 0.0], [25.0, 0.0], [45.0, 0.0]])
+    source, destination, distance = PointGridIndex(points, 50.0).nearestNeighbours(2)
+    neighbours = dict()
+    for s, d in zip(source.tolist(), destination.tolist()):
+        neighbours.setdefault(s, []).append(d)
+    assert neighbours == {0: [1, 2], 1: [0, 2], 2: [1, 3], 3: [2, 1]}
+
+
+def test_nearest_point_matches_brute_force_in_small_chunks():
+    rng = np.random.default_rng(11)
+    points = rng.uniform(0.0, 1000.0, size=(50, 2))
+    queries = rng.uniform(0.0, 1000.0, size=(40, 2))
+    expected = np.argmin(((queries[:, np.newaxis, :] - points[np.newaxis, :, :]) ** 2).sum(axis=2), axis=1)
+    # a chunk of at most 120 distances is three queries at a time
+    np.testing.assert_array_equal(nearestPoint(points, queries, maxCells=120), expected)
+    np.testing.assert_array_equal(nearestPoint(points, queries), expected)
+
+
+def test_nearest_point_without_points():
+    np.testing.assert_array_equal(nearestPoint(np.empty((0, 2)), np.zeros((3, 2))), [-1, -1, -1])
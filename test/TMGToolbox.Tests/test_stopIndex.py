@@ -0,0 +1,90 @@
+"""
+    Copyright 2022 Travel Modelling Group, Department of Civil Engineering, University of Toronto
+
+    This file is part of TMGToolbox for Aimsun.
+
+    TMGToolbox for Aimsun is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    TMGToolbox for Aimsun is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with TMGToolbox for Aimsun.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from types import SimpleNamespace
+import numpy as np
+from common.stopIndex import StopIndex
+
+
+class Section:
+    def __init__(self, origin, destination):
+        self.origin = origin
+        self.destination = destination
+
+    def getOrigin(self):
+        return self.origin
+
+    def getDestination(self):
+        return self.destination
+
+
+class Stop:
+    def __init__(self, section, x, y):
+        self.section = section
+        self.position = SimpleNamespace(x=x, y=y)
+
+    def getSection(self):
+        return self.section
+
+    def absolutePosition(self):
+        return self.position
+
+
+class Centroid:
+    def __init__(self, connectedObjects):
+        self.connections = [SimpleNamespace(getConnectionObject=lambda o=o: o) for o in connectedObjects]
+
+    def getConnections(self):
+        return self.connections
+
+
+def centroidIndex(connections, positions):
+    # the centroids and positions of a CentroidIndex
+    return SimpleNamespace(centroids=[Centroid(connected) for connected in connections],
+                           positions=np.array(positions, dtype=np.float64).reshape(-1, 2))
+
+
+def buildIndex(stops):
+    model = SimpleNamespace(getType=lambda name: name)
+    catalog = SimpleNamespace(getObjectsByType=lambda objectType: dict(enumerate(stops)))
+    return StopIndex(model, catalog)
+
+
+def test_stops_are_found_through_the_connected_nodes():
+    sectionAB = Section("A", "B")
+    sectionBC = Section("B", "C")
+    stopAB = Stop(sectionAB, 0.0, 0.0)
+    stopBC = Stop(sectionBC, 100.0, 0.0)
+    index = buildIndex([stopAB, stopBC])
+    assert index.sectionStops == {sectionAB: [stopAB], sectionBC: [stopBC]}
+    # both stops are next to node B and only listed once
+    assert index.findNearbyStops(Centroid(["B", "B"])) == [stopAB, stopBC]
+    assert index.findNearbyStops(Centroid(["C"])) == [stopBC]
+
+
+def test_centroids_without_nearby_stops_use_the_closest_stop():
+    stops = [Stop(Section("A", "B"), 0.0, 0.0), Stop(Section("C", "D"), 100.0, 0.0), Stop(None, 50.0, 50.0)]
+    index = buildIndex(stops)
+    centroids = centroidIndex([["A"], [], ["E"]], [[500.0, 500.0], [90.0, 10.0], [5.0, 0.0]])
+    assert index.findStopsForCentroids(centroids) == [[stops[0]], [stops[1]], [stops[0]]]
+
+
+def test_no_stops():
+    index = buildIndex([])
+    assert index.findStopsForCentroids(centroidIndex([[]], [[0.0, 0.0]])) == [[]]